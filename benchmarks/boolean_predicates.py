@@ -0,0 +1,73 @@
+"""Building and rendering predicates with many OR-ed / AND-ed terms.
+
+Run from the repository root with
+``python -m benchmarks.boolean_predicates [--terms N]``.
+"""
+
+import argparse
+import time
+
+from pysqlscribe.table import Table
+
+
+def timed(label: str, fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except RecursionError:
+            print(f"{label:<40} {'RecursionError':>13}")
+            return None
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:>10.1f} ms")
+    return result
+
+
+def chain(table: Table, terms: int):
+    expression = table.id == 0
+    for value in range(1, terms):
+        expression = expression | (table.id == value)
+    return expression
+
+
+def nested(table: Table, terms: int):
+    # alternating AND / OR levels, so nothing flattens
+    expression = table.id == 0
+    for value in range(1, terms):
+        if value % 2:
+            expression = expression | (table.id == value)
+        else:
+            expression = expression & (table.amount > value)
+    return expression
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--terms", type=int, default=10_000)
+    args = parser.parse_args()
+    print(f"{args.terms} terms")
+
+    table = Table("orders", "id", "amount", dialect="postgres")
+    or_chain = timed("build a | b | ...", lambda: chain(table, args.terms))
+    if or_chain is not None:
+        timed("render a | b | ...", lambda: str(or_chain))
+        timed(
+            "render a | b | ... parameterized",
+            lambda: table.select("id").where(or_chain).build(parameterize=True),
+        )
+    alternating = timed("build alternating & / |", lambda: nested(table, args.terms))
+    if alternating is not None:
+        timed("render alternating & / |", lambda: str(alternating))
+
+    try:
+        from pysqlscribe import or_
+    except ImportError:
+        return
+    terms = [table.id == value for value in range(args.terms)]
+    n_ary = timed("build or_(*terms)", lambda: or_(*terms))
+    timed("render or_(*terms)", lambda: str(n_ary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Startup time of loading a synthetic 5,000 table DDL catalog.
+
+Run from the repository root with
+``python -m benchmarks.catalog_startup [--tables N] [--files N]``.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from pysqlscribe.utils.catalog import Catalog
+from pysqlscribe.utils.catalog_cache import CatalogCache
+from pysqlscribe.utils.ddl_loader import (
+    create_tables_from_parsed,
+    find_sql_files,
+    load_tables_from_ddls,
+    merge_parsed,
+)
+from pysqlscribe.utils.ddl_parser import parse_ddl_files
+
+
+def write_catalog(directory: str, tables: int, files: int) -> None:
+    for file_index in range(files):
+        with open(os.path.join(directory, f"schema_{file_index:04}.sql"), "w") as f:
+            for table_index in range(file_index, tables, files):
+                f.write(
+                    f"CREATE TABLE IF NOT EXISTS app.table_{table_index} (\n"
+                    "    id BIGINT PRIMARY KEY,\n"
+                    "    name VARCHAR(255) NOT NULL DEFAULT '',\n"
+                    "    amount NUMERIC(12, 2),\n"
+                    "    created_at TIMESTAMP,\n"
+                    "    owner_id BIGINT,\n"
+                    "    CONSTRAINT fk_owner FOREIGN KEY (owner_id) REFERENCES app.owners(id)\n"
+                    ");\n\n"
+                )
+
+
+def timed(label: str, fn, repeat: int = 3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:>10.1f} ms")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, default=5000)
+    parser.add_argument("--files", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        schema = os.path.join(directory, "schema")
+        os.mkdir(schema)
+        write_catalog(schema, args.tables, args.files)
+        cache_path = os.path.join(directory, "catalog.bin")
+        sql_files = find_sql_files(schema)
+        print(f"{args.tables} tables in {args.files} files")
+
+        timed("parse (no cache)", lambda: parse_ddl_files(sql_files))
+        cache = CatalogCache(cache_path)
+        cache.clear()
+        timed("parse + write cache (cold)", lambda: cache.load(sql_files), repeat=1)
+        timed("load cache (warm)", lambda: cache.load(sql_files))
+        timed(
+            "warm cache + build Table objects",
+            lambda: create_tables_from_parsed(
+                merge_parsed(cache.load(sql_files)), "postgres"
+            ),
+        )
+        tables = timed(
+            "load_tables_from_ddls(cache_path=...)",
+            lambda: load_tables_from_ddls(schema, "postgres", cache_path=cache_path),
+        )
+        assert len(tables) == args.tables
+
+        def open_catalog_and_touch_a_dozen_tables():
+            with Catalog(schema, "postgres") as catalog:
+                for table_index in range(0, args.tables, max(1, args.tables // 12)):
+                    catalog[f"table_{table_index}"].select("id").build()
+                return len(catalog)
+
+        timed("Catalog index + 12 lazy tables", open_catalog_and_touch_a_dozen_tables)
+        print(f"cache file size: {os.path.getsize(cache_path) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Cost of ``Query.fingerprint()`` next to building and rendering the same query.
+
+Only the "unchanged query" case, where every node's digest is already cached,
+is sub-microsecond. The first fingerprint of a freshly built query hashes every
+node; it should cost well under a render of the same query (about half of it,
+or less), so a fingerprint is a cheaper cache key than the rendered SQL. The
+benchmark exits non-zero when either ratio is missed.
+
+Run from the repository root with
+``python -m benchmarks.fingerprint [--repeat N]``.
+"""
+
+import argparse
+import gc
+import time
+
+from pysqlscribe.table import Table
+
+# the most a first fingerprint may cost, as a fraction of a render
+MAX_FRESH_TO_RENDER = 0.75
+# the most an unchanged query's fingerprint may cost, next to a first one
+MAX_UNCHANGED_TO_FRESH = 0.1
+
+
+def timed(label: str, fn, repeat: int, setup=None) -> float:
+    """Best time per call of ``fn`` in seconds; ``setup`` makes its argument,
+    outside the timed loop. The collector is off while timing, as in timeit."""
+    best = float("inf")
+    for _ in range(5):
+        args = [setup() for _ in range(repeat)] if setup is not None else None
+        gc.disable()
+        start = time.perf_counter()
+        if args is None:
+            for _ in range(repeat):
+                fn()
+        else:
+            for arg in args:
+                fn(arg)
+        best = min(best, time.perf_counter() - start)
+        gc.enable()
+    print(f"{label:<40} {best / repeat * 1e6:>10.2f} us")
+    return best / repeat
+
+
+def build_query(value: int):
+    table = Table("orders", "id", "amount", "status", dialect="postgres")
+    return (
+        table.select(table.id, table.amount)
+        .where((table.amount > value) | (table.status == f"s{value}"))
+        .where(table.id.in_([value, value + 1, value + 2]))
+        .order_by(table.id.desc())
+        .limit(10)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+
+    def fresh():
+        return build_query(1)
+
+    timed("build", fresh, args.repeat // 10)
+    render = timed(
+        "render (parameterized), fresh query",
+        lambda query: query.build(parameterize=True),
+        args.repeat // 10,
+        setup=fresh,
+    )
+    first = timed(
+        "fingerprint, fresh query",
+        lambda query: query.fingerprint(),
+        args.repeat // 10,
+        setup=fresh,
+    )
+    query = fresh()
+    query.fingerprint()
+    unchanged = timed("fingerprint, unchanged query", query.fingerprint, args.repeat)
+
+    failures = []
+    for label, ratio, limit in (
+        ("fresh fingerprint / render", first / render, MAX_FRESH_TO_RENDER),
+        ("unchanged / fresh fingerprint", unchanged / first, MAX_UNCHANGED_TO_FRESH),
+    ):
+        passed = ratio <= limit
+        print(f"{label:<40} {ratio:>10.2f} (<= {limit}) {'ok' if passed else 'FAIL'}")
+        if not passed:
+            failures.append(label)
+    if failures:
+        raise SystemExit(f"ratio exceeded: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    main()
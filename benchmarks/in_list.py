@@ -0,0 +1,65 @@
+"""Cost of large ``IN`` lists: building the expression, and rendering it inline
+or with bound parameters.
+
+Run from the repository root with
+``python -m benchmarks.in_list [--values N]``.
+"""
+
+import argparse
+import array
+import time
+import tracemalloc
+
+from pysqlscribe.table import Table
+
+
+def timed(label: str, fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:>10.1f} ms")
+    return result
+
+
+def held_memory(fn) -> int:
+    tracemalloc.start()
+    result = fn()  # noqa: F841 - keep the result alive while measuring
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return held
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--values", type=int, default=100_000)
+    args = parser.parse_args()
+    ints = list(range(args.values))
+    strings = [f"sku-{value}" for value in ints]
+    print(f"{args.values} values")
+
+    table = Table("events", "id", "sku", dialect="postgres")
+    timed("in_(list of ints)", lambda: table.id.in_(ints))
+    timed("in_(array.array)", lambda: table.id.in_(array.array("q", ints)))
+    timed("in_(list of strings)", lambda: table.sku.in_(strings))
+    expression = table.id.in_(ints)
+    print(
+        f"{'held by in_(list of ints)':<40} "
+        f"{held_memory(lambda: table.id.in_(ints)) / 1024:>10.1f} KiB"
+    )
+    timed("render ints inline", lambda: expression.render())
+    timed(
+        "render strings inline",
+        lambda: table.sku.in_(strings).render(),
+    )
+
+    def parameterized():
+        query = Table("events", "id", dialect="postgres")
+        return query.select("id").where(query.id.in_(ints)).build(parameterize=True)
+
+    timed("in_ + build(parameterize=True)", parameterized)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Inline literal escaping of large value sets, per dialect: one ``escape_value``
+call per value versus the batch ``escape_values`` / ``join_escaped_values`` API.
+
+Run from the repository root with
+``python -m benchmarks.inline_escaping [--values N]``.
+"""
+
+import argparse
+import time
+
+from pysqlscribe.dialects.base import DialectRegistry
+
+
+def timed(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--values", type=int, default=200_000)
+    args = parser.parse_args()
+    inputs = {
+        "strings": [
+            f"it's sku {value}" if value % 10 == 0 else f"sku-{value}"
+            for value in range(args.values)
+        ],
+        "ints": list(range(args.values)),
+        "bools": [value % 2 == 0 for value in range(args.values)],
+    }
+    rows = [(value, f"name {value}", value * 0.5) for value in range(args.values // 10)]
+    print(f"{args.values} values; {len(rows)} rows for VALUES")
+    print(f"{'dialect':<10}{'input':<10}{'per value':>12}{'batch':>12}")
+
+    for name in ("postgres", "mysql", "sqlite", "oracle"):
+        dialect = DialectRegistry.get_dialect(name)
+        for label, values in inputs.items():
+            per_value = timed(
+                lambda dialect=dialect, values=values: ", ".join(
+                    map(dialect.escape_value, values)
+                )
+            )
+            batch = timed(
+                lambda dialect=dialect, values=values: dialect.join_escaped_values(
+                    values
+                )
+            )
+            print(f"{name:<10}{label:<10}{per_value:>10.1f}ms{batch:>10.1f}ms")
+        per_row = timed(
+            lambda dialect=dialect: ", ".join(
+                "(" + ", ".join(map(dialect.escape_value, row)) + ")" for row in rows
+            )
+        )
+        batch = timed(
+            lambda dialect=dialect: dialect.render_insert(
+                "t", ["id", "name", "x"], rows
+            )
+        )
+        print(f"{name:<10}{'VALUES':<10}{per_row:>10.1f}ms{batch:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Memory held by a query with thousands of predicates, measured with ``tracemalloc``.
+
+Run from the repository root with
+``python -m benchmarks.query_memory [--predicates N]``.
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from pysqlscribe.table import Table
+
+
+def build_query(table: Table, predicates: int) -> Table:
+    conditions = [
+        (table.amount > index) | (table.status == f"s{index}")
+        for index in range(predicates)
+    ]
+    return (
+        table.select(table.id, table.amount)
+        .where(*conditions)
+        .order_by(table.id.desc())
+        .limit(10)
+    )
+
+
+def measure(label: str, fn) -> None:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = fn()
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    held = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"{label:<40} held {held / 1024:>9.1f} KiB   peak {peak / 1024:>9.1f} KiB")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--predicates", type=int, default=5000)
+    args = parser.parse_args()
+    print(f"{args.predicates} predicates")
+
+    table = Table("orders", "id", "amount", "status", dialect="postgres")
+    query = measure("build", lambda: build_query(table, args.predicates))
+    measure("build(parameterize=True)", lambda: query.build(parameterize=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""A search query with optional filters: rebuilding the ``Query`` per request
+versus binding a ``QueryTemplate``, over random subsets of the filters.
+
+Run from the repository root with
+``python -m benchmarks.templates [--filters N] [--requests N]``.
+"""
+
+import argparse
+import random
+import time
+
+from pysqlscribe.params import Param
+from pysqlscribe.table import Table
+
+
+def timed(label: str, fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<32} {best * 1000:>10.1f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filters", type=int, default=15)
+    parser.add_argument("--requests", type=int, default=10_000)
+    args = parser.parse_args()
+    columns = [f"f{index}" for index in range(args.filters)]
+    rng = random.Random(0)
+    # most requests use a few of the filters, and a handful of combinations recur
+    combinations = [
+        rng.sample(columns, rng.randint(0, min(4, args.filters))) for _ in range(64)
+    ]
+    requests = [
+        {name: rng.randint(0, 100) for name in rng.choice(combinations)}
+        for _ in range(args.requests)
+    ]
+    print(f"{args.filters} optional filters, {args.requests} requests")
+
+    def rebuild():
+        for values in requests:
+            table = Table("items", "id", "tenant_id", *columns, dialect="postgres")
+            query = table.select("id").where(table.tenant_id == 1)
+            for name, value in values.items():
+                query.where(getattr(table, name) == value)
+            query.order_by("id").limit(50).build(parameterize=True)
+
+    table = Table("items", "id", "tenant_id", *columns, dialect="postgres")
+    template = (
+        table.select("id")
+        .where(table.tenant_id == 1)
+        .where(
+            *(getattr(table, name) == Param(name) for name in columns), optional=True
+        )
+        .order_by("id")
+        .limit(50)
+        .template()
+    )
+
+    def bind():
+        for values in requests:
+            template.bind(**values)
+
+    rebuilt = timed("rebuild + build(parameterize)", rebuild)
+    bound = timed("template.bind", bind)
+    print(f"{'speed-up':<32} {rebuilt / bound:>10.1f} x")
+    print(f"{'variants rendered':<32} {len(template):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Cost of aliasing a wide table and using a couple of its columns.
+
+Run from the repository root with
+``python -m benchmarks.wide_table [--columns N]``.
+"""
+
+import argparse
+import time
+
+from pysqlscribe.table import Table
+
+
+def timed(label: str, fn, repeat: int = 2000):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1e6:>10.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--columns", type=int, default=800)
+    args = parser.parse_args()
+    columns = [f"column_{index}" for index in range(args.columns)]
+    print(f"{args.columns} columns")
+
+    timed(
+        "construct",
+        lambda: Table("facts", *columns, dialect="postgres"),
+        repeat=200,
+    )
+    table = Table("facts", *columns, dialect="postgres")
+    aliases = iter(range(10**9))
+    timed("as_()", lambda: table.as_(f"f{next(aliases)}"))
+
+    def alias_and_compare_two_columns():
+        aliased = table.as_(f"f{next(aliases)}")
+        return aliased.column_1 > aliased.column_2
+
+    timed("as_() + compare two columns", alias_and_compare_two_columns)
+    table.as_("f")
+    timed("cached column access", lambda: table.column_1)
+
+
+if __name__ == "__main__":
+    main()
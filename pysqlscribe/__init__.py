@@ -1,4 +1,4 @@
-from pysqlscribe.column import case_
+from pysqlscribe.column import and_, case_, or_
 from pysqlscribe.cte import With, with_
 from pysqlscribe.exceptions import PySQLScribeError
 from pysqlscribe.query import Query
@@ -11,6 +11,8 @@ __all__ = [
     "Schema",
     "Table",
     "With",
+    "and_",
     "case_",
+    "or_",
     "with_",
 ]
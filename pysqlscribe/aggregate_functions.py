@@ -1,11 +1,13 @@
-from pysqlscribe.column import Column, ExpressionColumn
+from pysqlscribe.column import Column, FunctionCall
 from pysqlscribe.functions import AggregateFunctions
 
 
 def _aggregate_function(agg_function: str, column: Column | str | int):
     if not isinstance(column, Column):
         return f"{agg_function}({column})"
-    return ExpressionColumn(f"{agg_function}({column.name})", column.table_name)
+    return FunctionCall(
+        agg_function, (column,), column.table_name, dialect=column._dialect
+    )
 
 
 def max_(column: Column | str) -> Column | str:
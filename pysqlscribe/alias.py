@@ -6,6 +6,7 @@ AS = "AS"
 
 
 class AliasMixin:
+    __slots__ = ()
     _alias: str | None = None
 
     def as_(self, alias: str) -> Self:
@@ -1,17 +1,28 @@
 from abc import ABC
-from typing import Self, Any
+from typing import Self
 
 from pysqlscribe.exceptions import InvalidNodeError, DialectValidationError
 from pysqlscribe.protocols import DialectProtocol
 
 
 class Node(ABC):
-    next_: Self | None = None
-    prev_: Self | None = None
-    state: dict[str, Any]
+    # nodes are allocated per clause of every query, so they're slotted and carry
+    # their clause's data as typed fields declared by each subclass
+    __slots__ = ("next_", "prev_", "_fingerprint")
 
-    def __init__(self, state):
-        self.state = state
+    def __init__(self):
+        self.next_: Self | None = None
+        self.prev_: Self | None = None
+        # digest of this node and the ones before it, see pysqlscribe.fingerprint
+        self._fingerprint: bytes | None = None
+
+    def clear_fingerprint(self) -> None:
+        """Forget the cached fingerprint of this node, and so of every node after
+        it; call after changing a node's data in place."""
+        node = self
+        while node is not None:
+            node._fingerprint = None
+            node = node.next_
 
     def add(self, next_: Self, dialect: DialectProtocol) -> None:
         try:
@@ -5,56 +5,101 @@ from pysqlscribe.ast.joins import JoinType
 from pysqlscribe.exceptions import InvalidJoinError
 
 
-class SelectNode(Node): ...
+class SelectNode(Node):
+    __slots__ = ("columns", "distinct")
 
+    def __init__(self, columns: list, distinct: bool = False):
+        super().__init__()
+        self.columns = columns
+        self.distinct = distinct
 
-class FromNode(Node): ...
+
+class FromNode(Node):
+    __slots__ = ("tables",)
+
+    def __init__(self, tables: list):
+        super().__init__()
+        self.tables = tables
 
 
 class JoinNode(Node):
-    def __init__(self, state):
-        super().__init__(state)
-        self.join_type = state.get("join_type", JoinType.INNER)
-        self.table = state["table"]
-        if (condition := state.get("condition")) and self.join_type in (
-            JoinType.NATURAL,
-            JoinType.CROSS,
-        ):
+    __slots__ = ("table", "join_type", "condition")
+
+    def __init__(self, table, join_type: str = JoinType.INNER, condition=None):
+        super().__init__()
+        self.join_type = join_type
+        self.table = table
+        if condition and self.join_type in (JoinType.NATURAL, JoinType.CROSS):
             raise InvalidJoinError(
                 "Conditions need to be supplied for any join which is not NATURAL or CROSS"
             )
         self.condition = condition
 
 
-class WhereNode(Node): ...
+class ConditionsNode(Node, ABC):
+    __slots__ = ("conditions",)
+
+    def __init__(self, conditions: list):
+        super().__init__()
+        self.conditions = conditions
+
+
+class WhereNode(ConditionsNode):
+    __slots__ = ()
 
 
-class OrderByNode(Node): ...
+class ColumnsNode(Node, ABC):
+    __slots__ = ("columns",)
 
+    def __init__(self, columns: list):
+        super().__init__()
+        self.columns = columns
 
-class LimitNode(Node): ...
 
+class OrderByNode(ColumnsNode):
+    __slots__ = ()
 
-class OffsetNode(Node): ...
 
+class LimitNode(Node):
+    __slots__ = ("limit",)
 
-class GroupByNode(Node): ...
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
 
 
-class HavingNode(Node): ...
+class OffsetNode(Node):
+    __slots__ = ("offset",)
+
+    def __init__(self, offset: int):
+        super().__init__()
+        self.offset = offset
+
+
+class GroupByNode(ColumnsNode):
+    __slots__ = ()
+
+
+class HavingNode(ConditionsNode):
+    __slots__ = ()
 
 
 class CombineNode(Node, ABC):
-    def __init__(self, state):
-        super().__init__(state)
-        self.query = state["query"]
-        self.all = state.get("all", False)
+    __slots__ = ("query", "all")
+
+    def __init__(self, query, all: bool = False):
+        super().__init__()
+        self.query = query
+        self.all = all
 
 
-class UnionNode(CombineNode): ...
+class UnionNode(CombineNode):
+    __slots__ = ()
 
 
-class ExceptNode(CombineNode): ...
+class ExceptNode(CombineNode):
+    __slots__ = ()
 
 
-class IntersectNode(CombineNode): ...
+class IntersectNode(CombineNode):
+    __slots__ = ()
@@ -5,15 +5,40 @@ from typing import Self, Iterable, Protocol, runtime_checkable
 from pysqlscribe.alias import AliasMixin
 from pysqlscribe.exceptions import InvalidColumnsError
 from pysqlscribe.functions import ScalarFunctions
-from pysqlscribe.params import Literal, ParamCollector, ansi_escape_value
+from pysqlscribe.params import (
+    Literal,
+    LiteralList,
+    Param,
+    ParamCollector,
+    ansi_escape_value,
+)
 from pysqlscribe.regex_patterns import (
     VALID_IDENTIFIER_REGEX,
     AGGREGATE_IDENTIFIER_REGEX,
     SCALAR_IDENTIFIER_REGEX,
     EXPRESSION_IDENTIFIER_REGEX,
+    ARITHMETIC_OPERAND_REGEX,
+    FUNCTION_ARGUMENT_REGEX,
 )
 
 
+def validate_column_name(column_name: str) -> None:
+    if not (
+        VALID_IDENTIFIER_REGEX.match(column_name)
+        or AGGREGATE_IDENTIFIER_REGEX.match(column_name)
+        or SCALAR_IDENTIFIER_REGEX.match(column_name)
+        or EXPRESSION_IDENTIFIER_REGEX.match(column_name)
+    ):
+        raise InvalidColumnsError(f"Invalid column name {column_name}")
+
+
+def _validate_operand(operand, pattern) -> None:
+    # non-column operands are written into the SQL as they are, so they must be
+    # numbers, identifiers (or, as function arguments, quoted strings)
+    if not isinstance(operand, Column) and not pattern.match(str(operand)):
+        raise InvalidColumnsError(f"Invalid operand {operand!r}")
+
+
 @runtime_checkable
 class DialectLike(Protocol):
     def escape_value(self, value) -> str: ...
@@ -34,6 +59,8 @@ def _resolve_value(value, dialect: DialectLike | None = None) -> str:
 class _BetweenPair:
     """Right-hand side of BETWEEN/NOT BETWEEN: two operands joined by AND."""
 
+    __slots__ = ("low", "high")
+
     def __init__(self, low, high):
         self.low = low
         self.high = high
@@ -44,6 +71,8 @@ def _render_operand(operand, collector: ParamCollector | None, dialect) -> str:
         if collector is not None:
             return collector.add(operand.value)
         return _resolve_value(operand.value, dialect)
+    if isinstance(operand, LiteralList):
+        return f"({operand.render(collector, dialect)})"
     if isinstance(operand, _BetweenPair):
         low = _render_operand(operand.low, collector, dialect)
         high = _render_operand(operand.high, collector, dialect)
@@ -78,6 +107,10 @@ def _to_operand(value):
 
 
 class Expression:
+    # expressions, columns and literals are allocated per predicate, so they're
+    # slotted to keep large queries compact
+    __slots__ = ("left", "operator", "right", "_dialect")
+
     def __init__(
         self, left, operator: str, right, *, dialect: DialectLike | None = None
     ):
@@ -108,22 +141,75 @@ class Expression:
 
 
 class CompoundExpression(Expression):
+    """``AND`` / ``OR`` over any number of operands.
+
+    ``CompoundExpression(left, operator, right)`` joins two operands;
+    ``CompoundExpression.of(operator, *operands)`` joins any number of them.
+    ``left`` is the first operand and ``right`` the rest, folded into a
+    compound of their own when there's more than one. Operands that are
+    themselves compounds with the same operator are spliced into ``terms()``,
+    so a chain like ``a | b | c`` reads and renders as a single flat ``OR``.
+    Chains are spliced lazily rather than copied on every ``|``, which keeps
+    building them linear.
+    """
+
+    __slots__ = ("operands",)
+
     def __init__(self, left: Expression, operator: str, right: Expression):
-        self.left = left
+        self._join(operator, (left, right))
+
+    @classmethod
+    def of(cls, operator: str, *operands: Expression) -> "CompoundExpression":
+        if not operands:
+            raise ValueError(f"{operator} needs at least one operand")
+        compound = cls.__new__(cls)
+        compound._join(operator, operands)
+        return compound
+
+    def _join(self, operator: str, operands: tuple) -> None:
         self.operator = operator
-        self.right = right
-        self._dialect = getattr(left, "_dialect", None) or getattr(
-            right, "_dialect", None
-        )
+        self.operands = operands
+        for operand in operands:
+            dialect = getattr(operand, "_dialect", None)
+            if dialect is not None:
+                break
+        self._dialect = dialect
+
+    @property
+    def left(self):
+        return self.operands[0]
+
+    @property
+    def right(self):
+        rest = self.operands[1:]
+        if len(rest) > 1:
+            return CompoundExpression.of(self.operator, *rest)
+        return rest[0] if rest else None
+
+    def terms(self) -> list:
+        terms = []
+        stack = list(reversed(self.operands))
+        while stack:
+            operand = stack.pop()
+            if (
+                isinstance(operand, CompoundExpression)
+                and operand.operator == self.operator
+            ):
+                stack.extend(reversed(operand.operands))
+            else:
+                terms.append(operand)
+        return terms
 
     def render(self, collector: ParamCollector | None = None) -> str:
-        return f"({self.left.render(collector)}) {self.operator} ({self.right.render(collector)})"
+        return render_predicate(self, collector)
 
     def __repr__(self):
-        return f"CompoundExpression({self.left!r}, {self.operator!r}, {self.right!r})"
+        return repr_predicate(self)
 
 
 class NotExpression(Expression):
+    __slots__ = ("inner",)
+
     def __init__(self, inner: Expression):
         self.inner = inner
         self.left = "NOT"
@@ -132,15 +218,107 @@ class NotExpression(Expression):
         self._dialect = getattr(inner, "_dialect", None)
 
     def render(self, collector: ParamCollector | None = None) -> str:
-        return f"NOT ({self.inner.render(collector)})"
+        return render_predicate(self, collector)
 
     def __repr__(self):
-        return f"NotExpression({self.inner!r})"
+        return repr_predicate(self)
+
+
+class OptionalCondition:
+    """A ``WHERE`` / ``HAVING`` condition that a ``QueryTemplate`` only renders
+    when each ``Param`` in it is bound; plain builds render it as is."""
+
+    __slots__ = ("condition",)
+
+    def __init__(self, condition: Expression):
+        self.condition = condition
+
+    def __repr__(self):
+        return f"OptionalCondition({self.condition!r})"
+
+
+def and_(*expressions: Expression) -> CompoundExpression:
+    return CompoundExpression.of("AND", *expressions)
+
+
+def or_(*expressions: Expression) -> CompoundExpression:
+    return CompoundExpression.of("OR", *expressions)
+
+
+# how tightly each boolean operator binds; the operand of NOT is always
+# parenthesised, so it's rendered as if at the top level
+_BOOLEAN_PRECEDENCE = {"OR": 1, "AND": 2}
+
+
+def render_predicate(
+    expression, collector: ParamCollector | None = None, precedence: int = 0
+) -> str:
+    """Render a tree of AND / OR / NOT expressions with an explicit stack, so
+    arbitrarily deep trees don't hit the recursion limit.
+
+    A compound is only parenthesised when it binds more loosely than the
+    context it appears in: ``precedence`` is that of the enclosing operator.
+    """
+    parts = []
+    stack = [(expression, precedence)]
+    while stack:
+        item, context = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        elif isinstance(item, CompoundExpression):
+            item_precedence = _BOOLEAN_PRECEDENCE.get(item.operator, 0)
+            separator = f" {item.operator} "
+            terms = item.terms()
+            wrap = item_precedence < context
+            if wrap:
+                stack.append((")", 0))
+            for index in range(len(terms) - 1, -1, -1):
+                stack.append((terms[index], item_precedence))
+                if index:
+                    stack.append((separator, 0))
+            if wrap:
+                stack.append(("(", 0))
+        elif isinstance(item, NotExpression):
+            stack.append((")", 0))
+            stack.append((item.inner, 0))
+            stack.append(("NOT (", 0))
+        else:
+            parts.append(item.render(collector))
+    return "".join(parts)
+
+
+def repr_predicate(expression) -> str:
+    """The repr of a tree of AND / OR / NOT expressions, built with an explicit
+    stack like ``render_predicate``."""
+    parts = []
+    stack = [expression]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        elif isinstance(item, CompoundExpression):
+            operator = repr(item.operator)
+            if len(item.operands) == 2:
+                left, right = item.operands
+                stack.extend((")", right, f", {operator}, ", left))
+                stack.append("CompoundExpression(")
+            else:
+                stack.append(")")
+                for operand in reversed(item.operands):
+                    stack.extend((operand, ", "))
+                stack.append(f"CompoundExpression.of({operator}")
+        elif isinstance(item, NotExpression):
+            stack.extend((")", item.inner, "NotExpression("))
+        else:
+            parts.append(repr(item))
+    return "".join(parts)
 
 
 class OrderedColumn:
     """A column paired with a sort direction, produced by Column.asc() or Column.desc()."""
 
+    __slots__ = ("name", "direction")
+
     def __init__(self, name: str, direction: str):
         self.name = name
         self.direction = direction.upper()
@@ -153,15 +331,28 @@ class Subqueryish(Protocol):
 
 
 class Column(AliasMixin):
+    __slots__ = (
+        "_name",
+        "_table_name",
+        "_fully_qualified_name",
+        "_dialect",
+        "_alias",
+        "data_type",
+    )
+
     def __init__(
         self,
         name: str,
         table_name: str,
         dialect: DialectLike | None = None,
+        data_type: str | None = None,
     ):
+        self._alias = None
+        self._table_name = table_name
         self.name = name
-        self.table_name = table_name
         self._dialect = dialect
+        # the column's type as declared in DDL, if known
+        self.data_type = data_type
 
     @property
     def name(self):
@@ -169,18 +360,22 @@ class Column(AliasMixin):
 
     @name.setter
     def name(self, column_name: str):
-        if not (
-            VALID_IDENTIFIER_REGEX.match(column_name)
-            or AGGREGATE_IDENTIFIER_REGEX.match(column_name)
-            or SCALAR_IDENTIFIER_REGEX.match(column_name)
-            or EXPRESSION_IDENTIFIER_REGEX.match(column_name)
-        ):
-            raise InvalidColumnsError(f"Invalid column name {column_name}")
+        validate_column_name(column_name)
         self._name = column_name
+        self._fully_qualified_name = f"{self._table_name}.{column_name}"
+
+    @property
+    def table_name(self):
+        return self._table_name
+
+    @table_name.setter
+    def table_name(self, table_name_: str):
+        self._table_name = table_name_
+        self._fully_qualified_name = f"{table_name_}.{self._name}"
 
     @property
     def fully_qualified_name(self):
-        return f"{self.table_name}.{self.name}"
+        return self._fully_qualified_name
 
     def _comparison_expression(self, operator: str, other: Self | str | int):
         if isinstance(other, Column):
@@ -192,7 +387,16 @@ class Column(AliasMixin):
             )
         if isinstance(
             other,
-            (str, int, float, bool, decimal.Decimal, datetime.date, datetime.datetime),
+            (
+                str,
+                int,
+                float,
+                bool,
+                decimal.Decimal,
+                datetime.date,
+                datetime.datetime,
+                Param,
+            ),
         ):
             return Expression(
                 self.fully_qualified_name,
@@ -205,16 +409,13 @@ class Column(AliasMixin):
         )
 
     def _arithmetic_expression(self, operator: str, other: Self | str | int):
-        if isinstance(other, Column):
-            return ExpressionColumn(
-                f"{self.fully_qualified_name} {operator} {other.fully_qualified_name}",
-                self.table_name,
-                dialect=self._dialect,
-            )
-        return ExpressionColumn(
-            f"{self.fully_qualified_name} {operator} {other}",
-            self.table_name,
-            dialect=self._dialect,
+        return ArithmeticOperation(
+            self, operator, other, self.table_name, dialect=self._dialect
+        )
+
+    def _function_call(self, function: str, *arguments) -> "FunctionCall":
+        return FunctionCall(
+            function, (self, *arguments), self.table_name, dialect=self._dialect
         )
 
     def _membership_expression(
@@ -227,22 +428,18 @@ class Column(AliasMixin):
                 other,
                 dialect=self._dialect,
             )
-        other_list = list(other)
-        if not other_list:
+        try:
+            values = LiteralList(other)
+        except ValueError:
             raise NotImplementedError(
                 "membership expressions must be created with a non-empty iterable or a subquery"
-            )
-        if all(isinstance(item, str) for item in other_list) or all(
-            isinstance(item, (int, float)) for item in other_list
-        ):
-            return Expression(
-                self.fully_qualified_name,
-                operator,
-                [Literal(item) for item in other_list],
-                dialect=self._dialect,
-            )
-        raise NotImplementedError(
-            "membership expressions must be created with an iterable containing items of the same type (all strings or all numbers); mixed types are not allowed"
+            ) from None
+        except TypeError:
+            raise NotImplementedError(
+                "membership expressions must be created with an iterable containing items of the same type (all strings or all numbers); mixed types are not allowed"
+            ) from None
+        return Expression(
+            self.fully_qualified_name, operator, values, dialect=self._dialect
         )
 
     def __str__(self):
@@ -279,33 +476,18 @@ class Column(AliasMixin):
         return self._arithmetic_expression("/", other)
 
     def __round__(self, ndigits: int | None = None):
-        round_expr = (
-            f"{ScalarFunctions.ROUND}({self.name}, {ndigits})"
-            if ndigits is not None
-            else f"{ScalarFunctions.ROUND}({self.name})"
-        )
-        return ExpressionColumn(round_expr, self.table_name, dialect=self._dialect)
+        if ndigits is None:
+            return self._function_call(ScalarFunctions.ROUND)
+        return self._function_call(ScalarFunctions.ROUND, ndigits)
 
     def __abs__(self):
-        return ExpressionColumn(
-            f"{ScalarFunctions.ABS}({self.name})",
-            self.table_name,
-            dialect=self._dialect,
-        )
+        return self._function_call(ScalarFunctions.ABS)
 
     def __floor__(self):
-        return ExpressionColumn(
-            f"{ScalarFunctions.FLOOR}({self.name})",
-            self.table_name,
-            dialect=self._dialect,
-        )
+        return self._function_call(ScalarFunctions.FLOOR)
 
     def __ceil__(self):
-        return ExpressionColumn(
-            f"{ScalarFunctions.CEIL}({self.name})",
-            self.table_name,
-            dialect=self._dialect,
-        )
+        return self._function_call(ScalarFunctions.CEIL)
 
     def in_(self, values: Iterable[str | int | float] | Subqueryish) -> Expression:
         return self._membership_expression("IN", values)
@@ -363,6 +545,8 @@ class ExpressionColumn(Column):
     """Representation of a column that is the result of an arithmetic operation. Main benefit is to ensure the
     fully qualified name doesn't prepend the table name each time."""
 
+    __slots__ = ()
+
     @property
     def fully_qualified_name(self):
         return self.name
@@ -371,13 +555,107 @@ class ExpressionColumn(Column):
         return self.name
 
 
+def _function_argument_sql(argument) -> str:
+    # columns are passed to functions by name, other values as they are
+    return argument.name if isinstance(argument, Column) else str(argument)
+
+
+class FunctionCall(ExpressionColumn):
+    """A SQL function applied to argument operands: columns, nested calls,
+    arithmetic or plain values.
+
+    The call is rendered from its parts when its ``name`` is first needed, so
+    nothing generated here goes through column name validation again.
+    """
+
+    __slots__ = ("function", "arguments")
+
+    def __init__(
+        self,
+        function: str,
+        arguments: Iterable,
+        table_name: str,
+        dialect: DialectLike | None = None,
+    ):
+        self._alias = None
+        self._name = None
+        self._table_name = table_name
+        self._dialect = dialect
+        self.data_type = None
+        self.function = str(function)
+        self.arguments = tuple(arguments)
+        for argument in self.arguments:
+            _validate_operand(argument, FUNCTION_ARGUMENT_REGEX)
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            arguments = ", ".join(map(_function_argument_sql, self.arguments))
+            self._name = f"{self.function}({arguments})"
+        return self._name
+
+
+_ARITHMETIC_PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2}
+
+
+class ArithmeticOperation(ExpressionColumn):
+    """``left operator right`` for ``+``, ``-``, ``*`` and ``/``, parenthesising
+    nested operations only where precedence requires it."""
+
+    __slots__ = ("left", "operator", "right")
+
+    def __init__(
+        self,
+        left,
+        operator: str,
+        right,
+        table_name: str,
+        dialect: DialectLike | None = None,
+    ):
+        self._alias = None
+        self._name = None
+        self._table_name = table_name
+        self._dialect = dialect
+        self.data_type = None
+        _validate_operand(left, ARITHMETIC_OPERAND_REGEX)
+        _validate_operand(right, ARITHMETIC_OPERAND_REGEX)
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    @property
+    def name(self) -> str:
+        if self._name is None:
+            left = self._operand_sql(self.left, right_side=False)
+            right = self._operand_sql(self.right, right_side=True)
+            self._name = f"{left} {self.operator} {right}"
+        return self._name
+
+    def _operand_sql(self, operand, right_side: bool) -> str:
+        if isinstance(operand, ArithmeticOperation):
+            precedence = _ARITHMETIC_PRECEDENCE[self.operator]
+            operand_precedence = _ARITHMETIC_PRECEDENCE[operand.operator]
+            # `a - (b - c)` needs its parentheses, `(a - b) - c` doesn't
+            if operand_precedence < precedence or (
+                right_side and operand_precedence == precedence
+            ):
+                return f"({operand.name})"
+            return operand.name
+        if isinstance(operand, Column):
+            return operand.fully_qualified_name
+        return str(operand)
+
+
 _UNSET = object()
 
 
 class Case(AliasMixin):
     """Builder for CASE WHEN ... THEN ... [ELSE ...] END expressions."""
 
+    __slots__ = ("_whens", "_else", "_alias")
+
     def __init__(self):
+        self._alias = None
         self._whens: list[tuple[Expression, object]] = []
         self._else = _UNSET
 
@@ -1,4 +1,4 @@
-from typing import Any, Self
+from typing import Self
 
 from pysqlscribe.exceptions import DuplicateCTENameError, EmptyCTEError
 from pysqlscribe.params import ParamCollector
@@ -22,38 +22,25 @@ class With(Query):
         self._subqueries[self._current_cte_name] = subquery
         return self
 
-    def build(
-        self, clear: bool = True, *, parameterize: bool = False
-    ) -> str | tuple[str, list[Any]]:
+    def _render(self, collector: ParamCollector | None) -> str:
         if not self._subqueries:
             raise EmptyCTEError(
                 f"No subqueries defined for WITH clause '{self._current_cte_name}'"
             )
         with_block = f"{WITH if not self.recursive else WITH_RECURSIVE}"
-        if parameterize:
-            collector = ParamCollector(self.dialect)
-            cte_queries = ", ".join(
-                f"{name} {AS} ({self._render_subquery(sub, collector)})"
-                for name, sub in self._subqueries.items()
-            )
-            outer = self.dialect.render(self.node, collector)
-            if clear:
-                self.node = None
-            return f"{with_block} {cte_queries} {outer}".strip(), collector.params
         cte_queries = ", ".join(
-            f"{name} {AS} ({self._render_subquery(sub, None)})"
+            f"{name} {AS} ({self._render_subquery(sub, collector)})"
             for name, sub in self._subqueries.items()
         )
-        outer = super().build(clear=clear)
+        outer = self.dialect.render(self.node, collector).strip()
         return f"{with_block} {cte_queries} {outer}"
 
-    @staticmethod
-    def _render_subquery(subquery, collector: ParamCollector | None) -> str:
+    def _render_subquery(self, subquery, collector: ParamCollector | None) -> str:
         if isinstance(subquery, Query):
             if collector is not None:
                 return subquery.dialect.render(subquery.node, collector)
             return str(subquery)
-        return subquery
+        return self.dialect.render_fragment(subquery, collector)
 
     def with_(self, cte_name: str) -> Self:
         if cte_name in self._subqueries:
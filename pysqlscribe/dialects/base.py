@@ -1,6 +1,6 @@
 import os
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Any, Dict, Sequence
 
 from pysqlscribe.ast.base import Node
 from pysqlscribe.ast.nodes import (
@@ -19,7 +19,12 @@ from pysqlscribe.ast.nodes import (
 )
 from pysqlscribe.env_utils import str2bool
 from pysqlscribe.exceptions import DialectValidationError
-from pysqlscribe.params import ansi_escape_value
+from pysqlscribe.fragments import normalize_fragment
+from pysqlscribe.params import (
+    ParameterizationPolicy,
+    PlaceholderStyle,
+    ansi_escape_value,
+)
 from pysqlscribe.regex_patterns import (
     VALID_IDENTIFIER_REGEX,
     AGGREGATE_IDENTIFIER_REGEX,
@@ -34,6 +39,17 @@ from pysqlscribe.renderers.base import Renderer
 
 class Dialect(ABC):
     __escape_identifiers_enabled: bool = True
+    # (old, new) replacements applied in order to the body of string literals
+    string_escapes: tuple[tuple[str, str], ...] = (("'", "''"),)
+    # raw SQL fragments (string conditions and CTE bodies) are rendered verbatim
+    # unless switched on; see pysqlscribe.fragments
+    normalize_raw_fragments: bool = False
+    lift_raw_literals: bool = False
+    # when set, builds that don't ask for parameterize=True/False are hybrid:
+    # the policy picks which literals are bound and which stay inline
+    parameterization_policy: ParameterizationPolicy | None = None
+    # overrides make_placeholder for bound parameters; see params.PLACEHOLDER_STYLES
+    placeholder_style: PlaceholderStyle | None = None
 
     def __init__(self):
         self._renderer = self.make_renderer()
@@ -137,10 +153,50 @@ class Dialect(ABC):
 
         Default rendering follows ANSI SQL (booleans as ``TRUE``/``FALSE``,
         ISO format for dates and datetimes); dialects whose engines lack a
-        native boolean type override this to emit ``1``/``0``.
+        native boolean type override this to emit ``1``/``0``. String escaping
+        is driven by ``string_escapes``.
         """
+        if isinstance(value, str):
+            for old, new in self.string_escapes:
+                value = value.replace(old, new)
+            return f"'{value}'"
         return ansi_escape_value(value)
 
+    def escape_values(self, values: Sequence[Any]) -> list[str]:
+        """Escape a sequence of literal values, as mapping ``escape_value`` over
+        it would. When every value has the same type, the type is dispatched
+        on once rather than once per value."""
+        types = set(map(type, values))
+        if len(types) != 1:
+            return list(map(self.escape_value, values))
+        value_type = types.pop()
+        if value_type is str:
+            escaped = values
+            for old, new in self.string_escapes:
+                escaped = [value.replace(old, new) for value in escaped]
+            return [f"'{value}'" for value in escaped]
+        if value_type is int or value_type is float:
+            return list(map(str, values))
+        if value_type is bool:
+            true, false = self.escape_value(True), self.escape_value(False)
+            return [true if value else false for value in values]
+        return list(map(self.escape_value, values))
+
+    def join_escaped_values(self, values: Sequence[Any], separator: str = ", ") -> str:
+        """Escape ``values`` and join them with ``separator``.
+
+        A sequence of strings is joined into one buffer first and escaped with
+        one ``replace`` per escape over the whole buffer, instead of per value.
+        """
+        if values and set(map(type, values)) == {str}:
+            joined = "\0".join(values)
+            # a NUL inside a value would be mistaken for a separator
+            if joined.count("\0") == len(values) - 1:
+                for old, new in self.string_escapes:
+                    joined = joined.replace(old, new)
+                return "'" + joined.replace("\0", f"'{separator}'") + "'"
+        return separator.join(self.escape_values(values))
+
     def normalize_identifiers_args(self, *args, collector=None) -> str:
         arg = args[0]
         if not isinstance(arg, (list, tuple)):
@@ -184,9 +240,34 @@ class Dialect(ABC):
     def escape_identifiers_enabled(self, value: bool):
         self.__escape_identifiers_enabled = value
 
+    @property
+    def backslash_escapes(self) -> bool:
+        return any(old == "\\" for old, _ in self.string_escapes)
+
+    def render_fragment(self, fragment: str, collector=None) -> str:
+        """Render a raw SQL fragment: verbatim, normalised, or normalised with
+        its literals lifted into ``collector`` on the parameterized path."""
+        if not self.normalize_raw_fragments:
+            return fragment
+        return normalize_fragment(
+            fragment,
+            collector=collector if self.lift_raw_literals else None,
+            backslash_escapes=self.backslash_escapes,
+        )
+
     def render(self, node: Node, collector=None) -> str:
         return self._renderer.render(node, collector)
 
+    def render_insert(self, table: str, columns, rows, collector=None) -> str:
+        return self._renderer.render_insert(table, columns, rows, collector)
+
+    def render_upsert(
+        self, table: str, columns, rows, keys, increments=(), collector=None
+    ) -> str:
+        return self._renderer.render_upsert(
+            table, columns, rows, keys, increments, collector
+        )
+
 
 class DialectRegistry:
     dialects: Dict[str, type[Dialect]] = {}
@@ -13,12 +13,11 @@ class MySQLDialect(Dialect):
     def _escape_identifier(self, identifier: str) -> str:
         return f"`{identifier}`"
 
+    # MySQL processes backslash escapes in string literals by default,
+    # so both backslashes and single quotes must be escaped.
+    string_escapes = (("\\", "\\\\"), ("'", "''"))
+
     def escape_value(self, value) -> str:
-        # MySQL processes backslash escapes in string literals by default,
-        # so both backslashes and single quotes must be escaped.
-        if isinstance(value, str):
-            escaped = value.replace("\\", "\\\\").replace("'", "''")
-            return f"'{escaped}'"
         # MySQL accepts TRUE / FALSE as aliases for 1 / 0, but stores booleans
         # as TINYINT(1); rendering 1 / 0 keeps the inline output canonical and
         # avoids depending on the alias. (Must precede int dispatch upstream.)
@@ -30,3 +30,12 @@ class EmptyCTEError(PySQLScribeError): ...
 
 class InvalidPathError(PySQLScribeError):
     """Custom exception for cases where a path not containing '.sql' files is provided"""
+
+
+class DuplicateTableError(PySQLScribeError): ...
+
+
+class IncompatibleQueriesError(PySQLScribeError): ...
+
+
+class TemplateParameterError(PySQLScribeError): ...
@@ -0,0 +1,257 @@
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Mapping, Sequence
+
+from pysqlscribe.regex_patterns import RETURNS_ROWS_REGEX
+
+# pymysql / MySQLdb client capability flag enabling `;`-separated statements
+CLIENT_MULTI_STATEMENTS = 1 << 16
+
+
+class Statement:
+    """One statement of a batch: rendered SQL and its bound params."""
+
+    def __init__(self, sql: str, params: Sequence[Any] | Mapping[str, Any] = ()):
+        self.sql = sql
+        # named placeholder styles bind from a dict
+        self.params = dict(params) if isinstance(params, Mapping) else list(params)
+        self.returns_rows = bool(RETURNS_ROWS_REGEX.search(sql))
+
+    @classmethod
+    def from_any(cls, statement) -> "Statement":
+        """Accept a built ``Query``, a ``(sql, params)`` pair or a raw SQL string."""
+        if isinstance(statement, Statement):
+            return statement
+        if isinstance(statement, str):
+            return cls(statement)
+        if isinstance(statement, tuple):
+            sql, params = statement
+            return cls(sql, params)
+        return cls(*statement.build(parameterize=True))
+
+
+class StatementResult:
+    def __init__(
+        self,
+        columns: list[str] | None = None,
+        rows: list[tuple] | None = None,
+        rowcount: int = -1,
+    ):
+        self.columns = columns
+        self.rows = rows
+        self.rowcount = rowcount
+
+    def __repr__(self):
+        return (
+            f"StatementResult(columns={self.columns!r}, rows={self.rows!r}, "
+            f"rowcount={self.rowcount!r})"
+        )
+
+
+class BatchResult:
+    def __init__(self, results: list[StatementResult], round_trips: int, strategy: str):
+        self.results = results
+        self.round_trips = round_trips
+        self.strategy = strategy
+
+    @property
+    def round_trips_saved(self) -> int:
+        return len(self.results) - self.round_trips
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def __getitem__(self, index: int) -> StatementResult:
+        return self.results[index]
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+def _collect(cursor) -> StatementResult:
+    if cursor.description is None:
+        return StatementResult(rowcount=cursor.rowcount)
+    columns = [column[0] for column in cursor.description]
+    return StatementResult(columns, cursor.fetchall(), cursor.rowcount)
+
+
+class BatchStrategy(ABC):
+    name: str
+
+    @abstractmethod
+    def run(self, connection, statements: list[Statement]) -> BatchResult: ...
+
+
+class SequentialStrategy(BatchStrategy):
+    """One round trip per statement, all inside a single transaction."""
+
+    name = "sequential"
+
+    def run(self, connection, statements: list[Statement]) -> BatchResult:
+        results = []
+        cursor = connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement.sql, statement.params)
+                results.append(_collect(cursor))
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        return BatchResult(results, len(statements), self.name)
+
+
+class PipelineStrategy(BatchStrategy):
+    """psycopg 3 pipeline mode: every statement is queued and sent in one flush."""
+
+    name = "pipeline"
+
+    def run(self, connection, statements: list[Statement]) -> BatchResult:
+        cursors = []
+        try:
+            with connection.pipeline():
+                for statement in statements:
+                    cursor = connection.cursor()
+                    cursor.execute(statement.sql, statement.params)
+                    cursors.append(cursor)
+            results = [_collect(cursor) for cursor in cursors]
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            for cursor in cursors:
+                cursor.close()
+        return BatchResult(results, 1, self.name)
+
+
+class MultiStatementStrategy(BatchStrategy):
+    """``;``-joined statements sent in one ``execute`` and read back with
+    ``nextset()``. Needs a driver that interpolates ``%s`` params client side
+    and a server accepting multi-statements (MySQL ``CLIENT_MULTI_STATEMENTS``).
+    """
+
+    name = "multi_statement"
+
+    def run(self, connection, statements: list[Statement]) -> BatchResult:
+        # named params of separate statements could share a name, so only
+        # positional ones can be joined into one list
+        if any(isinstance(statement.params, dict) for statement in statements):
+            raise ValueError(
+                "The multi_statement strategy needs positional params; "
+                "render the statements with a positional placeholder style"
+            )
+        sql = "; ".join(statement.sql for statement in statements)
+        params = [param for statement in statements for param in statement.params]
+        results = []
+        cursor = connection.cursor()
+        try:
+            cursor.execute(sql, params or None)
+            for index in range(len(statements)):
+                results.append(_collect(cursor))
+                if index < len(statements) - 1:
+                    cursor.nextset()
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        return BatchResult(results, 1, self.name)
+
+
+class ScriptStrategy(BatchStrategy):
+    """SQLite: runs of non-returning statements are sent through one
+    ``executescript`` call; statements returning rows or carrying bound
+    params are executed individually. ``executescript`` does not report
+    per-statement row counts.
+
+    Each script runs in its own ``BEGIN``/``COMMIT`` and is rolled back if one
+    of its statements fails. The batch as a whole is not atomic, though:
+    ``executescript`` commits any open transaction first, so statements run
+    before a script are committed by it. Use ``sequential`` when every
+    statement must succeed or fail together."""
+
+    name = "script"
+
+    def run(self, connection, statements: list[Statement]) -> BatchResult:
+        results: list[StatementResult] = []
+        round_trips = 0
+        script: list[str] = []
+
+        def flush_script():
+            nonlocal round_trips
+            if script:
+                connection.executescript("BEGIN;\n" + ";\n".join(script) + ";\nCOMMIT;")
+                round_trips += 1
+                script.clear()
+
+        cursor = connection.cursor()
+        try:
+            for statement in statements:
+                if not statement.returns_rows and not statement.params:
+                    script.append(statement.sql)
+                    results.append(StatementResult())
+                    continue
+                flush_script()
+                cursor.execute(statement.sql, statement.params)
+                results.append(_collect(cursor))
+                round_trips += 1
+            flush_script()
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        return BatchResult(results, round_trips, self.name)
+
+
+STRATEGIES: dict[str, type[BatchStrategy]] = {
+    strategy.name: strategy
+    for strategy in (
+        SequentialStrategy,
+        PipelineStrategy,
+        MultiStatementStrategy,
+        ScriptStrategy,
+    )
+}
+
+
+def choose_strategy(connection) -> BatchStrategy:
+    """Pick the cheapest strategy the driver behind ``connection`` supports."""
+    if isinstance(connection, sqlite3.Connection):
+        return ScriptStrategy()
+    if callable(getattr(connection, "pipeline", None)):
+        return PipelineStrategy()
+    if getattr(connection, "client_flag", 0) & CLIENT_MULTI_STATEMENTS:
+        return MultiStatementStrategy()
+    return SequentialStrategy()
+
+
+def execute_batch(
+    connection,
+    statements: Iterable[Any],
+    *,
+    strategy: str | BatchStrategy | None = None,
+) -> BatchResult:
+    """Send ``statements`` in as few round trips as the driver allows.
+
+    Statements may be built ``Query`` objects, ``(sql, params)`` pairs or raw
+    SQL strings, mixing DML and SELECTs. Results come back in statement order;
+    ``BatchResult.round_trips_saved`` reports the round trips avoided compared
+    with executing every statement on its own. Without batching support the
+    statements run one by one inside a single transaction.
+    """
+    if strategy is None:
+        strategy = choose_strategy(connection)
+    elif isinstance(strategy, str):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported batch strategy: {strategy}")
+        strategy = STRATEGIES[strategy]()
+    prepared = [Statement.from_any(statement) for statement in statements]
+    if not prepared:
+        return BatchResult([], 0, strategy.name)
+    return strategy.run(connection, prepared)
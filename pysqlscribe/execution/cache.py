@@ -0,0 +1,243 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Mapping
+
+from pysqlscribe.ast.nodes import CombineNode, ConditionsNode, FromNode, JoinNode
+from pysqlscribe.column import (
+    CompoundExpression,
+    Expression,
+    OptionalCondition,
+    _BetweenPair,
+)
+from pysqlscribe.execution.dbapi import fetch_all
+from pysqlscribe.regex_patterns import ALIAS_SPLIT_REGEX, VALID_IDENTIFIER_REGEX
+
+ANY_TABLE = "*"
+
+
+def _table_key(name: str) -> str:
+    # writes are reported by bare table name, so index entries the same way
+    return name.rsplit(".", 1)[-1].lower()
+
+
+def _is_query_like(obj) -> bool:
+    return hasattr(obj, "node") and hasattr(obj, "dialect")
+
+
+def referenced_tables(query) -> frozenset[str]:
+    """Return the (lower-cased, unqualified) names of every table ``query`` reads.
+
+    Walks the node chain, join targets, subqueries in ``FROM``/``IN``/set
+    operations and CTE bodies. References that cannot be resolved to a table
+    name (raw SQL strings used as subqueries, conditions or CTE bodies) are
+    reported as ``ANY_TABLE``.
+    """
+    tables: set[str] = set()
+    walked: set[int] = set()
+    stack: list[Any] = [query]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            continue
+        if item is ANY_TABLE:
+            tables.add(ANY_TABLE)
+        elif isinstance(item, str):
+            name = ALIAS_SPLIT_REGEX.split(item.strip(), maxsplit=1)[0].strip()
+            if VALID_IDENTIFIER_REGEX.match(name):
+                tables.add(_table_key(name))
+            else:
+                tables.add(ANY_TABLE)
+        elif _is_query_like(item):
+            if hasattr(item, "_table_name"):
+                tables.add(_table_key(item._table_name))
+            # a Table is both a FROM target and the query built on it
+            if id(item) in walked:
+                continue
+            walked.add(id(item))
+            stack.extend(
+                ANY_TABLE if isinstance(subquery, str) else subquery
+                for subquery in getattr(item, "_subqueries", {}).values()
+            )
+            node = item.node
+            while node is not None:
+                stack.extend(_node_references(node))
+                node = node.prev_
+        elif isinstance(item, CompoundExpression):
+            stack.extend(item.operands)
+        elif isinstance(item, OptionalCondition):
+            stack.append(item.condition)
+        elif isinstance(item, Expression):
+            stack.extend(
+                operand
+                for operand in (item.left, item.right)
+                if not isinstance(operand, str)
+            )
+        elif isinstance(item, _BetweenPair):
+            stack.extend((item.low, item.high))
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return frozenset(tables)
+
+
+def _node_references(node) -> list[Any]:
+    if isinstance(node, FromNode):
+        return list(node.tables)
+    if isinstance(node, JoinNode):
+        condition = node.condition
+        return [node.table, ANY_TABLE if isinstance(condition, str) else condition]
+    if isinstance(node, CombineNode):
+        return [node.query]
+    if isinstance(node, ConditionsNode):
+        # raw SQL may hide a subquery reading any table
+        return [ANY_TABLE if isinstance(c, str) else c for c in node.conditions]
+    return []
+
+
+class _Entry:
+    def __init__(self, columns, rows, tables, expires_at):
+        self.columns = columns
+        self.rows = rows
+        self.tables = tables
+        self.expires_at = expires_at
+
+
+class ResultCache:
+    """LRU cache of query results keyed by the rendered ``(sql, params)``.
+
+    Each entry remembers the tables its query reads. Reporting a write with
+    ``invalidate(table_name)`` bumps that table's version and drops every
+    dependent entry; results fetched concurrently with an invalidation are
+    not stored, so a stale read can never repopulate the cache.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._dependents: dict[str, set[Hashable]] = {}
+        self._versions: dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def execute(self, connection, query) -> tuple[list[str], list[tuple]]:
+        """Return ``(columns, rows)`` for ``query``, hitting the database on a miss."""
+        tables = referenced_tables(query)
+        sql, params = query.build(parameterize=True)
+        return self.fetch(connection, sql, params, tables)
+
+    def fetch(
+        self, connection, sql: str, params, tables: frozenset[str]
+    ) -> tuple[list[str], list[tuple]]:
+        try:
+            if isinstance(params, Mapping):
+                key = (sql, tuple(params.items()))
+            else:
+                key = (sql, tuple(params))
+            hash(key)
+        except TypeError:
+            # unhashable bound values can't be keyed; run uncached
+            return fetch_all(connection, sql, params)
+        with self._lock:
+            self._before_lookup(connection)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at is None or entry.expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.columns, list(entry.rows)
+                self._discard(key)
+            self.misses += 1
+            snapshot = self._snapshot(tables)
+        columns, rows = fetch_all(connection, sql, params)
+        with self._lock:
+            if snapshot == self._snapshot(tables):
+                self._store(key, columns, rows, tables)
+        return columns, list(rows)
+
+    def invalidate(self, *table_names: str) -> None:
+        """Drop cached results that read any of ``table_names`` (all, if none given)."""
+        with self._lock:
+            if not table_names:
+                self._epoch += 1
+                self._entries.clear()
+                self._dependents.clear()
+                return
+            for name in {_table_key(name) for name in table_names} | {ANY_TABLE}:
+                self._versions[name] = self._versions.get(name, 0) + 1
+                for key in list(self._dependents.get(name, ())):
+                    self._discard(key)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def _before_lookup(self, connection) -> None:
+        """Hook for subclasses to detect out-of-band writes before a lookup."""
+
+    def _snapshot(self, tables: frozenset[str]) -> tuple:
+        return self._epoch, tuple(
+            self._versions.get(name, 0) for name in sorted(tables | {ANY_TABLE})
+        )
+
+    def _store(self, key, columns, rows, tables) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = _Entry(columns, tuple(rows), tables, expires_at)
+        for name in tables:
+            self._dependents.setdefault(name, set()).add(key)
+        while len(self._entries) > self.maxsize:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key) -> None:
+        entry = self._entries.pop(key)
+        for name in entry.tables:
+            dependents = self._dependents.get(name)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[name]
+
+
+class SQLiteResultCache(ResultCache):
+    """``ResultCache`` that also notices commits made by other SQLite connections.
+
+    Before every lookup it reads ``PRAGMA data_version`` on the connection in
+    use and clears the cache when the value moved, which happens whenever any
+    other connection (including ones in other processes) committed a change.
+    Writes made through the same connection still need ``invalidate()``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._data_versions: dict[int, int] = {}
+
+    def _before_lookup(self, connection) -> None:
+        cursor = connection.cursor()
+        try:
+            (version,) = cursor.execute("PRAGMA data_version").fetchone()
+        finally:
+            cursor.close()
+        previous = self._data_versions.get(id(connection))
+        self._data_versions[id(connection)] = version
+        if previous is not None and previous != version:
+            self.invalidate()
+
+    def forget(self, connection) -> None:
+        """Stop tracking ``connection`` (call before closing it)."""
+        with self._lock:
+            self._data_versions.pop(id(connection), None)
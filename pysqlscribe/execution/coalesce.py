@@ -0,0 +1,150 @@
+import copy
+from typing import Any, Sequence
+
+from pysqlscribe.ast.nodes import (
+    CombineNode,
+    ConditionsNode,
+    LimitNode,
+    OffsetNode,
+    OrderByNode,
+    SelectNode,
+)
+from pysqlscribe.exceptions import IncompatibleQueriesError
+from pysqlscribe.execution.dbapi import fetch_all
+from pysqlscribe.query import Query
+from pysqlscribe.regex_patterns import ALIAS_REGEX, WILDCARD_REGEX
+
+_UNSUPPORTED_NODES = (OrderByNode, LimitNode, OffsetNode, CombineNode)
+
+
+def _head(query: Query):
+    node = query.node
+    while node.prev_ is not None:
+        node = node.prev_
+    return node
+
+
+def _clone_branch(query: Query, index: int, discriminator: str) -> Query:
+    """Copy ``query`` and its node chain, prefixing the projection with ``index``.
+
+    The caller's query is left untouched, so it can still be built on its own.
+    """
+    if query.node is None:
+        raise IncompatibleQueriesError("Cannot coalesce an empty query")
+    head = _head(query)
+    clone = copy.copy(query)
+    previous = None
+    node = head
+    while node is not None:
+        if isinstance(node, _UNSUPPORTED_NODES):
+            raise IncompatibleQueriesError(
+                f"{type(node).__name__} is not supported in a coalesced query"
+            )
+        node_copy = copy.copy(node)
+        if isinstance(node, ConditionsNode):
+            # a later where() on the source extends its node's list in place
+            node_copy.conditions = list(node.conditions)
+        node_copy.prev_ = previous
+        node_copy.next_ = None
+        if previous is not None:
+            previous.next_ = node_copy
+        else:
+            columns = _projection(query, node_copy)
+            node_copy.columns = [f"{index} AS {discriminator}", *columns]
+            first = node_copy
+        previous = node_copy
+        node = node.next_
+    # the copies carry the original's cached fingerprints, which no longer
+    # match the changed projection
+    first.clear_fingerprint()
+    clone.node = previous
+    return clone
+
+
+def _projection(query: Query, select: SelectNode) -> list[Any]:
+    columns = list(select.columns)
+    if not columns or (
+        len(columns) == 1
+        and isinstance(columns[0], str)
+        and WILDCARD_REGEX.match(columns[0])
+    ):
+        # `*` can't follow the discriminator column in every dialect; expand it
+        # from the table definition when we have one
+        if not getattr(query, "columns", None):
+            raise IncompatibleQueriesError(
+                "SELECT * can only be coalesced for a Table with known columns"
+            )
+        columns = list(query.columns)
+    return columns
+
+
+class CoalescedQuery:
+    """Several independent SELECTs combined into a single ``UNION ALL`` statement.
+
+    Each branch is prefixed with a constant discriminator column holding its
+    position, so ``split`` can route the combined rows back to the query that
+    produced them. Parameters are collected in branch order by the regular
+    ``UnionNode`` rendering path. Branches must project the same number of
+    columns and may not contain ``ORDER BY``, ``LIMIT``, ``OFFSET`` or set
+    operations of their own. Only the number of columns is checked: rows are
+    split by position, so lining up their order and types is up to the caller.
+
+    Like ``Query.build``, the source queries are cleared once combined unless
+    ``clear=False`` is passed.
+    """
+
+    def __init__(
+        self, *queries: Query, discriminator: str = "query_index", clear: bool = True
+    ):
+        if not queries:
+            raise IncompatibleQueriesError("At least one query is required")
+        if not ALIAS_REGEX.match(discriminator):
+            raise ValueError(f"Invalid SQL alias: {discriminator}")
+        dialects = {type(query.dialect) for query in queries}
+        if len(dialects) > 1:
+            raise IncompatibleQueriesError(
+                "Coalesced queries must share a dialect, got "
+                + ", ".join(sorted(d.__name__ for d in dialects))
+            )
+        self.queries = queries
+        self.discriminator = discriminator
+        branches = [
+            _clone_branch(query, index, discriminator)
+            for index, query in enumerate(queries)
+        ]
+        widths = {len(_head(branch).columns) for branch in branches}
+        if len(widths) > 1:
+            raise IncompatibleQueriesError(
+                "Coalesced queries must project the same number of columns"
+            )
+        if clear:
+            for query in queries:
+                query.node = None
+        self._combined = branches[0]
+        for branch in branches[1:]:
+            self._combined.union(branch, all_=True)
+
+    @property
+    def round_trips_saved(self) -> int:
+        return len(self.queries) - 1
+
+    def build(self, *, parameterize: bool | None = None) -> str | tuple[str, list[Any]]:
+        return self._combined.build(clear=False, parameterize=parameterize)
+
+    def split(self, rows: Sequence[Sequence[Any]]) -> list[list[tuple]]:
+        """Route combined result rows back to their originating query, in order."""
+        results: list[list[tuple]] = [[] for _ in self.queries]
+        for row in rows:
+            results[int(row[0])].append(tuple(row[1:]))
+        return results
+
+    def execute(self, connection) -> list[list[tuple]]:
+        sql, params = self.build(parameterize=True)
+        _, rows = fetch_all(connection, sql, params)
+        return self.split(rows)
+
+
+def coalesce(
+    *queries: Query, discriminator: str = "query_index", clear: bool = True
+) -> CoalescedQuery:
+    return CoalescedQuery(*queries, discriminator=discriminator, clear=clear)
@@ -0,0 +1,27 @@
+from typing import Any, Mapping, Sequence
+
+
+def fetch_all(
+    connection,
+    sql: str,
+    params: Sequence[Any] | Mapping[str, Any] | None = None,
+) -> tuple[list[str], list[tuple]]:
+    """Execute ``sql`` on a DB-API 2.0 connection and return ``(columns, rows)``.
+
+    ``columns`` is taken from ``cursor.description`` and is empty for statements
+    that do not return rows.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(sql, params or [])
+        if cursor.description is None:
+            return [], []
+        return [column[0] for column in cursor.description], cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def fetch_query(connection, query) -> tuple[list[str], list[tuple]]:
+    """Build ``query`` with bound parameters and execute it on ``connection``."""
+    sql, params = query.build(parameterize=True)
+    return fetch_all(connection, sql, params)
@@ -0,0 +1,219 @@
+import asyncio
+import copy
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+from pysqlscribe.column import Column
+from pysqlscribe.execution.dbapi import fetch_all
+from pysqlscribe.table import Table
+
+_PENDING = object()
+
+
+class Lookup:
+    """Handle for a single key requested from a ``KeyLoader``.
+
+    The value becomes available once the loader dispatches its pending batch;
+    calling ``result()`` before that forces the dispatch.
+    """
+
+    def __init__(self, loader: "KeyLoader", key: Hashable):
+        self._loader = loader
+        self.key = key
+        self._value = _PENDING
+        self._error: BaseException | None = None
+        self._callbacks: list[Callable[["Lookup"], None]] = []
+
+    @property
+    def done(self) -> bool:
+        return self._value is not _PENDING or self._error is not None
+
+    def result(self) -> Any:
+        if not self.done:
+            self._loader.dispatch()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def add_done_callback(self, callback: Callable[["Lookup"], None]) -> None:
+        if self.done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _resolve(self, value: Any) -> None:
+        self._value = value
+        self._run_callbacks()
+
+    def _fail(self, error: BaseException) -> None:
+        self._error = error
+        self._run_callbacks()
+
+    def _run_callbacks(self) -> None:
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+
+class KeyLoader:
+    """Coalesces point lookups on one key column into batched ``IN`` queries.
+
+    Keys requested with ``defer`` (inside a ``batch()`` scope) or ``aload``
+    (within one event-loop tick) are collected and fetched with a single
+    ``SELECT ... WHERE key IN (...)`` built through ``Column.in_``; the rows are
+    then fanned back out to each caller by key. Loaded keys, including misses,
+    are cached for the lifetime of the loader, so one loader is meant to be
+    scoped to a single request. Loaders are not thread-safe.
+
+    With ``unique=True`` (the default) each key resolves to one row dict or
+    ``None``; with ``unique=False`` it resolves to a (possibly empty) list of
+    row dicts.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        key: str | Column,
+        connection,
+        *,
+        columns: Iterable[str | Column] = (),
+        unique: bool = True,
+        max_batch_size: int | None = None,
+        cache: bool = True,
+    ):
+        if max_batch_size is not None and max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+        self.table = table
+        self.key = key.name if isinstance(key, Column) else key
+        self.connection = connection
+        self.columns = [c.name if isinstance(c, Column) else c for c in columns]
+        if self.columns and self.key not in self.columns:
+            self.columns.append(self.key)
+        self.unique = unique
+        self.max_batch_size = max_batch_size
+        self.cache_enabled = cache
+        self._cache: dict[Hashable, Any] = {}
+        self._pending: dict[Hashable, list[Lookup]] = {}
+        self._dispatch_scheduled = False
+
+    def defer(self, key: Hashable) -> Lookup:
+        """Queue ``key`` for the next dispatch and return its ``Lookup``."""
+        lookup = Lookup(self, key)
+        if self.cache_enabled and key in self._cache:
+            lookup._resolve(self._cache[key])
+        else:
+            self._pending.setdefault(key, []).append(lookup)
+        return lookup
+
+    def load(self, key: Hashable) -> Any:
+        return self.defer(key).result()
+
+    def load_many(self, keys: Iterable[Hashable]) -> list[Any]:
+        lookups = [self.defer(key) for key in keys]
+        self.dispatch()
+        return [lookup.result() for lookup in lookups]
+
+    async def aload(self, key: Hashable) -> Any:
+        """Load ``key``, batching it with every other key requested in this tick.
+
+        The batch runs on the event loop thread via the loader's (blocking)
+        DB-API connection once the current tick's callbacks have been scheduled.
+        """
+        lookup = self.defer(key)
+        if lookup.done:
+            return lookup.result()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def _transfer(done: Lookup) -> None:
+            if future.cancelled():
+                return
+            if done._error is not None:
+                future.set_exception(done._error)
+            else:
+                future.set_result(done._value)
+
+        lookup.add_done_callback(_transfer)
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            loop.call_soon(self.dispatch)
+        return await future
+
+    async def aload_many(self, keys: Iterable[Hashable]) -> list[Any]:
+        return list(await asyncio.gather(*(self.aload(key) for key in keys)))
+
+    @contextmanager
+    def batch(self) -> Iterator["KeyLoader"]:
+        """Collect every ``defer`` made inside the block into one dispatch."""
+        try:
+            yield self
+        finally:
+            self.dispatch()
+
+    def dispatch(self) -> None:
+        """Fetch every pending key and resolve the waiting lookups."""
+        self._dispatch_scheduled = False
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        keys = list(pending)
+        size = self.max_batch_size or len(keys)
+        for start in range(0, len(keys), size):
+            chunk = keys[start : start + size]
+            try:
+                rows_by_key = self._fetch(chunk)
+            except Exception as e:
+                for key in chunk:
+                    for lookup in pending[key]:
+                        lookup._fail(e)
+                continue
+            for key in chunk:
+                rows = rows_by_key.get(key, [])
+                if self.unique:
+                    value = rows[0] if rows else None
+                else:
+                    value = rows
+                if self.cache_enabled:
+                    self._cache[key] = value
+                for lookup in pending[key]:
+                    lookup._resolve(value)
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        """Seed the cache with an already-known value for ``key``."""
+        if self.cache_enabled:
+            self._cache.setdefault(key, value)
+
+    def clear(self, key: Hashable | None = None) -> None:
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _fetch(self, keys: list[Hashable]) -> dict[Hashable, list[dict[str, Any]]]:
+        # build on a copy: ``select`` starts a node chain on the table itself,
+        # which would clobber a query the caller has in progress on it and race
+        # with concurrent fetches
+        table = copy.copy(self.table)
+        table.node = None
+        key_column = getattr(table, self.key)
+        sql, params = (
+            table.select(*self.columns)
+            .where(key_column.in_(keys))
+            .build(parameterize=True)
+        )
+        names, rows = fetch_all(self.connection, sql, params)
+        key_index = self._key_index(names)
+        rows_by_key: dict[Hashable, list[dict[str, Any]]] = {}
+        for row in rows:
+            rows_by_key.setdefault(row[key_index], []).append(dict(zip(names, row)))
+        return rows_by_key
+
+    def _key_index(self, names: list[str]) -> int:
+        # some drivers (e.g. Oracle) report case-folded column names
+        lowered = [name.lower() for name in names]
+        try:
+            return lowered.index(self.key.lower())
+        except ValueError:
+            raise ValueError(
+                f"Key column {self.key} is missing from the result set"
+            ) from None
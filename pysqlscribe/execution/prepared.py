@@ -0,0 +1,213 @@
+"""Server-side prepared statements, for drivers that don't cache them client side.
+
+A query is compiled to SQL with server placeholders (``$1`` for Postgres, ``?``
+for MySQL), prepared once under a name derived from that SQL, and from then on
+run with ``EXECUTE``, so the server skips parsing and planning. Queries that
+compile to the same SQL share a statement whatever their values; the
+``EXECUTE`` arguments are bound through the driver like any other params, so
+it needs a driver that interpolates them client side (psycopg2, pymysql).
+"""
+
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any
+
+from pysqlscribe.dialects import MySQLDialect, PostgreSQLDialect
+from pysqlscribe.params import ParamCollector, PlaceholderStyle
+
+
+class _RecordingStyle(PlaceholderStyle):
+    """A reusable placeholder style noting the parameter number behind each
+    placeholder, in the order the placeholders are written."""
+
+    __slots__ = ("indexes",)
+
+    def __init__(self, template: str):
+        super().__init__("prepared", template, reusable=True)
+        self.indexes: list[int] = []
+
+    def placeholder(self, index: int) -> str:
+        self.indexes.append(index)
+        return super().placeholder(index)
+
+
+class PrepareSyntax(ABC):
+    """The ``PREPARE`` / ``EXECUTE`` / ``DEALLOCATE`` statements of one server."""
+
+    # how parameters are written in the text of a prepared statement
+    template: str
+
+    @abstractmethod
+    def prepare(self, name: str, sql: str, dialect) -> str: ...
+
+    @abstractmethod
+    def execute(
+        self, name: str, indexes: list[int], values: list[Any], dialect
+    ) -> list[tuple[str, Any]]:
+        """The ``(sql, params)`` statements running ``name`` with ``values``;
+        ``indexes`` are the (1-indexed) values behind each placeholder, in order."""
+
+    @abstractmethod
+    def deallocate(self, name: str) -> str: ...
+
+
+class PostgresPrepareSyntax(PrepareSyntax):
+    """``PREPARE name AS ... $1 ...`` and ``EXECUTE name(...)``. Numbered
+    parameters can be repeated, so each distinct value is passed once."""
+
+    template = "${index}"
+
+    def prepare(self, name: str, sql: str, dialect) -> str:
+        return f"PREPARE {name} AS {sql}"
+
+    def execute(
+        self, name: str, indexes: list[int], values: list[Any], dialect
+    ) -> list[tuple[str, Any]]:
+        if not values:
+            return [(f"EXECUTE {name}", None)]
+        collector = ParamCollector(dialect)
+        arguments = ", ".join(collector.add_many(values))
+        return [(f"EXECUTE {name}({arguments})", collector.bind_params)]
+
+    def deallocate(self, name: str) -> str:
+        return f"DEALLOCATE {name}"
+
+
+class MySQLPrepareSyntax(PrepareSyntax):
+    """``PREPARE name FROM '...'`` and ``EXECUTE name USING @...``. ``EXECUTE``
+    only takes user variables, which are set first; a repeated value is set
+    once and its variable used for every placeholder it fills."""
+
+    template = "?"
+
+    def prepare(self, name: str, sql: str, dialect) -> str:
+        return f"PREPARE {name} FROM {dialect.escape_value(sql)}"
+
+    def execute(
+        self, name: str, indexes: list[int], values: list[Any], dialect
+    ) -> list[tuple[str, Any]]:
+        if not values:
+            return [(f"EXECUTE {name}", None)]
+        collector = ParamCollector(dialect)
+        assignments = ", ".join(
+            f"@{name}_{index} = {placeholder}"
+            for index, placeholder in enumerate(collector.add_many(values), 1)
+        )
+        variables = ", ".join(f"@{name}_{index}" for index in indexes)
+        return [
+            (f"SET {assignments}", collector.bind_params),
+            (f"EXECUTE {name} USING {variables}", None),
+        ]
+
+    def deallocate(self, name: str) -> str:
+        return f"DEALLOCATE PREPARE {name}"
+
+
+def prepare_syntax(dialect) -> PrepareSyntax:
+    if isinstance(dialect, PostgreSQLDialect):
+        return PostgresPrepareSyntax()
+    if isinstance(dialect, MySQLDialect):
+        return MySQLPrepareSyntax()
+    raise ValueError(
+        f"Server-side prepared statements are not supported for "
+        f"{type(dialect).__name__}"
+    )
+
+
+def _run(connection, sql: str, params=None) -> tuple[list[str], list[tuple]]:
+    cursor = connection.cursor()
+    try:
+        # without params the driver leaves the SQL alone, `%` included
+        if params:
+            cursor.execute(sql, params)
+        else:
+            cursor.execute(sql)
+        if cursor.description is None:
+            return [], []
+        return [column[0] for column in cursor.description], cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+class PreparedStatementManager:
+    """Prepares queries on the server and executes them by name.
+
+    Prepared statements live in a connection's session, so names are tracked
+    per connection. Each connection keeps at most ``max_statements``; preparing
+    one more deallocates the least recently executed. Call ``forget()`` when a
+    connection's session is reset, since its statements go with it; closed
+    connections are dropped once garbage collected. The manager can be shared
+    between threads, but like any DB-API connection, each connection should
+    only be used by one thread at a time.
+    """
+
+    def __init__(self, max_statements: int = 100, *, prefix: str = "pss_"):
+        if max_statements < 1:
+            raise ValueError("max_statements must be a positive integer")
+        self.max_statements = max_statements
+        self.prefix = prefix
+        # per connection: statement name -> syntax it was prepared with, LRU first
+        self._statements: weakref.WeakKeyDictionary[
+            Any, OrderedDict[str, PrepareSyntax]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def prepared(self, connection) -> list[str]:
+        """Names of the statements prepared on ``connection``, least recent first."""
+        with self._lock:
+            return list(self._statements.get(connection, ()))
+
+    def execute(self, connection, query) -> tuple[list[str], list[tuple]]:
+        """Return ``(columns, rows)`` for ``query``, preparing it on a first run."""
+        dialect = query.dialect
+        syntax = prepare_syntax(dialect)
+        style = _RecordingStyle(syntax.template)
+        collector = ParamCollector(dialect, style=style)
+        sql = query._render(collector).strip()
+        name = self.prefix + blake2b(sql.encode(), digest_size=8).hexdigest()
+        evicted = []
+        with self._lock:
+            statements = self._statements.setdefault(connection, OrderedDict())
+            hit = name in statements
+            if hit:
+                statements.move_to_end(name)
+                self.hits += 1
+            else:
+                self.misses += 1
+                while len(statements) >= self.max_statements:
+                    evicted.append(statements.popitem(last=False))
+                statements[name] = syntax
+        # the round trips run outside the lock, so other connections don't wait
+        if not hit:
+            try:
+                for evicted_name, evicted_syntax in evicted:
+                    _run(connection, evicted_syntax.deallocate(evicted_name))
+                _run(connection, syntax.prepare(name, sql, dialect))
+            except BaseException:
+                with self._lock:
+                    statements.pop(name, None)
+                raise
+        result = [], []
+        for statement, params in syntax.execute(
+            name, style.indexes, collector.params, dialect
+        ):
+            result = _run(connection, statement, params)
+        return result
+
+    def deallocate(self, connection) -> None:
+        """Deallocate every statement prepared on ``connection``."""
+        with self._lock:
+            statements = self._statements.pop(connection, {})
+        for name, syntax in statements.items():
+            _run(connection, syntax.deallocate(name))
+
+    def forget(self, connection) -> None:
+        """Stop tracking ``connection`` without touching the server (call when
+        its session was reset)."""
+        with self._lock:
+            self._statements.pop(connection, None)
@@ -0,0 +1,248 @@
+import atexit
+import threading
+import time
+from typing import Any, Iterable, Mapping
+
+from pysqlscribe.exceptions import InvalidColumnsError
+from pysqlscribe.params import ParamCollector
+from pysqlscribe.table import Table
+
+
+class WriteBuffer:
+    """Thread-safe write-behind buffer turning single-row inserts into batches.
+
+    Rows added with ``add`` are accumulated and written with chunked multi-row
+    ``INSERT`` statements once ``max_rows`` rows are pending, once the oldest
+    pending row is ``max_delay`` seconds old (checked by a background thread),
+    on ``flush()``/``close()``, and at interpreter exit.
+
+    When ``key`` is given, rows sharing the same key values are merged while
+    buffered: columns listed in ``increments`` are summed and every other
+    column keeps its latest value. The merged rows are written as upserts, so
+    the stored increments accumulate across flushes as well.
+
+    The buffer owns its connection while open: statements are serialized and
+    committed after each flush. A failed flush is rolled back and its rows are
+    put back to be retried by the next one; at most ``max_pending`` rows
+    (``10 * max_rows`` by default) are kept, the oldest beyond that being
+    dropped and counted in ``rows_dropped``. Database errors raised by a
+    background flush are re-raised by the next call to ``add``, ``flush`` or
+    ``close``.
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        connection,
+        *,
+        max_rows: int = 1000,
+        max_delay: float | None = 1.0,
+        chunk_size: int = 500,
+        key: Iterable[str] | None = None,
+        increments: Iterable[str] = (),
+        max_pending: int | None = None,
+    ):
+        if max_rows < 1 or chunk_size < 1:
+            raise ValueError("max_rows and chunk_size must be positive integers")
+        if max_pending is None:
+            max_pending = 10 * max_rows
+        if max_pending < max_rows:
+            raise ValueError("max_pending must be at least max_rows")
+        self.table = table
+        self.connection = connection
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.key = tuple(key) if key is not None else None
+        self.increments = tuple(increments)
+        if self.increments and self.key is None:
+            raise ValueError("increments can only be merged when a key is given")
+        self._validate_columns((*(self.key or ()), *self.increments))
+        self.rows_written = 0
+        self.statements_executed = 0
+        self.rows_dropped = 0
+        self._rows: list[dict[str, Any]] = []
+        self._merged: dict[tuple, dict[str, Any]] = {}
+        self._oldest: float | None = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._error: BaseException | None = None
+        self._flusher: threading.Thread | None = None
+        atexit.register(self.close)
+
+    def __enter__(self) -> "WriteBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._merged) if self.key is not None else len(self._rows)
+
+    def add(self, row: Mapping[str, Any]) -> None:
+        self._raise_pending_error()
+        if self._closed.is_set():
+            raise RuntimeError("Cannot add rows to a closed WriteBuffer")
+        self._validate_columns(row)
+        with self._lock:
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if self.key is None:
+                self._rows.append(dict(row))
+            else:
+                self._merge(row)
+            full = len(self) >= self.max_rows
+        self._ensure_flusher()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write every pending row now; returns the number of rows written."""
+        self._raise_pending_error()
+        return self._flush()
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        atexit.unregister(self.close)
+        if self._flusher is not None:
+            self._flusher.join()
+        # retry the rows a failed background flush put back before reporting it
+        pending, self._error = self._error, None
+        try:
+            self._flush()
+        except BaseException as error:
+            if pending is not None:
+                raise error from pending
+            raise
+        if pending is not None:
+            raise pending
+
+    def _merge(self, row: Mapping[str, Any]) -> None:
+        try:
+            key = tuple(row[column] for column in self.key)
+        except KeyError as e:
+            raise InvalidColumnsError(f"Row is missing key column {e}") from None
+        existing = self._merged.get(key)
+        if existing is None:
+            self._merged[key] = dict(row)
+            return
+        for column, value in row.items():
+            if column in self.increments and column in existing:
+                existing[column] += value
+            else:
+                existing[column] = value
+
+    def _take(self) -> list[dict[str, Any]]:
+        with self._lock:
+            if self.key is None:
+                rows, self._rows = self._rows, []
+            else:
+                rows = list(self._merged.values())
+                self._merged = {}
+            self._oldest = None
+        return rows
+
+    def _restore(self, rows: list[dict[str, Any]]) -> None:
+        """Put the rows of a failed flush back ahead of those added since."""
+        with self._lock:
+            if self.key is None:
+                pending = rows + self._rows
+                overflow = max(len(pending) - self.max_pending, 0)
+                self._rows = pending[overflow:]
+            else:
+                newer, self._merged = self._merged, {}
+                for row in (*rows, *newer.values()):
+                    self._merge(row)
+                overflow = max(len(self._merged) - self.max_pending, 0)
+                for key in list(self._merged)[:overflow]:
+                    del self._merged[key]
+            self.rows_dropped += overflow
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def _flush(self) -> int:
+        with self._write_lock:
+            rows = self._take()
+            if not rows:
+                return 0
+            groups: dict[tuple[str, ...], list[tuple]] = {}
+            for row in rows:
+                columns = tuple(row)
+                groups.setdefault(columns, []).append(tuple(row.values()))
+            try:
+                cursor = self.connection.cursor()
+                try:
+                    for columns, values in groups.items():
+                        for start in range(0, len(values), self.chunk_size):
+                            sql, params = self._render(
+                                columns, values[start : start + self.chunk_size]
+                            )
+                            cursor.execute(sql, params)
+                            self.statements_executed += 1
+                finally:
+                    cursor.close()
+                self.connection.commit()
+            except BaseException:
+                try:
+                    self.connection.rollback()
+                finally:
+                    self._restore(rows)
+                raise
+            self.rows_written += len(rows)
+            return len(rows)
+
+    def _render(self, columns, rows) -> tuple[str, list[Any] | dict[str, Any]]:
+        dialect = self.table.dialect
+        collector = ParamCollector(dialect)
+        table_name = self.table.table_name
+        if self.key is None:
+            sql = dialect.render_insert(table_name, columns, rows, collector)
+        else:
+            sql = dialect.render_upsert(
+                table_name, columns, rows, self.key, self.increments, collector
+            )
+        return sql, collector.bind_params
+
+    def _ensure_flusher(self) -> None:
+        if self.max_delay is None or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run_flusher,
+                    name=f"WriteBuffer({self.table.table_name})",
+                    daemon=True,
+                )
+                self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        # PEP 249 drivers expose their exception hierarchy on the connection;
+        # anything else is a bug and is left to ``threading.excepthook``
+        database_error = getattr(self.connection, "Error", Exception)
+        while not self._closed.wait(self.max_delay / 2):
+            oldest = self._oldest
+            if oldest is None or time.monotonic() - oldest < self.max_delay:
+                continue
+            try:
+                self._flush()
+            except database_error as e:
+                self._error = e
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _validate_columns(self, columns: Iterable[str]) -> None:
+        known = self.table.columns
+        if not known:
+            return
+        unknown = [column for column in columns if column not in known]
+        if unknown:
+            raise InvalidColumnsError(
+                f"Unknown columns for {self.table.table_name}: {', '.join(unknown)}"
+            )
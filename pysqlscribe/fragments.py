@@ -0,0 +1,168 @@
+"""Normalisation of raw SQL fragments, i.e. conditions and CTE bodies passed as
+strings rather than built from ``Column`` expressions.
+
+A fragment is lexed with the same token pattern as ``utils.sql_tokenizer`` and
+written back with canonical whitespace, upper-case keywords and no comments, so
+``"salary>100  and dept='x'"`` and ``"salary > 100 AND dept = 'x'"`` render the
+same. Numeric and plain string literals can also be lifted out of the text:
+into bind parameters on the parameterized path, or replaced by a marker when
+only the fragment's shape is wanted (as for fingerprints).
+
+Literals are left inline where a bind parameter isn't allowed or would change
+the meaning: typed literals (``DATE '2024-01-01'``, ``INTERVAL '1 day'``), the
+``ESCAPE`` of a ``LIKE``, type modifiers of casts (``CAST(x AS NUMERIC(10, 2))``,
+``x::varchar(20)``), the select list, ``GROUP BY`` / ``ORDER BY`` (where ``1``
+is a column position), ``LIMIT`` / ``OFFSET`` / ``FETCH``, and any fragment
+that already has placeholders of its own.
+"""
+
+import decimal
+from typing import Any
+
+from pysqlscribe.regex_patterns import TOKEN_REGEX, TOKEN_REGEX_BACKSLASH_ESCAPES
+from pysqlscribe.utils.sql_tokenizer import (
+    IDENTIFIER,
+    NUMBER,
+    PARAMETER,
+    OPERATOR,
+    QUOTED_IDENTIFIER,
+    STRING,
+)
+
+KEYWORDS = frozenset(
+    (
+        "ALL AND ANY AS ASC BETWEEN BY CASE CAST COLLATE CROSS DESC DISTINCT ELSE "
+        "END ESCAPE EXCEPT EXISTS FALSE FETCH FIRST FROM FULL GROUP HAVING ILIKE IN "
+        "INNER INTERSECT INTERVAL IS JOIN LAST LATERAL LEFT LIKE LIMIT NATURAL NEXT "
+        "NOT NULL NULLS OFFSET ON ONLY OR ORDER OUTER OVER PARTITION RIGHT ROWS "
+        "SELECT SIMILAR SOME THEN TO TRUE UNION UNKNOWN USING VALUES WHEN WHERE "
+        "WINDOW WITH"
+    ).split()
+)
+# keywords (and type names) whose following string is part of a typed literal
+_TYPED_LITERAL_PREFIXES = frozenset(
+    ("DATE", "TIME", "TIMESTAMP", "TIMESTAMPTZ", "INTERVAL", "ESCAPE")
+)
+# keywords written like function calls, with no space before their "("
+_CALL_KEYWORDS = frozenset(("CAST",))
+_NO_SPACE_BEFORE = frozenset((",", ")", ".", ";", "::"))
+_NO_SPACE_AFTER = frozenset(("(", ".", "::"))
+_UNARY_AFTER = frozenset(("(", ",", "::"))
+# clauses that decide where a literal may be lifted, until the next one starts;
+# in the select list, after GROUP / ORDER / PARTITION BY and in row limits
+# literals stay inline
+_CLAUSE_KEYWORDS = frozenset(
+    ("SELECT", "FROM", "WHERE", "HAVING", "ON", "BY", "LIMIT", "OFFSET", "FETCH")
+)
+_INLINE_CLAUSES = frozenset(("SELECT", "BY", "LIMIT", "OFFSET", "FETCH"))
+_SIGNED_OPERATORS = frozenset(
+    ("=", "<", ">", "<=", ">=", "<>", "!=", "*", "/", "%", "+", "-", "||")
+)
+
+
+def _literal_value(kind: str, text: str, backslash_escapes: bool) -> Any:
+    """The Python value of a liftable literal, or ``None`` if it must stay inline."""
+    if kind == NUMBER:
+        if text.isdigit():
+            return int(text)
+        return decimal.Decimal(text)
+    # only plain '...' strings; prefixed (E'', N'', X'') and $$ strings stay inline
+    if text[0] != "'" or (backslash_escapes and "\\" in text):
+        return None
+    return text[1:-1].replace("''", "'")
+
+
+def normalize_fragment(
+    fragment: str,
+    *,
+    collector=None,
+    literal_marker: str | None = None,
+    backslash_escapes: bool = False,
+) -> str:
+    """Return ``fragment`` with normalised whitespace and keyword case.
+
+    With a ``collector`` (a ``ParamCollector``), literals that can be bound are
+    added to it and replaced by its placeholders. With a ``literal_marker``
+    they're replaced by the marker instead.
+    """
+    regex = TOKEN_REGEX_BACKSLASH_ESCAPES if backslash_escapes else TOKEN_REGEX
+    tokens = []
+    for match in regex.finditer(fragment):
+        kind, text = match.lastgroup, match.group()
+        if kind in ("whitespace", "comment"):
+            continue
+        # operator characters lex greedily, so `x>-1` has a `>-` to split
+        if kind == OPERATOR and text[-1] in "+-" and text[:-1] in _SIGNED_OPERATORS:
+            tokens.append((kind, text[:-1]))
+            text = text[-1]
+        tokens.append((kind, text))
+    lift = collector is not None or literal_marker is not None
+    if lift and any(kind == PARAMETER for kind, _ in tokens):
+        # its own placeholders would be out of step with any we add
+        lift = False
+
+    parts: list[str] = []
+    previous_kind = previous = None
+    # depth of parentheses opened by a cast's type modifier, e.g. NUMERIC(10, 2)
+    pending_type = False
+    type_depth = depth = 0
+    # the clause at each open parenthesis level; a subquery starts its own
+    clauses: list[str | None] = [None]
+    unary = False
+    for kind, text in tokens:
+        value = text
+        if kind == IDENTIFIER and text.upper() in KEYWORDS:
+            value = text.upper()
+
+        if (
+            lift
+            and not type_depth
+            and kind in (NUMBER, STRING)
+            and clauses[-1] not in _INLINE_CLAUSES
+        ):
+            typed = previous_kind == IDENTIFIER and (
+                previous in _TYPED_LITERAL_PREFIXES or previous not in KEYWORDS
+            )
+            literal = None if typed else _literal_value(kind, text, backslash_escapes)
+            if literal is not None:
+                value = (
+                    collector.add(literal) if collector is not None else literal_marker
+                )
+
+        if parts and not (
+            unary
+            or value in _NO_SPACE_BEFORE
+            or previous in _NO_SPACE_AFTER
+            or (
+                value == "("
+                and previous_kind in (IDENTIFIER, QUOTED_IDENTIFIER)
+                and (previous not in KEYWORDS or previous in _CALL_KEYWORDS)
+            )
+        ):
+            parts.append(" ")
+        parts.append(value)
+
+        # a sign is unary at the start, after an operator, "(" or "," and after
+        # a keyword; it's then written right against its operand
+        unary = value in ("-", "+") and (
+            previous is None
+            or previous_kind == OPERATOR
+            or previous in _UNARY_AFTER
+            or (previous_kind == IDENTIFIER and previous in KEYWORDS)
+        )
+        if value == "(":
+            depth += 1
+            clauses.append(clauses[-1])
+            if pending_type and not type_depth:
+                type_depth = depth
+        elif value == ")":
+            if depth == type_depth:
+                type_depth = 0
+            depth -= 1
+            if len(clauses) > 1:
+                clauses.pop()
+        elif kind == IDENTIFIER and value in _CLAUSE_KEYWORDS:
+            clauses[-1] = value
+        pending_type = kind == IDENTIFIER and previous in ("::", "AS")
+        previous_kind, previous = kind, value.upper() if kind == IDENTIFIER else value
+    return "".join(parts)
@@ -0,0 +1,24 @@
+from typing import NamedTuple
+
+
+class ForeignKey(NamedTuple):
+    columns: tuple[str, ...]
+    referenced_table: str
+    referenced_columns: tuple[str, ...] = ()
+
+
+class Index(NamedTuple):
+    name: str | None
+    columns: tuple[str, ...]
+    unique: bool = False
+
+
+class TableMetadata(NamedTuple):
+    """What the DDL declares about a table besides its columns, kept under
+    ``Table.metadata`` so none of it can shadow a column attribute."""
+
+    column_types: dict[str, str]
+    primary_key: tuple[str, ...]
+    unique_keys: list[tuple[str, ...]]
+    foreign_keys: list[ForeignKey]
+    indexes: list[Index]
@@ -1,6 +1,7 @@
+import array
 import datetime
 import decimal
-from typing import Any
+from typing import Any, Iterable, Sequence
 
 
 def ansi_escape_value(value: Any) -> str:
@@ -43,6 +44,8 @@ class Literal:
     rendered as a dialect-appropriate placeholder.
     """
 
+    __slots__ = ("value",)
+
     def __init__(self, value: Any):
         self.value = value
 
@@ -50,16 +53,266 @@ class Literal:
         return f"Literal({self.value!r})"
 
 
+class Param:
+    """A named value left open in a query and supplied when a ``QueryTemplate``
+    is bound, e.g. ``table.status == Param("status")``."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"Param({self.name!r})"
+
+
+# buffer/array typecodes holding numbers (i.e. everything but unicode characters)
+_NUMERIC_TYPECODES = frozenset("bBhHiIlLqQnNfde")
+
+
+def _is_numeric_buffer(values) -> bool:
+    """Whether ``values`` is an ``array.array``, ``memoryview`` or NumPy array
+    of numbers, which are homogeneous by construction."""
+    if isinstance(values, array.array):
+        return values.typecode in _NUMERIC_TYPECODES
+    if isinstance(values, memoryview):
+        return values.ndim == 1 and values.format.lstrip("@=<>!") in _NUMERIC_TYPECODES
+    # NumPy arrays, without depending on NumPy: integer, unsigned or float dtypes
+    dtype = getattr(values, "dtype", None)
+    return getattr(dtype, "kind", None) in ("i", "u", "f") and values.ndim == 1
+
+
+class LiteralList:
+    """A homogeneous list of literal values (all strings or all numbers),
+    rendered as a comma-separated list of literals or placeholders.
+
+    Numbers are stored in an ``array.array`` and numeric ``array.array``,
+    ``memoryview`` and NumPy arrays are kept as they are, so large ``IN``
+    lists don't need a ``Literal`` per element. The element types are checked
+    once per distinct type rather than once per element.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: Iterable[Any]):
+        if _is_numeric_buffer(values):
+            if len(values) == 0:
+                raise ValueError("LiteralList requires at least one value")
+            self.values = values
+            return
+        values = values if isinstance(values, (list, tuple)) else list(values)
+        if not values:
+            raise ValueError("LiteralList requires at least one value")
+        types = set(map(type, values))
+        if types == {int}:
+            try:
+                values = array.array("q", values)
+            except OverflowError:
+                pass
+        elif types == {float}:
+            values = array.array("d", values)
+        elif not (
+            all(issubclass(t, str) for t in types)
+            or all(issubclass(t, (int, float)) for t in types)
+        ):
+            raise TypeError(
+                "LiteralList values must all be strings or all be numbers; "
+                "mixed types are not allowed"
+            )
+        self.values = values
+
+    def tolist(self) -> list[Any]:
+        """The values as a list of plain Python objects (e.g. to bind as params)."""
+        values = self.values
+        if isinstance(values, list):
+            return values
+        if hasattr(values, "tolist"):
+            return values.tolist()
+        return list(values)
+
+    def render(self, collector: "ParamCollector | None", dialect=None) -> str:
+        if collector is not None:
+            return ", ".join(collector.add_many(self.tolist()))
+        if dialect is None:
+            return ", ".join(map(ansi_escape_value, self.tolist()))
+        return dialect.join_escaped_values(self.tolist())
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"LiteralList({self.tolist()!r})"
+
+
+class ParameterizationPolicy:
+    """Decides which literals a hybrid build binds and which it keeps inline.
+
+    Small, enum-like values (``NULL``, booleans, short strings, small integers)
+    and short lists stay inline (except strings containing ``%`` when the
+    placeholders are ``%s``-style, as the driver would read it as a format
+    character); long strings (e.g. JSON documents), long lists
+    and high-cardinality values (large integers, floats, decimals, dates and
+    timestamps) are bound, as is anything with no inline form (bytes, UUIDs).
+    Set it on a dialect as ``parameterization_policy``, e.g. through
+    ``Query.auto_parameterize()``; subclass and override ``should_bind`` /
+    ``should_bind_list`` for other rules.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_inline_string: int = 16,
+        max_inline_integer: int = 1024,
+        max_inline_list: int = 8,
+    ):
+        self.max_inline_string = max_inline_string
+        self.max_inline_integer = max_inline_integer
+        self.max_inline_list = max_inline_list
+
+    def should_bind(self, value: Any) -> bool:
+        if value is None or isinstance(value, bool):
+            return False
+        if isinstance(value, str):
+            return len(value) > self.max_inline_string
+        if isinstance(value, int):
+            return abs(value) > self.max_inline_integer
+        return True
+
+    def should_bind_list(self, values: Sequence[Any]) -> bool:
+        """Whether to bind all of ``values`` (an IN list, a row) regardless of
+        what ``should_bind`` says about each."""
+        return len(values) > self.max_inline_list
+
+
+class PlaceholderStyle:
+    """How bound parameters are written in the SQL and passed to the driver.
+
+    ``template`` is formatted with the 1-indexed parameter number. Styles with a
+    ``key`` template are bound from a dict, keyed by that template formatted the
+    same way. Placeholders of ``reusable`` styles may appear more than once, so
+    identical values are bound once and share a placeholder.
+    """
+
+    __slots__ = ("name", "template", "key", "reusable")
+
+    def __init__(
+        self,
+        name: str,
+        template: str,
+        *,
+        key: str | None = None,
+        reusable: bool = False,
+    ):
+        self.name = name
+        self.template = template
+        self.key = key
+        self.reusable = reusable
+
+    def placeholder(self, index: int) -> str:
+        return self.template.format(index=index)
+
+    def __repr__(self) -> str:
+        return f"PlaceholderStyle({self.name!r}, {self.template!r})"
+
+
+# DB-API paramstyles, plus asyncpg's $N and SQLite's ?NNN (which Python's sqlite3
+# binds by name, from a dict). `:N` isn't reusable: Oracle binds repeated
+# numbers positionally, one value per occurrence
+PLACEHOLDER_STYLES = {
+    style.name: style
+    for style in (
+        PlaceholderStyle("qmark", "?"),
+        PlaceholderStyle("format", "%s"),
+        PlaceholderStyle("numeric", ":{index}"),
+        PlaceholderStyle("qmark_numeric", "?{index}", key="{index}", reusable=True),
+        PlaceholderStyle("dollar", "${index}", reusable=True),
+        PlaceholderStyle("named", ":p{index}", key="p{index}", reusable=True),
+        PlaceholderStyle("pyformat", "%(p{index})s", key="p{index}", reusable=True),
+    )
+}
+
+
+def _dedupe_key(value: Any) -> Any:
+    # repr() tells apart values that compare equal but bind differently, e.g.
+    # Decimal("1.0") / Decimal("1.00"), 0.0 / -0.0, or datetimes in other zones
+    if type(value) in (str, int, bytes):
+        return (type(value), value)
+    return (type(value), repr(value))
+
+
 class ParamCollector:
     """Accumulates literal values and emits dialect-appropriate placeholders.
 
     Passed through Renderer / Expression render paths when build(parameterize=True).
+    With a ``policy`` the build is hybrid: values the policy doesn't bind are
+    returned as inline literals instead of placeholders. Placeholders follow
+    ``style``, else the dialect's ``placeholder_style`` if it has one, else its
+    ``make_placeholder``.
     """
 
-    def __init__(self, dialect):
+    def __init__(
+        self,
+        dialect,
+        policy: ParameterizationPolicy | None = None,
+        *,
+        style: PlaceholderStyle | None = None,
+    ):
         self.dialect = dialect
+        self.policy = policy
         self.params: list[Any] = []
+        self.style: PlaceholderStyle | None = style or dialect.placeholder_style
+        if self.style is None:
+            self._make_placeholder = dialect.make_placeholder
+        else:
+            self._make_placeholder = self.style.placeholder
+        # with `%s` / `%(name)s` placeholders the driver treats every `%` in the
+        # SQL as a format character, so strings holding one can't stay inline
+        self._binds_percent = "%" in (
+            self.style.template
+            if self.style is not None
+            else dialect.make_placeholder(1)
+        )
+        # parameter numbers of the values bound so far, by _dedupe_key
+        self._indexes: dict[Any, int] | None = (
+            {} if self.style is not None and self.style.reusable else None
+        )
+
+    @property
+    def bind_params(self) -> list[Any] | dict[str, Any]:
+        """The params as the driver takes them: a dict for styles with a ``key``."""
+        if self.style is not None and self.style.key is not None:
+            key = self.style.key
+            return {
+                key.format(index=index): value
+                for index, value in enumerate(self.params, 1)
+            }
+        return self.params
+
+    def _bind(self, value: Any) -> str:
+        indexes = self._indexes
+        if indexes is None:
+            self.params.append(value)
+            return self._make_placeholder(len(self.params))
+        key = _dedupe_key(value)
+        index = indexes.get(key)
+        if index is None:
+            self.params.append(value)
+            index = indexes[key] = len(self.params)
+        return self._make_placeholder(index)
 
     def add(self, value: Any) -> str:
-        self.params.append(value)
-        return self.dialect.make_placeholder(len(self.params))
+        if self.policy is not None and not self.policy.should_bind(value):
+            if not (self._binds_percent and isinstance(value, str) and "%" in value):
+                return self.dialect.escape_value(value)
+        return self._bind(value)
+
+    def add_many(self, values: Sequence[Any]) -> list[str]:
+        """Append ``values`` in one step and return their placeholders."""
+        if self.policy is not None and not self.policy.should_bind_list(values):
+            return [self.add(value) for value in values]
+        if self._indexes is not None:
+            return [self._bind(value) for value in values]
+        start = len(self.params) + 1
+        self.params.extend(values)
+        make_placeholder = self._make_placeholder
+        return [make_placeholder(index) for index in range(start, len(self.params) + 1)]
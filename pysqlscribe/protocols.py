@@ -9,3 +9,4 @@ class DialectProtocol(Protocol):
     def validate_identifier(self, identifier: str) -> str: ...
     def normalize_identifiers_args(self, args: Any) -> str: ...
     def escape_value(self, value) -> str: ...
+    def render_fragment(self, fragment: str, collector=None) -> str: ...
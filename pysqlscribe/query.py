@@ -1,9 +1,11 @@
-from typing import Any, Self
+from types import MappingProxyType
+from typing import Any, Mapping, Self
 
 from pysqlscribe.alias import AliasMixin
 from pysqlscribe.ast.base import Node
 from pysqlscribe.ast.joins import JoinType
 from pysqlscribe.ast.nodes import (
+    ConditionsNode,
     SelectNode,
     FromNode,
     JoinNode,
@@ -20,12 +22,25 @@ from pysqlscribe.ast.nodes import (
 from pysqlscribe.dialects import (
     Dialect,
 )
+from pysqlscribe.column import OptionalCondition
 from pysqlscribe.dialects.base import DialectRegistry
-from pysqlscribe.params import ParamCollector
+from pysqlscribe.fingerprint import query_fingerprint
+from pysqlscribe.params import (
+    PLACEHOLDER_STYLES,
+    ParamCollector,
+    ParameterizationPolicy,
+    PlaceholderStyle,
+)
+from pysqlscribe.simplify import simplify_conditions
+from pysqlscribe.template import QueryTemplate
 
 
 class Query(AliasMixin):
     node: Node | None = None
+    # CTE bodies, only ever set by With
+    _subqueries: Mapping[str, "str | Query"] = MappingProxyType({})
+    # (tail node, its digest, dialect, fingerprint) of the last fingerprint()
+    _fingerprint_memo: tuple | None = None
 
     def __init__(self, dialect: str):
         if dialect not in DialectRegistry.dialects:
@@ -38,12 +53,12 @@ class Query(AliasMixin):
 
     def select(self, *args, distinct: bool = False) -> Self:
         if not self.node:
-            self.node = SelectNode({"columns": list(args), "distinct": distinct})
+            self.node = SelectNode(list(args), distinct)
         return self
 
     def from_(self, *args) -> Self:
         self.node.add(
-            FromNode({"tables": list(args)}),
+            FromNode(list(args)),
             self.dialect,
         )
         self.node = self.node.next_
@@ -53,13 +68,7 @@ class Query(AliasMixin):
         self, table: str, join_type: str = JoinType.INNER, condition: str | None = None
     ) -> Self:
         self.node.add(
-            JoinNode(
-                {
-                    "join_type": join_type.upper(),
-                    "table": table,
-                    "condition": condition,
-                }
-            ),
+            JoinNode(table, join_type.upper(), condition),
             self.dialect,
         )
         self.node = self.node.next_
@@ -83,79 +92,117 @@ class Query(AliasMixin):
     def natural_join(self, table: str) -> Self:
         return self.join(table, JoinType.NATURAL)
 
-    def where(self, *args) -> Self:
+    def where(self, *args, optional: bool = False) -> Self:
+        """Add conditions to the ``WHERE`` clause. ``optional`` ones are left
+        out of a ``template()`` unless their ``Param``s are bound."""
+        if optional:
+            args = tuple(map(OptionalCondition, args))
         if isinstance(self.node, WhereNode):
-            self.node.state["conditions"].extend(args)
+            self.node.conditions.extend(args)
+            self.node.clear_fingerprint()
         else:
-            self.node.add(WhereNode({"conditions": list(args)}), self.dialect)
+            self.node.add(WhereNode(list(args)), self.dialect)
             self.node = self.node.next_
         return self
 
     def order_by(self, *args) -> Self:
         self.node.add(
-            OrderByNode({"columns": list(args)}),
+            OrderByNode(list(args)),
             self.dialect,
         )
         self.node = self.node.next_
         return self
 
     def limit(self, n: int | str):
-        self.node.add(LimitNode({"limit": int(n)}), self.dialect)
+        self.node.add(LimitNode(int(n)), self.dialect)
         self.node = self.node.next_
         return self
 
     def offset(self, n: int | str):
-        self.node.add(OffsetNode({"offset": int(n)}), self.dialect)
+        self.node.add(OffsetNode(int(n)), self.dialect)
         self.node = self.node.next_
         return self
 
     def group_by(self, *args) -> Self:
         self.node.add(
-            GroupByNode({"columns": list(args)}),
+            GroupByNode(list(args)),
             self.dialect,
         )
         self.node = self.node.next_
         return self
 
-    def having(self, *args) -> Self:
+    def having(self, *args, optional: bool = False) -> Self:
+        if optional:
+            args = tuple(map(OptionalCondition, args))
         if isinstance(self.node, HavingNode):
-            self.node.state["conditions"].extend(args)
+            self.node.conditions.extend(args)
+            self.node.clear_fingerprint()
         else:
-            self.node.add(HavingNode({"conditions": list(args)}), self.dialect)
+            self.node.add(HavingNode(list(args)), self.dialect)
             self.node = self.node.next_
         return self
 
     def union(self, query: Self | str, all_: bool = False) -> Self:
-        self.node.add(UnionNode({"query": query, "all": all_}), self.dialect)
+        self.node.add(UnionNode(query, all_), self.dialect)
         self.node = self.node.next_
         return self
 
     def except_(self, query: Self | str, all_: bool = False) -> Self:
-        self.node.add(ExceptNode({"query": query, "all": all_}), self.dialect)
+        self.node.add(ExceptNode(query, all_), self.dialect)
         self.node = self.node.next_
         return self
 
     def intersect(self, query: Self | str, all_: bool = False) -> Self:
-        self.node.add(IntersectNode({"query": query, "all": all_}), self.dialect)
+        self.node.add(IntersectNode(query, all_), self.dialect)
         self.node = self.node.next_
         return self
 
+    def simplify(self) -> Self:
+        """Simplify the WHERE and HAVING conditions added so far in place; see
+        ``pysqlscribe.simplify`` for the rewrites applied."""
+        node = self.node
+        while node is not None:
+            if isinstance(node, ConditionsNode):
+                node.conditions[:] = simplify_conditions(node.conditions)
+                node.clear_fingerprint()
+            node = node.prev_
+        return self
+
+    def template(self) -> "QueryTemplate":
+        """Compile this query into a ``QueryTemplate``, rendered once per set
+        of optional conditions present; see ``pysqlscribe.template``."""
+        return QueryTemplate(self)
+
+    def fingerprint(self) -> str:
+        """A stable hex identity for the shape of this query, ignoring literal
+        values; see ``pysqlscribe.fingerprint``."""
+        return query_fingerprint(self)
+
+    def _collector(self, parameterize: bool | None) -> ParamCollector | None:
+        # parameterize=None defers to the dialect's parameterization policy, if any
+        policy = self.dialect.parameterization_policy if parameterize is None else None
+        if parameterize or policy is not None:
+            return ParamCollector(self.dialect, policy)
+        return None
+
     def build(
-        self, clear: bool = True, *, parameterize: bool = False
-    ) -> str | tuple[str, list[Any]]:
-        if parameterize:
-            collector = ParamCollector(self.dialect)
-            query = self.dialect.render(self.node, collector)
-            if clear:
-                self.node = None
-            return query.strip(), collector.params
-        query = self.dialect.render(self.node)
+        self, clear: bool = True, *, parameterize: bool | None = None
+    ) -> str | tuple[str, list[Any] | dict[str, Any]]:
+        """Render the query: inline, or as ``(sql, params)`` with
+        ``parameterize=True`` or when the dialect has a parameterization policy."""
+        collector = self._collector(parameterize)
+        query = self._render(collector).strip()
         if clear:
             self.node = None
-        return query.strip()
+        if collector is not None:
+            return query, collector.bind_params
+        return query
+
+    def _render(self, collector: ParamCollector | None) -> str:
+        return self.dialect.render(self.node, collector)
 
     def __str__(self):
-        return self.build(clear=False)
+        return self.build(clear=False, parameterize=False)
 
     def disable_escape_identifiers(self):
         self.dialect.escape_identifiers_enabled = False
@@ -165,6 +212,34 @@ class Query(AliasMixin):
         self.dialect.escape_identifiers_enabled = True
         return self
 
+    def auto_parameterize(self, policy: ParameterizationPolicy | None = None) -> Self:
+        """Make builds hybrid: ``build()`` returns ``(sql, params)`` with the
+        literals ``policy`` picks bound and the rest inline."""
+        self.dialect.parameterization_policy = policy or ParameterizationPolicy()
+        return self
+
+    def placeholder_style(self, style: str | PlaceholderStyle | None) -> Self:
+        """Write bound parameters in ``style``, one of ``PLACEHOLDER_STYLES``
+        (e.g. ``"dollar"`` for ``$1``, ``"named"`` for ``:p1``), instead of the
+        dialect's default; ``None`` goes back to the default. Identical values
+        share a placeholder where the style allows it."""
+        if isinstance(style, str):
+            if style not in PLACEHOLDER_STYLES:
+                raise ValueError(
+                    f"Unknown placeholder style {style!r}; "
+                    f"expected one of {', '.join(PLACEHOLDER_STYLES)}"
+                )
+            style = PLACEHOLDER_STYLES[style]
+        self.dialect.placeholder_style = style
+        return self
+
+    def normalize_raw_fragments(self, lift_literals: bool = False) -> Self:
+        """Normalise raw string conditions and CTE bodies when rendering, and with
+        ``lift_literals`` bind their literals on the parameterized path."""
+        self.dialect.normalize_raw_fragments = True
+        self.dialect.lift_raw_literals = lift_literals
+        return self
+
     def _identifier_body(self, dialect, collector=None):
         if collector is not None:
             return f"({self.dialect.render(self.node, collector)})"
@@ -40,20 +40,136 @@ EXPRESSION_IDENTIFIER_REGEX = re.compile(
     rf"^\s*{TERM_REGEX}(?:\s*[\+\-\*/]\s*{TERM_REGEX})*\s*$"
 )
 
+# the non-column operands of arithmetic and function calls built from Columns
+ARITHMETIC_OPERAND_REGEX = re.compile(rf"^\s*{TERM_REGEX}\s*$")
+FUNCTION_ARGUMENT_REGEX = re.compile(rf"^\s*{ARG}\s*$")
+
 # CASE expressions are produced by the builder so their internals are trusted;
 # this check only confirms the outer shape.
 CASE_IDENTIFIER_REGEX = re.compile(
     r"^\s*CASE\s+WHEN\b.+\bEND\s*$", re.IGNORECASE | re.DOTALL
 )
 
-CONSTRAINT_PREFIX_REGEX = r"^(PRIMARY|FOREIGN|CONSTRAINT|UNIQUE|INDEX)"
-
 ALIAS_REGEX = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 
 ALIAS_SPLIT_REGEX = re.compile(r"\s+AS\s+", re.IGNORECASE)
 
 WILDCARD_REGEX = re.compile(r"^\*$")
 
-CREATE_TABLE_REGEX = (
-    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?((\w+)\.)?(\w+)\s*\((.*?)\);"
+# leading comments are allowed before a statement's first keyword
+_LEADING_COMMENTS = r"^\s*(?:(?:--[^\n]*(?:\n|$)|/\*.*?\*/)\s*)*"
+
+CREATE_TABLE_PREFIX_REGEX = re.compile(
+    rf"{_LEADING_COMMENTS}CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:GLOBAL|LOCAL)\s+)?"
+    r"(?:(?:TEMP|TEMPORARY|UNLOGGED)\s+)?TABLE\b",
+    re.IGNORECASE | re.DOTALL,
+)
+
+CREATE_INDEX_PREFIX_REGEX = re.compile(
+    rf"{_LEADING_COMMENTS}CREATE\s+(?:UNIQUE\s+)?(?:(?:CLUSTERED|NONCLUSTERED|FULLTEXT|SPATIAL|BITMAP)\s+)?INDEX\b",
+    re.IGNORECASE | re.DOTALL,
+)
+
+ALTER_TABLE_PREFIX_REGEX = re.compile(
+    rf"{_LEADING_COMMENTS}ALTER\s+TABLE\b", re.IGNORECASE | re.DOTALL
+)
+
+# keywords ending the data type of a column definition
+COLUMN_CONSTRAINT_KEYWORDS = (
+    "NOT",
+    "NULL",
+    "DEFAULT",
+    "PRIMARY",
+    "UNIQUE",
+    "REFERENCES",
+    "CHECK",
+    "CONSTRAINT",
+    "COLLATE",
+    "GENERATED",
+    "AUTO_INCREMENT",
+    "AUTOINCREMENT",
+    "IDENTITY",
+    "COMMENT",
+    "ON",
+    "AS",
+    "VISIBLE",
+    "INVISIBLE",
+    "STORAGE",
+    "COMPRESSION",
+    "ENABLE",
+    "DISABLE",
+)
+# MySQL's `CHARACTER SET ...` ends the type too, unlike Postgres' `CHARACTER VARYING`
+_COLUMN_TYPE_END = (
+    rf"(?:{'|'.join(COLUMN_CONSTRAINT_KEYWORDS)}|CHARSET|CHARACTER\s+SET)\b"
+)
+_WORD = r"[^\W\d][\w$]*(?![\w$])"
+# an unquoted column name and a data type made of plain words and numeric sizes
+# (`NUMERIC(12, 2)`), up to the end of the definition or its first constraint;
+# anything else (quotes, comments, expressions) is left to the tokenizer
+COLUMN_HEAD_REGEX = re.compile(
+    rf"\s*(?P<name>{_WORD})"
+    rf"(?P<type>(?:\s+(?!{_COLUMN_TYPE_END}){_WORD}(?:\s*\(\s*\d+(?:\s*,\s*\d+)*\s*\))?)*)"
+    rf"\s*(?:\Z|(?={_COLUMN_TYPE_END}))",
+    re.IGNORECASE,
+)
+# the column constraints recorded as keys
+COLUMN_KEY_CONSTRAINT_REGEX = re.compile(
+    r"\b(?:PRIMARY|UNIQUE|REFERENCES)\b", re.IGNORECASE
+)
+
+# pg_dump emits table data as `COPY ... FROM stdin;` followed by raw rows up to `\.`
+COPY_FROM_STDIN_REGEX = re.compile(
+    rf"{_LEADING_COMMENTS}COPY\b.*\bFROM\s+STDIN\s*$", re.IGNORECASE | re.DOTALL
+)
+
+# anything that can hide a `;` from the statement splitter, plus `;` itself
+STATEMENT_BOUNDARY_REGEX = re.compile(r"""['"`;]|--|/\*|\$(?:[A-Za-z_]\w*)?\$""")
+
+_COMMENT = r"--[^\n]*|/\*.*?(?:\*/|$)"
+_STRING = r"'(?:[^']|'')*'"
+# MySQL also treats backslash as an escape character inside string literals
+_STRING_BACKSLASH_ESCAPES = r"'(?:[^'\\]|\\.|'')*'"
+_DOLLAR_STRING = r"\$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?\$(?P=tag)\$"
+_QUOTED_IDENTIFIER = r'"(?:[^"]|"")*"|`(?:[^`]|``)*`|\[[^\]]*\]'
+
+_TOKEN_TEMPLATE = r"""
+    (?P<whitespace>\s+)
+  | (?P<comment>{comment})
+  | (?P<string>[EeNnXxBb]?{string}|{dollar_string})
+  | (?P<quoted_identifier>{quoted_identifier})
+  | (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+\-]?\d+)?)
+  | (?P<identifier>[^\W\d][\w$]*)
+  | (?P<parameter>%s|%\(\w+\)s|\?|(?<!:):(?!:)\w+|\$\d+)
+  | (?P<punctuation>[(),.;])
+  | (?P<operator>[<>=!|&+\-*/%^~:]+|.)
+"""
+
+# only what matters for nesting: parentheses and commas, plus anything that can hide them
+_STRUCTURE_TEMPLATE = r"{comment}|{string}|{dollar_string}|{quoted_identifier}|[(),]"
+
+
+def _sql_regex(template: str, string: str) -> re.Pattern:
+    return re.compile(
+        template.format(
+            comment=_COMMENT,
+            string=string,
+            dollar_string=_DOLLAR_STRING,
+            quoted_identifier=_QUOTED_IDENTIFIER,
+        ),
+        re.VERBOSE | re.DOTALL,
+    )
+
+
+TOKEN_REGEX = _sql_regex(_TOKEN_TEMPLATE, _STRING)
+TOKEN_REGEX_BACKSLASH_ESCAPES = _sql_regex(_TOKEN_TEMPLATE, _STRING_BACKSLASH_ESCAPES)
+STRUCTURE_REGEX = _sql_regex(_STRUCTURE_TEMPLATE, _STRING)
+STRUCTURE_REGEX_BACKSLASH_ESCAPES = _sql_regex(
+    _STRUCTURE_TEMPLATE, _STRING_BACKSLASH_ESCAPES
+)
+
+# statements that produce a result set: queries, or DML with a RETURNING clause
+RETURNS_ROWS_REGEX = re.compile(
+    r"^\s*\(*\s*(?:SELECT|WITH|VALUES|SHOW|PRAGMA|EXPLAIN|DESCRIBE)\b|\bRETURNING\b",
+    re.IGNORECASE,
 )
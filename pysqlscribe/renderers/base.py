@@ -1,4 +1,4 @@
-from typing import Dict, Callable
+from typing import Any, Callable, Dict, Sequence
 
 from pysqlscribe.ast.base import Node
 from pysqlscribe.ast.joins import JoinType
@@ -16,7 +16,13 @@ from pysqlscribe.ast.nodes import (
     OffsetNode,
     SelectNode,
 )
-from pysqlscribe.column import OrderedColumn, Expression
+from pysqlscribe.column import (
+    _BOOLEAN_PRECEDENCE,
+    Expression,
+    OptionalCondition,
+    OrderedColumn,
+    render_predicate,
+)
 from pysqlscribe.params import ParamCollector
 from pysqlscribe.protocols import DialectProtocol
 from pysqlscribe.regex_patterns import WILDCARD_REGEX
@@ -39,6 +45,8 @@ EXCEPT_ALL = f"EXCEPT {ALL}"
 INTERSECT = "INTERSECT"
 INTERSECT_ALL = f"INTERSECT {ALL}"
 AND = "AND"
+INSERT_INTO = "INSERT INTO"
+VALUES = "VALUES"
 
 
 class Renderer:
@@ -76,32 +84,42 @@ class Renderer:
         return " ".join(parts).strip()
 
     def render_select(self, node: SelectNode, collector: ParamCollector | None) -> str:
-        columns = self._resolve_columns(*node.state["columns"], collector=collector)
-        prefix = f"{DISTINCT} " if node.state.get("distinct") else ""
+        columns = self._resolve_columns(*node.columns, collector=collector)
+        prefix = f"{DISTINCT} " if node.distinct else ""
         return f"{SELECT} {prefix}{columns}"
 
     def render_from(self, node: FromNode, collector: ParamCollector | None) -> str:
         tables = self.dialect.normalize_identifiers_args(
-            node.state["tables"], collector=collector
+            node.tables, collector=collector
         )
         return f"{FROM} {tables}"
 
     def render_where(self, node: WhereNode, collector: ParamCollector | None) -> str:
-        conditions = f" {AND} ".join(
-            self._render_condition(c, collector) for c in node.state["conditions"]
-        )
-        return f"{WHERE} {conditions}"
+        return f"{WHERE} {self._render_conditions(node.conditions, collector)}"
 
-    def _render_condition(self, condition, collector: ParamCollector | None) -> str:
+    def _render_condition(
+        self, condition, collector: ParamCollector | None, precedence: int = 0
+    ) -> str:
+        if isinstance(condition, OptionalCondition):
+            condition = condition.condition
         if isinstance(condition, Expression):
-            return condition.render(collector)
+            return render_predicate(condition, collector, precedence)
+        if isinstance(condition, str):
+            return self.dialect.render_fragment(condition, collector)
         return str(condition)
 
+    def _render_conditions(self, conditions, collector: ParamCollector | None) -> str:
+        # several conditions are AND-ed together, so OR-ed ones need parentheses
+        precedence = _BOOLEAN_PRECEDENCE[AND] if len(conditions) > 1 else 0
+        return f" {AND} ".join(
+            self._render_condition(c, collector, precedence) for c in conditions
+        )
+
     def render_group_by(
         self, node: GroupByNode, collector: ParamCollector | None
     ) -> str:
         columns = self.dialect.normalize_identifiers_args(
-            node.state["columns"], collector=collector
+            node.columns, collector=collector
         )
         return f"{GROUP_BY} {columns}"
 
@@ -109,7 +127,7 @@ class Renderer:
         self, node: OrderByNode, collector: ParamCollector | None
     ) -> str:
         parts = []
-        for col in node.state["columns"]:
+        for col in node.columns:
             if isinstance(col, OrderedColumn):
                 escaped = self.dialect.normalize_identifiers_args(
                     [col.name], collector=collector
@@ -122,7 +140,7 @@ class Renderer:
         return f"{ORDER_BY} {', '.join(parts)}"
 
     def render_limit(self, node: LimitNode, collector: ParamCollector | None) -> str:
-        return f"{LIMIT} {node.state['limit']}"
+        return f"{LIMIT} {node.limit}"
 
     def render_join(self, node: JoinNode, collector: ParamCollector | None) -> str:
         table = self.dialect.normalize_identifiers_args(node.table, collector=collector)
@@ -133,13 +151,10 @@ class Renderer:
         )
 
     def render_having(self, node: HavingNode, collector: ParamCollector | None) -> str:
-        conditions = f" {AND} ".join(
-            self._render_condition(c, collector) for c in node.state["conditions"]
-        )
-        return f"{HAVING} {conditions}"
+        return f"{HAVING} {self._render_conditions(node.conditions, collector)}"
 
     def render_offset(self, node: OffsetNode, collector: ParamCollector | None) -> str:
-        return f"{OFFSET} {node.state['offset']}"
+        return f"{OFFSET} {node.offset}"
 
     def _render_combine_query(self, query, collector: ParamCollector | None) -> str:
         if (
@@ -151,17 +166,17 @@ class Renderer:
         return str(query)
 
     def render_union(self, node: UnionNode, collector: ParamCollector | None) -> str:
-        operation = UNION_ALL if node.state.get("all", False) else UNION
+        operation = UNION_ALL if node.all else UNION
         return f"{operation} {self._render_combine_query(node.query, collector)}"
 
     def render_except(self, node: ExceptNode, collector: ParamCollector | None) -> str:
-        operation = EXCEPT_ALL if node.state.get("all", False) else EXCEPT
+        operation = EXCEPT_ALL if node.all else EXCEPT
         return f"{operation} {self._render_combine_query(node.query, collector)}"
 
     def render_intersect(
         self, node: IntersectNode, collector: ParamCollector | None
     ) -> str:
-        operation = INTERSECT_ALL if node.state.get("all", False) else INTERSECT
+        operation = INTERSECT_ALL if node.all else INTERSECT
         return f"{operation} {self._render_combine_query(node.query, collector)}"
 
     def _resolve_columns(self, *args, collector: ParamCollector | None = None) -> str:
@@ -172,3 +187,63 @@ class Renderer:
         else:
             columns = self.dialect.normalize_identifiers_args(args, collector=collector)
         return columns
+
+    def _render_value(self, value: Any, collector: ParamCollector | None) -> str:
+        if collector is not None:
+            return collector.add(value)
+        return self.dialect.escape_value(value)
+
+    def _render_rows(
+        self, rows: Sequence[Sequence[Any]], collector: ParamCollector | None
+    ) -> list[str]:
+        if collector is not None:
+            return ["(" + ", ".join(collector.add_many(row)) + ")" for row in rows]
+        # columns are usually homogeneous, so escape column by column
+        columns = [self.dialect.escape_values(column) for column in zip(*rows)]
+        return ["(" + ", ".join(row) + ")" for row in zip(*columns)]
+
+    def _render_insert_target(self, table: str, columns: Sequence[str]) -> str:
+        escaped = ", ".join(self.dialect.escape_identifier(c) for c in columns)
+        return f"{self.dialect.escape_identifier(table)} ({escaped})"
+
+    def render_insert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        collector: ParamCollector | None = None,
+    ) -> str:
+        """Render a single multi-row ``INSERT INTO ... VALUES (...), (...)``."""
+        values = ", ".join(self._render_rows(rows, collector))
+        return f"{INSERT_INTO} {self._render_insert_target(table, columns)} {VALUES} {values}"
+
+    def render_upsert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        keys: Sequence[str],
+        increments: Sequence[str] = (),
+        collector: ParamCollector | None = None,
+    ) -> str:
+        """Render a multi-row insert which updates rows whose ``keys`` already exist.
+
+        Columns listed in ``increments`` are added to the stored value; every
+        other non-key column is overwritten. The default is the
+        ``ON CONFLICT ... DO UPDATE`` form shared by Postgres and SQLite.
+        """
+        insert = self.render_insert(table, columns, rows, collector)
+        target = ", ".join(self.dialect.escape_identifier(k) for k in keys)
+        assignments = []
+        for column in columns:
+            if column in keys:
+                continue
+            escaped = self.dialect.escape_identifier(column)
+            if column in increments:
+                current = f"{self.dialect.escape_identifier(table)}.{escaped}"
+                assignments.append(f"{escaped} = {current} + EXCLUDED.{escaped}")
+            else:
+                assignments.append(f"{escaped} = EXCLUDED.{escaped}")
+        if not assignments:
+            return f"{insert} ON CONFLICT ({target}) DO NOTHING"
+        return f"{insert} ON CONFLICT ({target}) DO UPDATE SET {', '.join(assignments)}"
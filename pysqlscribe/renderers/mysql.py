@@ -1,4 +1,32 @@
+from typing import Any, Sequence
+
+from pysqlscribe.params import ParamCollector
 from pysqlscribe.renderers.base import Renderer
 
 
-class MySQLRenderer(Renderer): ...
+class MySQLRenderer(Renderer):
+    def render_upsert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        keys: Sequence[str],
+        increments: Sequence[str] = (),
+        collector: ParamCollector | None = None,
+    ) -> str:
+        # MySQL resolves the conflict against any unique index, so `keys` only
+        # decides which columns are left untouched on update.
+        insert = self.render_insert(table, columns, rows, collector)
+        assignments = []
+        for column in columns:
+            if column in keys:
+                continue
+            escaped = self.dialect.escape_identifier(column)
+            if column in increments:
+                assignments.append(f"{escaped} = {escaped} + VALUES({escaped})")
+            else:
+                assignments.append(f"{escaped} = VALUES({escaped})")
+        if not assignments:
+            escaped = self.dialect.escape_identifier(keys[0])
+            assignments.append(f"{escaped} = {escaped}")
+        return f"{insert} ON DUPLICATE KEY UPDATE {', '.join(assignments)}"
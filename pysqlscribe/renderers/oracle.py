@@ -1,13 +1,66 @@
+from typing import Any, Sequence
+
 from pysqlscribe.ast.nodes import LimitNode, OffsetNode
 from pysqlscribe.params import ParamCollector
-from pysqlscribe.renderers.base import Renderer, OFFSET
+from pysqlscribe.renderers.base import Renderer, OFFSET, VALUES
 
 FETCH_NEXT = "FETCH NEXT"
 
 
 class OracleRenderer(Renderer):
     def render_limit(self, node: LimitNode, collector: ParamCollector | None) -> str:
-        return f"{FETCH_NEXT} {node.state['limit']} ROWS ONLY"
+        return f"{FETCH_NEXT} {node.limit} ROWS ONLY"
 
     def render_offset(self, node: OffsetNode, collector: ParamCollector | None) -> str:
-        return f"{OFFSET} {node.state['offset']} ROWS"
+        return f"{OFFSET} {node.offset} ROWS"
+
+    def render_insert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        collector: ParamCollector | None = None,
+    ) -> str:
+        # Oracle (before 23c) has no multi-row VALUES list; INSERT ALL with one
+        # INTO clause per row is the single-statement equivalent.
+        target = self._render_insert_target(table, columns)
+        intos = " ".join(
+            f"INTO {target} {VALUES} {row}"
+            for row in self._render_rows(rows, collector)
+        )
+        return f"INSERT ALL {intos} SELECT 1 FROM DUAL"
+
+    def render_upsert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Sequence[Sequence[Any]],
+        keys: Sequence[str],
+        increments: Sequence[str] = (),
+        collector: ParamCollector | None = None,
+    ) -> str:
+        escape = self.dialect.escape_identifier
+        source = " UNION ALL ".join(
+            "SELECT "
+            + ", ".join(
+                f"{self._render_value(value, collector)} {escape(column)}"
+                for value, column in zip(row, columns)
+            )
+            + " FROM DUAL"
+            for row in rows
+        )
+        on = " AND ".join(f"t.{escape(k)} = s.{escape(k)}" for k in keys)
+        assignments = ", ".join(
+            f"t.{escape(c)} = t.{escape(c)} + s.{escape(c)}"
+            if c in increments
+            else f"t.{escape(c)} = s.{escape(c)}"
+            for c in columns
+            if c not in keys
+        )
+        matched = f" WHEN MATCHED THEN UPDATE SET {assignments}" if assignments else ""
+        insert_columns = ", ".join(escape(c) for c in columns)
+        insert_values = ", ".join(f"s.{escape(c)}" for c in columns)
+        return (
+            f"MERGE INTO {escape(table)} t USING ({source}) s ON ({on}){matched} "
+            f"WHEN NOT MATCHED THEN INSERT ({insert_columns}) {VALUES} ({insert_values})"
+        )
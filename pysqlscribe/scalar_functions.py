@@ -1,6 +1,6 @@
 import math
 
-from pysqlscribe.column import Column, ExpressionColumn, _resolve_value
+from pysqlscribe.column import Column, FunctionCall, _resolve_value
 from pysqlscribe.functions import ScalarFunctions
 
 
@@ -11,7 +11,12 @@ def _dialect_from(args) -> object | None:
 def _scalar_function(scalar_function: str, column: Column | str | int) -> Column | str:
     if not isinstance(column, Column):
         return f"{scalar_function}({column})"
-    return ExpressionColumn(f"{scalar_function}({column})", column.table_name)
+    return _function_call(scalar_function, column)
+
+
+def _function_call(function: str, *arguments) -> FunctionCall:
+    first = arguments[0]
+    return FunctionCall(function, arguments, first.table_name, dialect=first._dialect)
 
 
 def abs_(column: Column | str):
@@ -81,17 +86,12 @@ def trunc(column: Column | str, decimals: int | None = None):
         return _scalar_function(ScalarFunctions.TRUNC, column)
     if not isinstance(column, Column):
         return f"{ScalarFunctions.TRUNC}({column}, {decimals})"
-    return ExpressionColumn(
-        f"{ScalarFunctions.TRUNC}({column}, {decimals})", column.table_name
-    )
+    return _function_call(ScalarFunctions.TRUNC, column, decimals)
 
 
 def power(base: Column | str | int, exponent: Column | str | int):
     if all(isinstance(arg, Column) for arg in (base, exponent)):
-        return ExpressionColumn(
-            f"{ScalarFunctions.POWER}({base}, {exponent})",
-            base.table_name,
-        )
+        return _function_call(ScalarFunctions.POWER, base, exponent)
     return f"{ScalarFunctions.POWER}({base}, {exponent})"
 
 
@@ -105,11 +105,7 @@ def exp(column: Column | str | int):
 
 def concat(*args: Column | str | int):
     if all(isinstance(arg, Column) for arg in args):
-        return ExpressionColumn(
-            f"{ScalarFunctions.CONCAT}({', '.join(arg.name for arg in args)})",
-            args[0].table_name,
-            dialect=args[0]._dialect,
-        )
+        return _function_call(ScalarFunctions.CONCAT, *args)
     dialect = _dialect_from(args)
     parts = [
         str(arg) if isinstance(arg, Column) else _resolve_value(arg, dialect)
@@ -120,20 +116,13 @@ def concat(*args: Column | str | int):
 
 def nullif(value1: Column | str | int, value2: Column | str | int):
     if all(isinstance(arg, Column) for arg in (value1, value2)):
-        return ExpressionColumn(
-            f"{ScalarFunctions.NULLIF}({value1}, {value2})",
-            value1.table_name,
-        )
+        return _function_call(ScalarFunctions.NULLIF, value1, value2)
     return f"{ScalarFunctions.NULLIF}({value1}, {value2})"
 
 
 def coalesce(*args: Column | str | int):
     if all(isinstance(arg, Column) for arg in args):
-        return ExpressionColumn(
-            f"{ScalarFunctions.COALESCE}({', '.join(arg.name for arg in args)})",
-            args[0].table_name,
-            dialect=args[0]._dialect,
-        )
+        return _function_call(ScalarFunctions.COALESCE, *args)
     dialect = _dialect_from(args)
     parts = [
         str(arg) if isinstance(arg, Column) else _resolve_value(arg, dialect)
@@ -156,10 +145,7 @@ def atan(column: Column | str | int):
 
 def atan2(y: Column | str | int, x: Column | str | int):
     if all(isinstance(arg, Column) for arg in (y, x)):
-        return ExpressionColumn(
-            f"{ScalarFunctions.ATAN2}({y}, {x})",
-            y.table_name,
-        )
+        return _function_call(ScalarFunctions.ATAN2, y, x)
     return f"{ScalarFunctions.ATAN2}({y}, {x})"
 
 
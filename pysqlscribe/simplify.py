@@ -0,0 +1,293 @@
+"""Simplification of AND / OR / NOT predicate trees before rendering.
+
+The rewrites hold under SQL's three-valued logic and don't depend on
+collations, since only numeric literals are compared:
+
+- ``NOT (NOT p)`` becomes ``p``
+- repeated predicates within an AND / OR are dropped
+- ``x = 1 OR x = 2 OR x IN (3)`` becomes ``x IN (1, 2, 3)``, and likewise
+  ``x <> 1 AND x <> 2`` becomes ``x NOT IN (1, 2)``
+- ``x > 5 AND x > 7`` becomes ``x > 7`` (and ``x > 5 OR x > 7`` becomes ``x > 5``)
+- comparisons between two numeric literals are folded to ``1 = 1`` / ``1 = 0``,
+  which then drop out of (or decide) the AND / OR they're in; strings are left
+  alone, as ``'a' = 'A'`` depends on the column's collation
+"""
+
+import decimal
+import operator
+from typing import Any
+
+from pysqlscribe.column import (
+    CompoundExpression,
+    Expression,
+    NotExpression,
+    _BetweenPair,
+)
+from pysqlscribe.params import Literal, LiteralList
+
+AND = "AND"
+OR = "OR"
+
+# rendered as-is on every dialect, including those without boolean literals
+TRUE = Expression("1", "=", "1")
+FALSE = Expression("1", "=", "0")
+
+_COMPARISONS = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_LOWER_BOUNDS = frozenset((">", ">="))
+_UPPER_BOUNDS = frozenset(("<", "<="))
+_BOUNDS = _LOWER_BOUNDS | _UPPER_BOUNDS
+# the equality operator merged into a membership test within each connective
+_MEMBERSHIP = {OR: ("=", "IN"), AND: ("<>", "NOT IN")}
+
+
+def _value_kind(value) -> str | None:
+    """Which values can be compared to, and merged into one list with, ``value``."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        return "str"
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return "number"
+    return None
+
+
+def _operand_key(operand) -> Any:
+    if isinstance(operand, Literal):
+        return ("literal", type(operand.value), operand.value)
+    if isinstance(operand, LiteralList):
+        return ("list", tuple(operand.tolist()))
+    if isinstance(operand, _BetweenPair):
+        return ("between", _operand_key(operand.low), _operand_key(operand.high))
+    if isinstance(operand, str):
+        return ("sql", operand)
+    # subqueries and anything else are only ever equal to themselves
+    return ("object", id(operand))
+
+
+def _fold(expression: Expression) -> Expression:
+    left, right = expression.left, expression.right
+    compare = _COMPARISONS.get(expression.operator)
+    if (
+        compare is not None
+        and isinstance(left, Literal)
+        and isinstance(right, Literal)
+        and _value_kind(left.value) == "number"
+        and _value_kind(right.value) == "number"
+    ):
+        return TRUE if compare(left.value, right.value) else FALSE
+    return expression
+
+
+class _Simplifier:
+    def __init__(self):
+        # structural keys of simplified nodes, by id; the nodes themselves are
+        # kept alive in ``results`` for the whole pass, so ids aren't reused
+        self.keys: dict[int, Any] = {}
+
+    def key(self, expression) -> Any:
+        key = self.keys.get(id(expression))
+        if key is None:
+            if isinstance(expression, Expression):
+                key = (
+                    _operand_key(expression.left),
+                    expression.operator,
+                    _operand_key(expression.right),
+                )
+            else:
+                key = ("sql", str(expression))
+            self.keys[id(expression)] = key
+        return key
+
+    def run(self, expression):
+        results: dict[int, Any] = {}
+        # post-order with an explicit stack, so deep trees don't recurse
+        stack: list[tuple[Any, list | None]] = [(expression, None)]
+        while stack:
+            node, children = stack.pop()
+            if isinstance(node, CompoundExpression):
+                if children is None:
+                    children = node.terms()
+                    stack.append((node, children))
+                    stack.extend((child, None) for child in children)
+                else:
+                    results[id(node)] = self.compound(
+                        node.operator, [results[id(child)] for child in children]
+                    )
+            elif isinstance(node, NotExpression):
+                if children is None:
+                    stack.append((node, [node.inner]))
+                    stack.append((node.inner, None))
+                else:
+                    results[id(node)] = self.negate(results[id(node.inner)])
+            elif isinstance(node, Expression):
+                results[id(node)] = _fold(node)
+            else:
+                results[id(node)] = node
+        return results[id(expression)]
+
+    def negate(self, inner):
+        if inner is TRUE:
+            return FALSE
+        if inner is FALSE:
+            return TRUE
+        if isinstance(inner, NotExpression):
+            return inner.inner
+        negated = NotExpression(inner)
+        self.keys[id(negated)] = ("NOT", self.key(inner))
+        return negated
+
+    def compound(self, connective: str, children: list):
+        # the constant that decides the whole expression, and the one that's a no-op
+        absorbing, identity = (FALSE, TRUE) if connective == AND else (TRUE, FALSE)
+        terms = []
+        seen = set()
+        for child in children:
+            if isinstance(child, CompoundExpression) and child.operator == connective:
+                spliced = child.terms()
+            else:
+                spliced = (child,)
+            for term in spliced:
+                if term is absorbing:
+                    return absorbing
+                if term is identity:
+                    continue
+                key = self.key(term)
+                if key not in seen:
+                    seen.add(key)
+                    terms.append(term)
+        terms = self.merge_membership(connective, terms)
+        terms = self.tighten_bounds(connective, terms)
+        if not terms:
+            return identity
+        if len(terms) == 1:
+            return terms[0]
+        simplified = CompoundExpression.of(connective, *terms)
+        self.keys[id(simplified)] = (
+            connective,
+            frozenset(self.key(term) for term in terms),
+        )
+        return simplified
+
+    def merge_membership(self, connective: str, terms: list) -> list:
+        equality, membership = _MEMBERSHIP[connective]
+        groups: dict[tuple, list[int]] = {}
+        values: dict[tuple, list] = {}
+        for index, term in enumerate(terms):
+            if type(term) is not Expression or not isinstance(term.left, str):
+                continue
+            if term.operator == equality and isinstance(term.right, Literal):
+                term_values = [term.right.value]
+            elif term.operator == membership and isinstance(term.right, LiteralList):
+                term_values = term.right.tolist()
+            else:
+                continue
+            kinds = set(map(_value_kind, term_values))
+            # LiteralList holds strings, ints and floats, but not Decimals
+            if (
+                len(kinds) != 1
+                or None in kinds
+                or any(isinstance(value, decimal.Decimal) for value in term_values)
+            ):
+                continue
+            group = (term.left, kinds.pop())
+            groups.setdefault(group, []).append(index)
+            values.setdefault(group, []).extend(term_values)
+
+        replacements = {}
+        dropped = set()
+        for group, indexes in groups.items():
+            if len(indexes) < 2:
+                continue
+            first = terms[indexes[0]]
+            merged = LiteralList(list(dict.fromkeys(values[group])))
+            replacements[indexes[0]] = Expression(
+                first.left, membership, merged, dialect=first._dialect
+            )
+            dropped.update(indexes[1:])
+        if not replacements:
+            return terms
+        return [
+            replacements.get(index, term)
+            for index, term in enumerate(terms)
+            if index not in dropped
+        ]
+
+    def tighten_bounds(self, connective: str, terms: list) -> list:
+        # within AND the tightest bound on each side wins, within OR the loosest
+        tightest = connective == AND
+        sides: dict[int, tuple] = {}
+        best: dict[tuple, Expression] = {}
+        for index, term in enumerate(terms):
+            if (
+                type(term) is not Expression
+                or not isinstance(term.left, str)
+                or term.operator not in _BOUNDS
+                or not isinstance(term.right, Literal)
+                or _value_kind(term.right.value) != "number"
+            ):
+                continue
+            side = (term.left, term.operator in _LOWER_BOUNDS)
+            sides[index] = side
+            current = best.get(side)
+            if current is None or _is_tighter(term, current, side[1]) == tightest:
+                best[side] = term
+        if len(best) == len(sides):
+            return terms
+        # each side keeps its winning bound where that side first appeared
+        result = []
+        for index, term in enumerate(terms):
+            side = sides.get(index)
+            if side is None:
+                result.append(term)
+            elif side in best:
+                result.append(best.pop(side))
+        return result
+
+
+def _is_tighter(bound: Expression, other: Expression, lower: bool) -> bool:
+    """Whether ``bound`` admits strictly fewer values than ``other`` (same side)."""
+    value, other_value = bound.right.value, other.right.value
+    if value != other_value:
+        return value > other_value if lower else value < other_value
+    return len(bound.operator) < len(other.operator)
+
+
+def simplify(expression: Expression) -> Expression:
+    """Return an equivalent, simplified copy of an AND / OR / NOT expression tree.
+
+    The input is left untouched. A predicate that folds to a constant comes back
+    as ``TRUE`` (``1 = 1``) or ``FALSE`` (``1 = 0``).
+    """
+    return _Simplifier().run(expression)
+
+
+def simplify_conditions(conditions: list) -> list:
+    """Simplify the AND-ed conditions of a WHERE / HAVING clause as one predicate.
+
+    Raw SQL strings are kept as they are, minus exact repeats; the simplified
+    expression terms take the place of the first expression condition.
+    """
+    expressions = [c for c in conditions if isinstance(c, Expression)]
+    terms = []
+    if expressions:
+        simplified = simplify(CompoundExpression.of(AND, *expressions))
+        if isinstance(simplified, CompoundExpression) and simplified.operator == AND:
+            terms = simplified.terms()
+        elif simplified is not TRUE:
+            terms = [simplified]
+    result = []
+    for condition in conditions:
+        if isinstance(condition, Expression):
+            result.extend(terms)
+            terms = []
+        elif condition not in result:
+            result.append(condition)
+    # a clause that's always true still needs something to render
+    return result or [TRUE]
@@ -3,21 +3,86 @@ from __future__ import annotations
 from typing import List, Self
 
 from pysqlscribe.alias import AliasMixin
-from pysqlscribe.column import Column
+from pysqlscribe.column import Column, validate_column_name
 from pysqlscribe.exceptions import InvalidTableNameError
 from pysqlscribe.ast.joins import JoinType
+from pysqlscribe.metadata import ForeignKey, Index, TableMetadata
 from pysqlscribe.query import Query
 from pysqlscribe.regex_patterns import (
     VALID_IDENTIFIER_REGEX,
 )
 
 
+class ColumnDescriptor:
+    """Declares a column at class level on a ``Table`` subclass, so its columns
+    are known to editors and type checkers before any instance exists.
+
+    ``name`` defaults to the attribute name; it only needs to be given when the
+    column can't be used as the attribute name (e.g. a Python keyword).
+    """
+
+    def __init__(self, name: str | None = None, *, data_type: str | None = None):
+        self.name = name
+        self.data_type = data_type
+
+    def __set_name__(self, owner: type, attribute: str) -> None:
+        if self.name is None:
+            self.name = attribute
+
+    def __get__(self, instance: "Table | None", owner: type) -> "Column | Self":
+        if instance is None:
+            return self
+        return instance._column(self.name)
+
+
 class Table(Query, AliasMixin):
-    def __init__(self, name: str, *columns, dialect: str, schema: str | None = None):
+    # columns declared on subclasses with `ColumnDescriptor`, used when no columns are passed
+    declared_columns: tuple[str, ...] = ()
+    declared_column_types: dict[str, str] = {}
+
+    def __init__(
+        self,
+        name: str,
+        *columns,
+        dialect: str,
+        schema: str | None = None,
+        column_types: dict[str, str] | None = None,
+        primary_key: tuple[str, ...] = (),
+        unique: list[tuple[str, ...]] | None = None,
+        foreign_keys: list[tuple] | None = None,
+        indexes: list[tuple] | None = None,
+    ):
         Query.__init__(self, dialect)
+        # `Column`s are created on first access and cached per (qualifier, name),
+        # so aliasing or renaming the table doesn't rebuild all of them
+        self._column_cache: dict[tuple[str, str], Column] = {}
+        # set before the columns, which pick up their types from it
+        self.metadata = TableMetadata(
+            column_types={**self.declared_column_types, **(column_types or {})},
+            primary_key=tuple(primary_key),
+            unique_keys=[tuple(key) for key in unique or ()],
+            foreign_keys=[
+                ForeignKey(*foreign_key) for foreign_key in foreign_keys or ()
+            ],
+            indexes=[Index(*index) for index in indexes or ()],
+        )
         self.table_name = name
         self.schema = schema
-        self.columns = columns
+        self.columns = columns or self.declared_columns
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        declared = list(cls.declared_columns)
+        declared_types = dict(cls.declared_column_types)
+        for value in vars(cls).values():
+            if not isinstance(value, ColumnDescriptor):
+                continue
+            if value.name not in declared:
+                declared.append(value.name)
+            if value.data_type is not None:
+                declared_types[value.name] = value.data_type
+        cls.declared_columns = tuple(declared)
+        cls.declared_column_types = declared_types
 
     def select(self, *columns, distinct: bool = False) -> Self:
         return super().select(*columns, distinct=distinct).from_(self)
@@ -50,9 +115,6 @@ class Table(Query, AliasMixin):
         if not VALID_IDENTIFIER_REGEX.match(table_name_):
             raise InvalidTableNameError(f"Invalid table name {table_name_}")
         self._table_name = table_name_
-        if getattr(self, "_columns", None):
-            # ensure that we re-assign our column attributes with the correct fully qualified name
-            self.columns = self.columns
 
     @property
     def columns(self):
@@ -60,27 +122,34 @@ class Table(Query, AliasMixin):
 
     @columns.setter
     def columns(self, columns_: List[str]):
-        if getattr(self, "_columns", None):
-            for column in self.columns:
-                delattr(self, column)
-        self._columns = columns_
         for column_name in columns_:
-            setattr(
-                self,
-                column_name,
-                Column(
-                    column_name,
-                    self._alias or self.table_name,
-                    dialect=self.dialect,
-                ),
+            validate_column_name(column_name)
+        self._columns = columns_
+        self._column_names = frozenset(columns_)
+        self._column_cache.clear()
+
+    def _column(self, name: str) -> Column:
+        """Return the ``Column`` ``name`` qualified by the table's current alias
+        (or name), creating it on first use."""
+        qualifier = self._alias or self.table_name
+        key = (qualifier, name)
+        column = self._column_cache.get(key)
+        if column is None:
+            column = self._column_cache[key] = Column(
+                name,
+                qualifier,
+                dialect=self.dialect,
+                data_type=self.metadata.column_types.get(name),
             )
+        return column
 
-    def as_(self, alias: str) -> Self:
-        super().as_(alias)
-        # ensure that we re-assign our column attributes with the correct fully qualified name (including
-        # the alias instead of the full table name)
-        self.columns = self.columns
-        return self
+    def __getattr__(self, name: str) -> Column:
+        # only reached when regular attribute lookup fails, i.e. for columns
+        if name in self.__dict__.get("_column_names", ()):
+            return self._column(name)
+        raise AttributeError(
+            f"{self.__class__.__name__!r} object has no attribute or column {name!r}"
+        )
 
     def __repr__(self):
         return (
@@ -0,0 +1,166 @@
+"""Query templates: a query compiled once per combination of optional filters.
+
+Conditions added with ``where(..., optional=True)`` (or ``having``) are
+switched on and off by the values a template is bound with: one is present when
+each of its ``Param``s has a value other than ``None``. Each combination of
+present filters is a bitmask, rendered the first time it's bound and cached,
+so binding only costs a dict lookup and filling in the params. A template with
+``n`` optional filters sends at most ``2 ** n`` distinct SQL texts, and in
+practice only as many as there are combinations in use.
+"""
+
+import copy
+from typing import Any
+
+from pysqlscribe.ast.nodes import ConditionsNode
+from pysqlscribe.column import (
+    CompoundExpression,
+    Expression,
+    NotExpression,
+    OptionalCondition,
+    _BetweenPair,
+)
+from pysqlscribe.exceptions import TemplateParameterError
+from pysqlscribe.params import Literal, Param, ParamCollector
+
+
+def condition_params(condition) -> list[str]:
+    """The names of the ``Param``s in ``condition``, in order of appearance."""
+    names: dict[str, None] = {}
+    stack = [condition]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Literal):
+            if isinstance(item.value, Param):
+                names.setdefault(item.value.name)
+        elif isinstance(item, OptionalCondition):
+            stack.append(item.condition)
+        elif isinstance(item, CompoundExpression):
+            stack.extend(reversed(item.operands))
+        elif isinstance(item, NotExpression):
+            stack.append(item.inner)
+        elif isinstance(item, Expression):
+            stack.extend((item.right, item.left))
+        elif isinstance(item, _BetweenPair):
+            stack.extend((item.high, item.low))
+    return list(names)
+
+
+class _Variant:
+    """The rendered SQL of one combination of filters, with its params: the
+    constants as they are and the position of every ``Param`` to fill in."""
+
+    __slots__ = ("sql", "params", "slots", "keys")
+
+    def __init__(self, sql: str, collector: ParamCollector):
+        self.sql = sql
+        self.params = list(collector.params)
+        self.slots = [
+            (index, value.name)
+            for index, value in enumerate(self.params)
+            if isinstance(value, Param)
+        ]
+        bind_params = collector.bind_params
+        self.keys = list(bind_params) if isinstance(bind_params, dict) else None
+
+    def bind(self, values: dict[str, Any]) -> tuple[str, list[Any] | dict[str, Any]]:
+        params = self.params.copy()
+        for index, name in self.slots:
+            try:
+                params[index] = values[name]
+            except KeyError:
+                raise TemplateParameterError(
+                    f"No value bound for parameter '{name}'"
+                ) from None
+        if self.keys is not None:
+            return self.sql, dict(zip(self.keys, params))
+        return self.sql, params
+
+
+class QueryTemplate:
+    """A query rendered once per set of optional conditions present.
+
+    Created with ``Query.template()``, which takes a snapshot of the query:
+    later changes to it don't affect the template. ``bind(**values)`` returns
+    ``(sql, params)`` like ``build(parameterize=True)``.
+    """
+
+    def __init__(self, query):
+        self._query = copy.copy(query)
+        self._nodes = []
+        # the params of each optional condition, indexed by its bit
+        self._filters: list[tuple[str, ...]] = []
+        self._bits: dict[int, int] = {}
+        node = query.node
+        while node is not None:
+            node_copy = copy.copy(node)
+            if isinstance(node, ConditionsNode):
+                node_copy.conditions = list(node.conditions)
+                for condition in node.conditions:
+                    if isinstance(condition, OptionalCondition):
+                        names = condition_params(condition)
+                        if not names:
+                            raise TemplateParameterError(
+                                f"Optional condition {condition.condition!r} "
+                                "has no Param to switch it on"
+                            )
+                        self._bits[id(condition)] = len(self._filters)
+                        self._filters.append(tuple(names))
+            self._nodes.append(node_copy)
+            node = node.prev_
+        self._nodes.reverse()
+        self._variants: dict[int, _Variant] = {}
+        # every parameter of the template shows up with all filters present
+        everything = self._variant((1 << len(self._filters)) - 1)
+        self.parameters = frozenset(name for _, name in everything.slots)
+
+    def __len__(self) -> int:
+        """The number of variants rendered so far."""
+        return len(self._variants)
+
+    def bind(self, **values: Any) -> tuple[str, list[Any] | dict[str, Any]]:
+        unknown = values.keys() - self.parameters
+        if unknown:
+            raise TemplateParameterError(
+                f"Unknown template parameters: {', '.join(sorted(unknown))}"
+            )
+        mask = 0
+        for bit, names in enumerate(self._filters):
+            if all(values.get(name) is not None for name in names):
+                mask |= 1 << bit
+        variant = self._variants.get(mask)
+        if variant is None:
+            variant = self._variant(mask)
+        return variant.bind(values)
+
+    def _variant(self, mask: int) -> _Variant:
+        variant = self._variants.get(mask)
+        if variant is not None:
+            return variant
+        previous = None
+        for node in self._nodes:
+            node_copy = copy.copy(node)
+            if isinstance(node, ConditionsNode):
+                conditions = [
+                    condition.condition
+                    if isinstance(condition, OptionalCondition)
+                    else condition
+                    for condition in node.conditions
+                    if not isinstance(condition, OptionalCondition)
+                    or mask >> self._bits[id(condition)] & 1
+                ]
+                # a clause whose conditions are all absent is left out
+                if not conditions:
+                    continue
+                node_copy.conditions = conditions
+            node_copy.prev_ = previous
+            node_copy.next_ = None
+            if previous is not None:
+                previous.next_ = node_copy
+            previous = node_copy
+        query = copy.copy(self._query)
+        query.node = previous
+        collector = ParamCollector(query.dialect)
+        variant = _Variant(query._render(collector).strip(), collector)
+        self._variants[mask] = variant
+        return variant
@@ -0,0 +1,225 @@
+import mmap
+import os
+import threading
+import weakref
+from typing import Any, Iterator, NamedTuple, Union
+
+from pysqlscribe.exceptions import DuplicateTableError
+from pysqlscribe.regex_patterns import (
+    ALTER_TABLE_PREFIX_REGEX,
+    CREATE_INDEX_PREFIX_REGEX,
+    CREATE_TABLE_PREFIX_REGEX,
+)
+from pysqlscribe.schema import Schema
+from pysqlscribe.table import Table
+from pysqlscribe.utils.ddl_loader import (
+    CONFLICT_POLICIES,
+    find_sql_files,
+    table_from_metadata,
+)
+from pysqlscribe.utils.ddl_parser import (
+    DEFAULT_CHUNK_SIZE,
+    apply_ddl_object,
+    parse_create_table,
+    parse_create_table_name,
+    parse_ddl_statement,
+)
+from pysqlscribe.utils.sql_tokenizer import iter_statements_with_offsets
+
+
+class TableLocation(NamedTuple):
+    file_index: int
+    offset: int
+    length: int
+    schema: str | None
+
+
+def _iter_latin1_chunks(buffer: mmap.mmap, chunk_size: int) -> Iterator[str]:
+    # latin-1 maps every byte to exactly one character, so character offsets
+    # in the decoded text are byte offsets into the file
+    for start in range(0, len(buffer), chunk_size):
+        yield buffer[start : start + chunk_size].decode("latin-1")
+
+
+class Catalog:
+    """Lazily materialised tables and schemas of a DDL file (or directory).
+
+    Opening a catalog memory-maps each ``.sql`` file and records where each
+    ``CREATE TABLE`` statement lives, reading only its name. A statement is
+    parsed and its ``Table`` constructed on first access, either by key
+    (``catalog["employees"]``, ``catalog["hr.employees"]``) or as an attribute
+    (``catalog.employees``); schemas are available the same way, or via
+    ``schema()``. Materialised objects are cached weakly, so tables nothing else
+    refers to any more are dropped and rebuilt on their next access.
+
+    ``CREATE INDEX`` and ``ALTER TABLE ... ADD`` constraint statements are
+    short, so they're parsed while indexing and applied to their table when it
+    is materialised.
+
+    Files are read as UTF-8. Conflicting definitions of a table across files
+    are resolved like ``load_tables_from_ddls`` does, according to
+    ``on_conflict``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        dialect: str,
+        *,
+        recursive: bool = False,
+        on_conflict: str = "last",
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(
+                f"Unknown conflict policy {on_conflict!r}; expected one of {CONFLICT_POLICIES}"
+            )
+        self.dialect = dialect
+        # MySQL string literals treat backslash as an escape character
+        self._backslash_escapes = dialect == "mysql"
+        self._files = find_sql_files(path, recursive)
+        self._buffers: list[mmap.mmap | None] = []
+        self._index: dict[str, TableLocation] = {}
+        self._schemas: dict[str, list[str]] = {}
+        self._attachments: dict[str, list[tuple[str, Any]]] = {}
+        self._tables_cache = weakref.WeakValueDictionary()
+        self._schemas_cache = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+        for file_index, sql_file in enumerate(self._files):
+            self._index_file(file_index, sql_file, on_conflict, chunk_size)
+        for table_name, location in self._index.items():
+            if location.schema is not None:
+                self._schemas.setdefault(location.schema, []).append(table_name)
+
+    def _index_file(
+        self, file_index: int, sql_file: str, on_conflict: str, chunk_size: int
+    ) -> None:
+        with open(sql_file, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                self._buffers.append(None)
+                return
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffers.append(buffer)
+        statements = iter_statements_with_offsets(
+            _iter_latin1_chunks(buffer, chunk_size),
+            backslash_escapes=self._backslash_escapes,
+        )
+        for offset, statement in statements:
+            if CREATE_INDEX_PREFIX_REGEX.match(
+                statement
+            ) or ALTER_TABLE_PREFIX_REGEX.match(statement):
+                self._index_attachment(statement)
+                continue
+            if not CREATE_TABLE_PREFIX_REGEX.match(statement):
+                continue
+            name = parse_create_table_name(
+                statement.encode("latin-1").decode("utf-8"),
+                backslash_escapes=self._backslash_escapes,
+            )
+            if name is None:
+                continue
+            schema, table_name = name
+            existing = self._index.get(table_name)
+            if existing is not None and existing.file_index != file_index:
+                if on_conflict == "error":
+                    raise DuplicateTableError(
+                        f"Table {table_name} is defined in both "
+                        f"{self._files[existing.file_index]} and {sql_file}"
+                    )
+                if on_conflict == "first":
+                    continue
+            self._index[table_name] = TableLocation(
+                file_index, offset, len(statement), schema
+            )
+
+    def _index_attachment(self, statement: str) -> None:
+        parsed = parse_ddl_statement(
+            statement.encode("latin-1").decode("utf-8"),
+            backslash_escapes=self._backslash_escapes,
+        )
+        if parsed is not None:
+            kind, table_name, payload = parsed
+            self._attachments.setdefault(table_name, []).append((kind, payload))
+
+    @property
+    def table_names(self) -> list[str]:
+        return list(self._index)
+
+    @property
+    def schema_names(self) -> list[str]:
+        return list(self._schemas)
+
+    def table(self, name: str) -> Table:
+        schema = None
+        if name not in self._index and "." in name:
+            schema, name = name.rsplit(".", 1)
+        location = self._index.get(name)
+        if location is None or (schema is not None and location.schema != schema):
+            raise KeyError(name)
+        with self._lock:
+            table = self._tables_cache.get(name)
+            if table is None:
+                table = self._materialise(name, location)
+                self._tables_cache[name] = table
+            return table
+
+    def schema(self, name: str) -> Schema:
+        if name not in self._schemas:
+            raise KeyError(name)
+        with self._lock:
+            schema = self._schemas_cache.get(name)
+            if schema is None:
+                tables = [self.table(table_name) for table_name in self._schemas[name]]
+                schema = Schema(name, tables=tables, dialect=self.dialect)
+                self._schemas_cache[name] = schema
+            return schema
+
+    def _materialise(self, name: str, location: TableLocation) -> Table:
+        buffer = self._buffers[location.file_index]
+        statement = buffer[location.offset : location.offset + location.length]
+        _, metadata = parse_create_table(
+            statement.decode("utf-8"), backslash_escapes=self._backslash_escapes
+        )
+        for kind, payload in self._attachments.get(name, ()):
+            metadata = apply_ddl_object(metadata, kind, payload)
+        return table_from_metadata(name, metadata, self.dialect)
+
+    def close(self) -> None:
+        for buffer in self._buffers:
+            if buffer is not None:
+                buffer.close()
+        self._buffers = []
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getitem__(self, name: str) -> Table | Schema:
+        try:
+            return self.table(name)
+        except KeyError:
+            return self.schema(name)
+
+    def __getattr__(self, name: str) -> Table | Schema:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(
+                f"{self.__class__.__name__} has no table or schema {name}"
+            ) from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index or name in self._schemas
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(tables={len(self)}, schemas={self.schema_names})"
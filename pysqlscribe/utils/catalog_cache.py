@@ -0,0 +1,114 @@
+import hashlib
+import marshal
+import os
+from typing import Iterable, Union
+
+from pysqlscribe.utils.ddl_parser import DDLObject, parse_ddl_files
+
+# bump whenever the layout of the cached metadata changes
+CACHE_FORMAT_VERSION = 2
+
+
+def file_digest(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").digest()
+
+
+def refresh_entries(
+    entries: dict[str, tuple],
+    sql_files: list[str],
+    *,
+    backslash_escapes: bool = False,
+    workers: int | None = 1,
+) -> tuple[dict[str, tuple], list[str]]:
+    """Bring ``entries`` (``{abspath: (size, mtime_ns, digest, parsed)}``) up to
+    date with ``sql_files``, returning the new entries and the files which had
+    to be parsed again. Entries of files no longer in ``sql_files`` are dropped.
+
+    Files whose size and ``mtime`` are unchanged are trusted; the others are
+    hashed and only parsed again if their content actually changed.
+    """
+    refreshed = {}
+    stale = []
+    for sql_file in sql_files:
+        key = os.path.abspath(sql_file)
+        stat = os.stat(sql_file)
+        entry = entries.get(key)
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns):
+            refreshed[key] = entry
+            continue
+        digest = file_digest(sql_file)
+        if entry is not None and entry[2] == digest:
+            refreshed[key] = (stat.st_size, stat.st_mtime_ns, digest, entry[3])
+        else:
+            stale.append((sql_file, key, stat, digest))
+
+    reparsed = parse_ddl_files(
+        [sql_file for sql_file, *_ in stale],
+        backslash_escapes=backslash_escapes,
+        workers=workers,
+    )
+    for (_, key, stat, digest), (_, parsed) in zip(stale, reparsed):
+        refreshed[key] = (stat.st_size, stat.st_mtime_ns, digest, parsed)
+    return refreshed, [sql_file for sql_file, *_ in stale]
+
+
+class CatalogCache:
+    """Persistent cache of parsed DDL metadata, stored as a single ``marshal`` file.
+
+    Each entry is keyed by the DDL file's absolute path and records its size,
+    ``mtime`` and content hash alongside the parsed DDL objects. On ``load`` the
+    cached entries are validated with one ``stat`` per file; files whose size
+    or ``mtime`` changed are hashed, and only those whose content actually
+    changed are parsed again. The cache file is rewritten atomically whenever
+    an entry changes.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self.reparsed: list[str] = []
+
+    def load(
+        self,
+        sql_files: Iterable[str],
+        *,
+        backslash_escapes: bool = False,
+        workers: int | None = 1,
+    ) -> list[tuple[str, list[DDLObject]]]:
+        """Return ``(path, parsed)`` pairs for ``sql_files``, parsing only the
+        files which aren't cached or have changed since they were cached."""
+        sql_files = list(sql_files)
+        cached = self._read(backslash_escapes)
+        entries, self.reparsed = refresh_entries(
+            cached, sql_files, backslash_escapes=backslash_escapes, workers=workers
+        )
+        if entries != cached:
+            self._write(entries, backslash_escapes)
+        return [
+            (sql_file, entries[os.path.abspath(sql_file)][3]) for sql_file in sql_files
+        ]
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _read(self, backslash_escapes: bool) -> dict[str, tuple]:
+        try:
+            with open(self.path, "rb") as f:
+                version, flags, entries = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+        if version != CACHE_FORMAT_VERSION or flags != backslash_escapes:
+            return {}
+        return entries
+
+    def _write(self, entries: dict[str, tuple], backslash_escapes: bool) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(marshal.dumps((CACHE_FORMAT_VERSION, backslash_escapes, entries)))
+        os.replace(temporary, self.path)
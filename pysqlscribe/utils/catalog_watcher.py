@@ -0,0 +1,124 @@
+import os
+import threading
+from types import MappingProxyType
+from typing import Mapping, NamedTuple, Union
+
+from pysqlscribe.table import Table
+from pysqlscribe.utils.catalog_cache import refresh_entries
+from pysqlscribe.utils.ddl_loader import (
+    CONFLICT_POLICIES,
+    find_sql_files,
+    merge_parsed,
+    table_from_metadata,
+)
+
+
+class CatalogChanges(NamedTuple):
+    added: tuple[str, ...] = ()
+    changed: tuple[str, ...] = ()
+    removed: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class CatalogWatcher:
+    """A live catalog of the tables defined in a DDL file (or directory) which
+    can be brought up to date with ``poll``.
+
+    Each poll lists the ``.sql`` files again and ``stat``s them; only files
+    whose content changed (going by their size, ``mtime`` and hash) are parsed
+    again. Tables whose definition is unchanged keep their existing ``Table``
+    object, and the new catalog replaces the old one in a single assignment, so
+    readers of ``tables`` always see a complete, consistent snapshot.
+
+    The loading options are the same as ``load_tables_from_ddls``.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        dialect: str,
+        *,
+        recursive: bool = False,
+        workers: int | None = 1,
+        on_conflict: str = "last",
+    ):
+        if on_conflict not in CONFLICT_POLICIES:
+            raise ValueError(
+                f"Unknown conflict policy {on_conflict!r}; expected one of {CONFLICT_POLICIES}"
+            )
+        self.path = path
+        self.dialect = dialect
+        self.recursive = recursive
+        self.workers = workers
+        self.on_conflict = on_conflict
+        self.reparsed: list[str] = []
+        # MySQL string literals treat backslash as an escape character
+        self._backslash_escapes = dialect == "mysql"
+        self._entries: dict[str, tuple] = {}
+        self._metadata: dict = {}
+        self._tables: Mapping[str, Table] = MappingProxyType({})
+        self._lock = threading.Lock()
+        self.poll()
+
+    @property
+    def tables(self) -> Mapping[str, Table]:
+        """A read-only snapshot of the catalog as of the latest ``poll``."""
+        return self._tables
+
+    def poll(self) -> CatalogChanges:
+        """Reload the files which changed since the last poll and report which
+        tables were added, changed or removed as a result."""
+        with self._lock:
+            sql_files = find_sql_files(self.path, self.recursive)
+            entries, self.reparsed = refresh_entries(
+                self._entries,
+                sql_files,
+                backslash_escapes=self._backslash_escapes,
+                workers=self.workers,
+            )
+            if entries == self._entries:
+                return CatalogChanges()
+            metadata = merge_parsed(
+                (
+                    (sql_file, entries[os.path.abspath(sql_file)][3])
+                    for sql_file in sql_files
+                ),
+                self.on_conflict,
+            )
+
+            tables = {}
+            added, changed = [], []
+            for table_name, table_metadata in metadata.items():
+                previous = self._metadata.get(table_name)
+                if previous == table_metadata:
+                    tables[table_name] = self._tables[table_name]
+                    continue
+                (added if previous is None else changed).append(table_name)
+                tables[table_name] = table_from_metadata(
+                    table_name, table_metadata, self.dialect
+                )
+            removed = [name for name in self._metadata if name not in metadata]
+
+            self._entries = entries
+            self._metadata = metadata
+            self._tables = MappingProxyType(tables)
+            return CatalogChanges(
+                tuple(sorted(added)), tuple(sorted(changed)), tuple(sorted(removed))
+            )
+
+    def __getitem__(self, name: str) -> Table:
+        return self._tables[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tables
+
+    def __iter__(self):
+        return iter(self._tables)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(path={self.path!r}, tables={len(self)})"
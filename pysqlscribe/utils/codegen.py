@@ -0,0 +1,177 @@
+import argparse
+import json
+import keyword
+import os
+import sys
+from typing import Sequence, Union
+
+from pysqlscribe.table import Table
+from pysqlscribe.utils.ddl_loader import load_tables_from_ddls
+
+HEADER = '''"""Table definitions generated by pysqlscribe from DDL. Do not edit by hand.
+
+Regenerate with:
+    python -m pysqlscribe.utils.codegen <ddl path> --dialect {dialect} --output <this file>
+"""
+'''
+
+
+def _class_name(table_name: str) -> str:
+    name = "".join(
+        part[:1].upper() + part[1:] for part in table_name.split("_") if part
+    )
+    # e.g. `_1x` or `__`, which lose everything that made them identifiers
+    return name if name.isidentifier() else f"T{name}"
+
+
+def _literal(value) -> str:
+    """Render strings, ``None``, booleans and (nested) tuples and lists of
+    them as Python source."""
+    if isinstance(value, tuple):
+        items = ", ".join(map(_literal, value))
+        return f"({items},)" if len(value) == 1 else f"({items})"
+    if isinstance(value, list):
+        return f"[{', '.join(map(_literal, value))}]"
+    if value is None or isinstance(value, bool):
+        return repr(value)
+    # double-quoted, to match how the rest of a formatted module would look
+    return json.dumps(value)
+
+
+def _attribute_name(name: str, reserved: set[str]) -> str:
+    """Return a valid, non-shadowing Python attribute name for ``name``."""
+    if not name.isidentifier():
+        name = f"_{name}"
+    while keyword.iskeyword(name) or name in reserved:
+        name = f"{name}_"
+    return name
+
+
+def generate_module(tables: dict[str, Table], dialect: str) -> str:
+    """Render ``tables`` (as returned by ``load_tables_from_ddls``) as the source
+    of an importable module of ``Table`` subclasses with class-level columns,
+    one module-level instance per table and one ``Schema`` per schema.
+
+    The output only depends on the tables' names, schemas, columns and their
+    types, keys and indexes, so it can be compared with a previously generated
+    module to detect drift; the DDL path is left out, since the same directory
+    can be spelled many ways on the command line.
+    """
+    # columns mustn't shadow Table's methods or the attributes set on instances
+    table_attributes = set(dir(Table)) | set(vars(Table("t", dialect=dialect)))
+    lines = [
+        HEADER.format(dialect=dialect),
+        "from pysqlscribe.schema import Schema",
+        "from pysqlscribe.table import ColumnDescriptor, Table",
+        "",
+        f"DIALECT = {_literal(dialect)}",
+    ]
+    variables: set[str] = {"DIALECT", "Schema", "ColumnDescriptor", "Table"}
+    class_names: set[str] = set(variables)
+    instances = []
+    schemas: dict[str, list[str]] = {}
+    for table_name in sorted(tables):
+        table = tables[table_name]
+        bare_name = table._table_name
+        class_name = _attribute_name(_class_name(bare_name), class_names)
+        class_names.add(class_name)
+        lines += ["", "", f"class {class_name}(Table):"]
+        if not table.columns:
+            lines.append("    pass")
+        for column in table.columns:
+            attribute = _attribute_name(column, table_attributes)
+            arguments = [] if attribute == column else [_literal(column)]
+            data_type = table.metadata.column_types.get(column)
+            if data_type is not None:
+                arguments.append(f"data_type={_literal(data_type)}")
+            lines.append(f"    {attribute} = ColumnDescriptor({', '.join(arguments)})")
+        variable = _attribute_name(bare_name, variables | class_names)
+        variables.add(variable)
+        arguments = [
+            _literal(bare_name),
+            "dialect=DIALECT",
+            f"schema={_literal(table.schema)}",
+        ]
+        metadata = table.metadata
+        for keyword_, value in (
+            ("primary_key", metadata.primary_key),
+            ("unique", metadata.unique_keys),
+            (
+                "foreign_keys",
+                [tuple(foreign_key) for foreign_key in metadata.foreign_keys],
+            ),
+            ("indexes", [tuple(index) for index in metadata.indexes]),
+        ):
+            if value:
+                arguments.append(f"{keyword_}={_literal(value)}")
+        instances.append(f"{variable} = {class_name}({', '.join(arguments)})")
+        if table.schema:
+            schemas.setdefault(table.schema, []).append(variable)
+
+    lines += ["", ""] + instances
+    if schemas:
+        lines.append("")
+    for schema_name in sorted(schemas):
+        variable = _attribute_name(schema_name, variables | class_names)
+        variables.add(variable)
+        members = ", ".join(schemas[schema_name])
+        lines.append(
+            f"{variable} = Schema({_literal(schema_name)}, tables=[{members}], "
+            "dialect=DIALECT)"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def generate_module_from_ddls(
+    path: Union[str, os.PathLike],
+    dialect: str,
+    **load_kwargs,
+) -> str:
+    tables = load_tables_from_ddls(path, dialect, **load_kwargs)
+    return generate_module(tables, dialect)
+
+
+def check_module(module_path: Union[str, os.PathLike], expected_source: str) -> bool:
+    """Return whether the module at ``module_path`` matches ``expected_source``,
+    i.e. whether it is up to date with the DDL it was generated from."""
+    try:
+        with open(module_path, "r") as f:
+            return f.read() == expected_source
+    except FileNotFoundError:
+        return False
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m pysqlscribe.utils.codegen",
+        description="Generate a Python module of Table definitions from DDL.",
+    )
+    parser.add_argument("path", help="a .sql file or a directory of .sql files")
+    parser.add_argument("--dialect", required=True)
+    parser.add_argument("--output", "-o", required=True)
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="don't write anything; exit with status 1 if the output is out of date",
+    )
+    args = parser.parse_args(argv)
+
+    source = generate_module_from_ddls(
+        args.path, args.dialect, recursive=args.recursive
+    )
+    if args.check:
+        if check_module(args.output, source):
+            return 0
+        print(
+            f"{args.output} is out of date with {args.path}; regenerate it.",
+            file=sys.stderr,
+        )
+        return 1
+    with open(args.output, "w") as f:
+        f.write(source)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
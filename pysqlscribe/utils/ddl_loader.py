@@ -1,50 +1,166 @@
 import os
-from typing import Union
+import warnings
+from typing import Iterable, Union
 
-from pysqlscribe.exceptions import InvalidPathError
+from pysqlscribe.column import validate_column_name
+from pysqlscribe.exceptions import (
+    DuplicateTableError,
+    InvalidColumnsError,
+    InvalidPathError,
+    InvalidTableNameError,
+)
 from pysqlscribe.table import Table
+from pysqlscribe.utils.catalog_cache import CatalogCache
 from pysqlscribe.utils.ddl_parser import (
-    parse_create_tables,
+    TABLE,
+    DDLObject,
+    ParsedTable,
+    apply_ddl_object,
+    parse_ddl_files,
 )
 
+CONFLICT_POLICIES = ("last", "first", "error")
+
+
+def _is_valid_column(column: str) -> bool:
+    try:
+        validate_column_name(column)
+    except InvalidColumnsError:
+        return False
+    return True
+
+
+def table_from_metadata(
+    table_name: str, table_metadata: ParsedTable, dialect: str
+) -> Table:
+    """Build the ``Table`` described by parsed DDL metadata. Columns whose names
+    can't be used as identifiers (e.g. quoted names with spaces) are left out
+    with a warning rather than failing the whole load."""
+    columns = [c for c in table_metadata["columns"] if _is_valid_column(c)]
+    column_types = table_metadata.get("column_types")
+    if len(columns) < len(table_metadata["columns"]):
+        skipped = [c for c in table_metadata["columns"] if c not in columns]
+        warnings.warn(
+            f"Skipping columns of {table_name} that aren't valid identifiers: "
+            f"{', '.join(map(repr, skipped))}",
+            stacklevel=2,
+        )
+        column_types = {
+            column: data_type
+            for column, data_type in (column_types or {}).items()
+            if column in columns
+        }
+    return Table(
+        table_name,
+        *columns,
+        dialect=dialect,
+        schema=table_metadata.get("schema"),
+        column_types=column_types,
+        primary_key=table_metadata.get("primary_key", ()),
+        unique=table_metadata.get("unique"),
+        foreign_keys=table_metadata.get("foreign_keys"),
+        indexes=table_metadata.get("indexes"),
+    )
+
 
 def create_tables_from_parsed(
-    parsed: dict[str, dict[str, list[str] | str]], dialect: str
+    parsed: dict[str, ParsedTable], dialect: str
 ) -> dict[str, Table]:
+    """Build a ``Table`` per parsed table; tables whose names aren't valid
+    identifiers are skipped with a warning."""
     tables = {}
     for table_name, table_metadata in parsed.items():
-        tables[table_name] = Table(
-            table_name,
-            *table_metadata["columns"],
-            dialect=dialect,
-            schema=table_metadata.get("schema"),
-        )
+        try:
+            tables[table_name] = table_from_metadata(
+                table_name, table_metadata, dialect
+            )
+        except InvalidTableNameError:
+            warnings.warn(
+                f"Skipping table {table_name!r}, which isn't a valid identifier",
+                stacklevel=2,
+            )
     return tables
 
 
-def load_tables_from_ddls(
-    path: Union[str, os.PathLike], dialect: str
-) -> dict[str, Table]:
-    all_tables = {}
-
-    if os.path.isdir(path):
-        sql_files = [
-            os.path.join(path, f)
-            for f in os.listdir(path)
-            if f.lower().endswith(".sql")
-        ]
-    elif os.path.isfile(path) and path.lower().endswith(".sql"):
-        sql_files = [path]
-    else:
+def find_sql_files(path: Union[str, os.PathLike], recursive: bool = False) -> list[str]:
+    """Return the ``.sql`` files at ``path`` in sorted order, so that the
+    outcome of loading them never depends on directory listing order."""
+    path = os.fspath(path)
+    if os.path.isfile(path) and path.lower().endswith(".sql"):
+        return [path]
+    if not os.path.isdir(path):
         raise InvalidPathError(
             f"Invalid path: {path}. Must be a .sql file or directory containing .sql files."
         )
+    sql_files = []
+    directories = [path]
+    while directories:
+        with os.scandir(directories.pop()) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(".sql"):
+                    sql_files.append(entry.path)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+    return sorted(sql_files)
+
 
-    for sql_file in sql_files:
-        with open(sql_file, "r") as f:
-            sql_text = f.read()
-        parsed = parse_create_tables(sql_text)
-        table_objs = create_tables_from_parsed(parsed, dialect)
-        all_tables.update(table_objs)
+def merge_parsed(
+    parsed_files: Iterable[tuple[str, list[DDLObject]]],
+    on_conflict: str = "last",
+) -> dict[str, ParsedTable]:
+    """Merge per-file parse results; when several files define the same table
+    the last one wins, the first one wins, or ``DuplicateTableError`` is raised,
+    depending on ``on_conflict``. Indexes and constraints are then applied to
+    the merged tables, whichever file declares them."""
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(
+            f"Unknown conflict policy {on_conflict!r}; expected one of {CONFLICT_POLICIES}"
+        )
+    merged = {}
+    sources = {}
+    attachments = []
+    for path, objects in parsed_files:
+        for kind, table_name, table_metadata in objects:
+            if kind != TABLE:
+                attachments.append((kind, table_name, table_metadata))
+                continue
+            if table_name in merged:
+                if sources[table_name] == path:
+                    merged[table_name] = table_metadata
+                    continue
+                if on_conflict == "error":
+                    raise DuplicateTableError(
+                        f"Table {table_name} is defined in both "
+                        f"{sources[table_name]} and {path}"
+                    )
+                if on_conflict == "first":
+                    continue
+            merged[table_name] = table_metadata
+            sources[table_name] = path
+    for kind, table_name, payload in attachments:
+        if table_name in merged:
+            merged[table_name] = apply_ddl_object(merged[table_name], kind, payload)
+    return merged
 
-    return all_tables
+
+def load_tables_from_ddls(
+    path: Union[str, os.PathLike],
+    dialect: str,
+    *,
+    recursive: bool = False,
+    workers: int | None = 1,
+    on_conflict: str = "last",
+    cache_path: Union[str, os.PathLike, None] = None,
+) -> dict[str, Table]:
+    sql_files = find_sql_files(path, recursive)
+    # MySQL string literals treat backslash as an escape character
+    backslash_escapes = dialect == "mysql"
+    if cache_path is not None:
+        parsed_files = CatalogCache(cache_path).load(
+            sql_files, backslash_escapes=backslash_escapes, workers=workers
+        )
+    else:
+        parsed_files = parse_ddl_files(
+            sql_files, backslash_escapes=backslash_escapes, workers=workers
+        )
+    return create_tables_from_parsed(merge_parsed(parsed_files, on_conflict), dialect)
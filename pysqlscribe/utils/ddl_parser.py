@@ -1,36 +1,553 @@
-from pysqlscribe.regex_patterns import CONSTRAINT_PREFIX_REGEX, CREATE_TABLE_REGEX
-import re
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, Union
 
+from pysqlscribe.regex_patterns import (
+    ALTER_TABLE_PREFIX_REGEX,
+    COLUMN_CONSTRAINT_KEYWORDS,
+    COLUMN_HEAD_REGEX,
+    COLUMN_KEY_CONSTRAINT_REGEX,
+    CREATE_INDEX_PREFIX_REGEX,
+    CREATE_TABLE_PREFIX_REGEX,
+)
+from pysqlscribe.utils.sql_tokenizer import (
+    IDENTIFIER,
+    NUMBER,
+    PUNCTUATION,
+    QUOTED_IDENTIFIER,
+    Token,
+    is_keyword,
+    iter_statements,
+    split_parenthesised,
+    tokenize,
+)
 
-def parse_create_tables(sql_text: str) -> dict[str, dict[str, list[str] | str]]:
-    tables = {}
+# kinds of object yielded by `iter_ddl_objects`
+TABLE = "table"
+INDEX = "index"
+CONSTRAINT = "constraint"
+
+TABLE_MODIFIER_KEYWORDS = (
+    "CREATE",
+    "OR",
+    "REPLACE",
+    "GLOBAL",
+    "LOCAL",
+    "TEMP",
+    "TEMPORARY",
+    "UNLOGGED",
+    "TABLE",
+)
+
+INDEX_MODIFIER_KEYWORDS = (
+    "CREATE",
+    "UNIQUE",
+    "CLUSTERED",
+    "NONCLUSTERED",
+    "FULLTEXT",
+    "SPATIAL",
+    "BITMAP",
+    "INDEX",
+    "CONCURRENTLY",
+)
+
+# keywords a table-level constraint or index can start with
+TABLE_CONSTRAINT_KEYWORDS = (
+    "CONSTRAINT",
+    "PRIMARY",
+    "FOREIGN",
+    "UNIQUE",
+    "KEY",
+    "INDEX",
+    "FULLTEXT",
+    "SPATIAL",
+    "CHECK",
+    "EXCLUDE",
+    "LIKE",
+)
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+ParsedTable = dict[str, Any]
+DDLObject = tuple[str, str, Any]
+
+
+def empty_table_metadata(schema: str | None = None) -> ParsedTable:
+    """The metadata recorded for each table, made of builtins only so that it
+    can be pickled across processes and cached with ``marshal``.
+
+    ``foreign_keys`` holds ``(columns, referenced_table, referenced_columns)``
+    and ``indexes`` holds ``(name, columns, unique)`` tuples.
+    """
+    return {
+        "schema": schema,
+        "columns": [],
+        "column_types": {},
+        "primary_key": (),
+        "unique": [],
+        "foreign_keys": [],
+        "indexes": [],
+    }
+
+
+def _is_name(token: Token) -> bool:
+    return token.kind in (IDENTIFIER, QUOTED_IDENTIFIER)
+
+
+def _is_punctuation(token: Token, value: str) -> bool:
+    return token.kind == PUNCTUATION and token.value == value
+
+
+def _skip_parenthesised(tokens: list[Token], index: int) -> int:
+    """Return the index just past the group opened by ``tokens[index]``."""
+    depth = 0
+    for position in range(index, len(tokens)):
+        if _is_punctuation(tokens[position], "("):
+            depth += 1
+        elif _is_punctuation(tokens[position], ")"):
+            depth -= 1
+            if depth == 0:
+                return position + 1
+    return len(tokens)
+
+
+def _parse_name(tokens: list[Token], index: int) -> tuple[list[str], int]:
+    """Parse a (possibly qualified) name at ``index``, returning its parts."""
+    parts = []
+    while index < len(tokens) and _is_name(tokens[index]):
+        parts.append(tokens[index].value)
+        index += 1
+        if index + 1 < len(tokens) and _is_punctuation(tokens[index], "."):
+            index += 1
+        else:
+            break
+    return parts, index
+
+
+def _parse_column_list(tokens: list[Token], index: int) -> tuple[tuple[str, ...], int]:
+    """Parse a parenthesised list of column names at ``index``.
+
+    MySQL prefix lengths (``name(10)``) and sort orders are ignored, and
+    expressions are left out.
+    """
+    if index >= len(tokens) or not _is_punctuation(tokens[index], "("):
+        return (), index
+    end = _skip_parenthesised(tokens, index)
+    columns = []
+    item: list[Token] = []
+    depth = 0
+    for token in tokens[index + 1 : end]:
+        if _is_punctuation(token, "("):
+            depth += 1
+        elif _is_punctuation(token, ")"):
+            depth -= 1
+        elif not (_is_punctuation(token, ",") and depth == 0):
+            item.append(token)
+            continue
+        if depth >= 0 and not _is_punctuation(token, ","):
+            item.append(token)
+            continue
+        if item and _is_name(item[0]):
+            is_call = len(item) > 2 and _is_punctuation(item[1], "(")
+            if not is_call or item[2].kind == NUMBER:
+                columns.append(item[0].value)
+        item = []
+    return tuple(columns), end
+
+
+def _parse_references(
+    tokens: list[Token], index: int
+) -> tuple[tuple[str, tuple[str, ...]] | None, int]:
+    """Parse ``REFERENCES table [(columns)]`` at ``index``."""
+    if index >= len(tokens) or not is_keyword(tokens[index], "REFERENCES"):
+        return None, index
+    parts, index = _parse_name(tokens, index + 1)
+    columns, index = _parse_column_list(tokens, index)
+    return (".".join(parts), columns), index
+
+
+def _parse_table_constraint(tokens: list[Token], metadata: ParsedTable) -> bool:
+    """Record a table-level constraint or index; returns False if ``tokens``
+    aren't one (i.e. they define a column)."""
+    index = 0
+    constraint_name = None
+    if is_keyword(tokens[0], "CONSTRAINT"):
+        if len(tokens) > 1 and _is_name(tokens[1]):
+            constraint_name = tokens[1].value
+        index = 2
+    if index >= len(tokens):
+        return True
+    first = tokens[index]
+    if is_keyword(first, "PRIMARY"):
+        index += 2  # PRIMARY KEY
+        while index < len(tokens) and not _is_punctuation(tokens[index], "("):
+            index += 1  # e.g. MySQL's USING BTREE
+        metadata["primary_key"], _ = _parse_column_list(tokens, index)
+        return True
+    if is_keyword(first, "FOREIGN"):
+        index += 2  # FOREIGN KEY
+        if index < len(tokens) and _is_name(tokens[index]):
+            index += 1  # MySQL allows naming the key here
+        columns, index = _parse_column_list(tokens, index)
+        reference, _ = _parse_references(tokens, index)
+        if reference is not None:
+            metadata["foreign_keys"].append((columns, *reference))
+        return True
+    if is_keyword(first, "UNIQUE", "KEY", "INDEX", "FULLTEXT", "SPATIAL"):
+        unique = is_keyword(first, "UNIQUE")
+        is_index = not unique
+        index += 1
+        while index < len(tokens) and is_keyword(tokens[index], "KEY", "INDEX"):
+            is_index = True
+            index += 1
+        index_name = constraint_name
+        if index < len(tokens) and _is_name(tokens[index]):
+            if not is_keyword(tokens[index], "USING"):
+                index_name = tokens[index].value
+                index += 1
+        while index < len(tokens) and not _is_punctuation(tokens[index], "("):
+            index += 1
+        columns, _ = _parse_column_list(tokens, index)
+        if unique:
+            metadata["unique"].append(columns)
+        if is_index:
+            metadata["indexes"].append((index_name, columns, unique))
+        return True
+    # CHECK, EXCLUDE and LIKE don't describe columns or keys
+    return is_keyword(first, "CHECK", "EXCLUDE", "LIKE") or constraint_name is not None
+
+
+def _parse_column(element: str, tokens: list[Token], metadata: ParsedTable) -> None:
+    name = tokens[0].value
+    metadata["columns"].append(name)
+    index = 1
+    while index < len(tokens):
+        token = tokens[index]
+        if is_keyword(token, *COLUMN_CONSTRAINT_KEYWORDS):
+            break
+        # MySQL's `CHARACTER SET ...`, as opposed to Postgres' `CHARACTER VARYING`
+        if is_keyword(token, "CHARSET") or (
+            is_keyword(token, "CHARACTER")
+            and index + 1 < len(tokens)
+            and is_keyword(tokens[index + 1], "SET")
+        ):
+            break
+        if _is_punctuation(token, "("):
+            index = _skip_parenthesised(tokens, index)
+        else:
+            index += 1
+    if index > 1:
+        end = tokens[index].start if index < len(tokens) else len(element)
+        metadata["column_types"][name] = " ".join(
+            element[tokens[1].start : end].split()
+        )
+    _parse_column_constraints(name, tokens, index, metadata)
+
+
+def _parse_column_constraints(
+    name: str, tokens: list[Token], index: int, metadata: ParsedTable
+) -> None:
+    """Record the keys declared by the constraints of column ``name``, which
+    start at ``tokens[index]``."""
+    while index < len(tokens):
+        token = tokens[index]
+        if _is_punctuation(token, "("):
+            index = _skip_parenthesised(tokens, index)
+            continue
+        if is_keyword(token, "PRIMARY"):
+            metadata["primary_key"] = (name,)
+        elif is_keyword(token, "UNIQUE"):
+            metadata["unique"].append((name,))
+        elif is_keyword(token, "REFERENCES"):
+            reference, index = _parse_references(tokens, index)
+            metadata["foreign_keys"].append(((name,), *reference))
+            continue
+        index += 1
+
+
+def _parse_table_element(
+    element: str, metadata: ParsedTable, backslash_escapes: bool
+) -> None:
+    head = COLUMN_HEAD_REGEX.match(element)
+    if head is not None and head["name"].upper() not in TABLE_CONSTRAINT_KEYWORDS:
+        # a plain column definition: only its key constraints need tokenizing
+        name = head["name"]
+        metadata["columns"].append(name)
+        if head["type"]:
+            metadata["column_types"][name] = " ".join(head["type"].split())
+        rest = element[head.end() :]
+        if COLUMN_KEY_CONSTRAINT_REGEX.search(rest):
+            tokens = list(tokenize(rest, backslash_escapes=backslash_escapes))
+            _parse_column_constraints(name, tokens, 0, metadata)
+        return
+    tokens = list(tokenize(element, backslash_escapes=backslash_escapes))
+    if not tokens or not _is_name(tokens[0]):
+        return
+    if tokens[0].kind == IDENTIFIER and _parse_table_constraint(tokens, metadata):
+        return
+    _parse_column(element, tokens, metadata)
+
+
+def _parse_header(
+    statement: str, backslash_escapes: bool
+) -> tuple[list[str], int] | None:
+    """Return the (possibly schema-qualified) name parts of a ``CREATE TABLE``
+    statement and the position of the ``(`` opening its body."""
+    if not CREATE_TABLE_PREFIX_REGEX.match(statement):
+        return None
+    tokens = tokenize(statement, backslash_escapes=backslash_escapes)
+    token = next(tokens, None)
+    while token is not None and is_keyword(token, *TABLE_MODIFIER_KEYWORDS):
+        token = next(tokens, None)
+    if token is not None and is_keyword(token, "IF"):  # IF NOT EXISTS
+        for _ in range(3):
+            token = next(tokens, None)
 
-    table_regex = re.compile(
-        CREATE_TABLE_REGEX,
-        re.IGNORECASE | re.DOTALL,
+    name_parts = []
+    while token is not None and _is_name(token):
+        name_parts.append(token.value)
+        token = next(tokens, None)
+        if token is None or not _is_punctuation(token, "."):
+            break
+        token = next(tokens, None)
+    if not name_parts or token is None or not _is_punctuation(token, "("):
+        return None
+    return name_parts, token.start
+
+
+def parse_create_table_name(
+    statement: str, *, backslash_escapes: bool = False
+) -> tuple[str | None, str] | None:
+    """Return ``(schema, table_name)`` of a ``CREATE TABLE`` statement without
+    parsing its body, or ``None`` for any other statement."""
+    header = _parse_header(statement, backslash_escapes)
+    if header is None:
+        return None
+    name_parts = header[0]
+    return (name_parts[-2] if len(name_parts) > 1 else None), name_parts[-1]
+
+
+def parse_create_table(
+    statement: str, *, backslash_escapes: bool = False
+) -> tuple[str, ParsedTable] | None:
+    """Parse a single ``CREATE TABLE`` statement into ``(table_name, metadata)``.
+
+    Returns ``None`` for any other statement, including ``CREATE TABLE ... AS``
+    and ``PARTITION OF`` forms which don't list their columns.
+    """
+    header = _parse_header(statement, backslash_escapes)
+    if header is None:
+        return None
+    name_parts, body_start = header
+    body = split_parenthesised(
+        statement, body_start, backslash_escapes=backslash_escapes
     )
+    if body is None:
+        return None
+
+    metadata = empty_table_metadata(name_parts[-2] if len(name_parts) > 1 else None)
+    for element in body[0]:
+        _parse_table_element(element, metadata, backslash_escapes)
+    return name_parts[-1], metadata
+
+
+def parse_create_index(
+    statement: str, *, backslash_escapes: bool = False
+) -> tuple[str, tuple[str | None, tuple[str, ...], bool]] | None:
+    """Parse a ``CREATE INDEX`` statement into ``(table_name, (name, columns, unique))``."""
+    if not CREATE_INDEX_PREFIX_REGEX.match(statement):
+        return None
+    tokens = list(tokenize(statement, backslash_escapes=backslash_escapes))
+    unique = False
+    index = 0
+    while index < len(tokens) and is_keyword(tokens[index], *INDEX_MODIFIER_KEYWORDS):
+        unique = unique or is_keyword(tokens[index], "UNIQUE")
+        index += 1
+    if index < len(tokens) and is_keyword(tokens[index], "IF"):  # IF NOT EXISTS
+        index += 3
+    index_name = None
+    if index < len(tokens) and not is_keyword(tokens[index], "ON"):
+        name_parts, index = _parse_name(tokens, index)
+        index_name = name_parts[-1] if name_parts else None
+    if index >= len(tokens) or not is_keyword(tokens[index], "ON"):
+        return None
+    index += 1
+    if index < len(tokens) and is_keyword(tokens[index], "ONLY"):
+        index += 1
+    table_parts, index = _parse_name(tokens, index)
+    while index < len(tokens) and not _is_punctuation(tokens[index], "("):
+        index += 1  # USING <method>
+    columns, _ = _parse_column_list(tokens, index)
+    if not table_parts:
+        return None
+    return table_parts[-1], (index_name, columns, unique)
 
-    for match in table_regex.finditer(sql_text):
-        schema = match.group(2)
-        table_name = match.group(3)
-        columns_section = match.group(4)
-        columns = []
 
-        col_defs = re.split(r",(?![^(]*\))", columns_section)
+def parse_alter_table(
+    statement: str, *, backslash_escapes: bool = False
+) -> tuple[str, ParsedTable] | None:
+    """Parse the constraints added by an ``ALTER TABLE ... ADD`` statement (as
+    emitted by ``pg_dump`` for keys) into ``(table_name, metadata)``, where only
+    the key and index entries of ``metadata`` are filled in."""
+    if not ALTER_TABLE_PREFIX_REGEX.match(statement):
+        return None
+    tokens = list(tokenize(statement, backslash_escapes=backslash_escapes))
+    index = 2
+    while index < len(tokens) and is_keyword(tokens[index], "ONLY", "IF", "EXISTS"):
+        index += 1
+    table_parts, index = _parse_name(tokens, index)
+    if not table_parts:
+        return None
+    actions: list[list[Token]] = [[]]
+    depth = 0
+    for token in tokens[index:]:
+        if _is_punctuation(token, "("):
+            depth += 1
+        elif _is_punctuation(token, ")"):
+            depth -= 1
+        elif _is_punctuation(token, ",") and depth == 0:
+            actions.append([])
+            continue
+        actions[-1].append(token)
 
-        for col_def in col_defs:
-            col_def = col_def.strip()
-            if re.match(CONSTRAINT_PREFIX_REGEX, col_def, re.IGNORECASE):
-                continue
+    metadata = empty_table_metadata()
+    found = False
+    for action in actions:
+        if len(action) < 2 or not is_keyword(action[0], "ADD"):
+            continue
+        if is_keyword(action[1], "CONSTRAINT", "PRIMARY", "FOREIGN", "UNIQUE"):
+            found = _parse_table_constraint(action[1:], metadata) or found
+    if not found:
+        return None
+    return table_parts[-1], metadata
 
-            parts = col_def.split()
-            if parts:
-                col_name = parts[0].strip('`[]"')
-                columns.append(col_name)
 
-        tables[table_name] = {
-            "schema": schema,
-            "columns": columns,
-        }
+def parse_ddl_statement(
+    statement: str, *, backslash_escapes: bool = False
+) -> DDLObject | None:
+    """Parse a statement into a ``(kind, table_name, payload)`` object.
 
+    ``kind`` is ``TABLE`` (payload: table metadata), ``INDEX`` (payload:
+    ``(name, columns, unique)``) or ``CONSTRAINT`` (payload: table metadata
+    holding only keys and indexes); other statements return ``None``.
+    """
+    for kind, parse in (
+        (TABLE, parse_create_table),
+        (INDEX, parse_create_index),
+        (CONSTRAINT, parse_alter_table),
+    ):
+        parsed = parse(statement, backslash_escapes=backslash_escapes)
+        if parsed is not None:
+            return kind, parsed[0], parsed[1]
+    return None
+
+
+def apply_ddl_object(metadata: ParsedTable, kind: str, payload: Any) -> ParsedTable:
+    """Return a copy of a table's ``metadata`` with an ``INDEX`` or
+    ``CONSTRAINT`` object applied."""
+    if kind == INDEX:
+        return {**metadata, "indexes": [*metadata["indexes"], payload]}
+    return {
+        **metadata,
+        "primary_key": payload["primary_key"] or metadata["primary_key"],
+        "unique": [*metadata["unique"], *payload["unique"]],
+        "foreign_keys": [*metadata["foreign_keys"], *payload["foreign_keys"]],
+        "indexes": [*metadata["indexes"], *payload["indexes"]],
+    }
+
+
+def collect_tables(objects: Iterable[DDLObject]) -> dict[str, ParsedTable]:
+    """Gather DDL objects into ``{table_name: metadata}``, applying indexes and
+    constraints to the tables they belong to (unknown tables are ignored)."""
+    tables = {}
+    attachments = []
+    for kind, table_name, payload in objects:
+        if kind == TABLE:
+            tables[table_name] = payload
+        else:
+            attachments.append((kind, table_name, payload))
+    for kind, table_name, payload in attachments:
+        if table_name in tables:
+            tables[table_name] = apply_ddl_object(tables[table_name], kind, payload)
     return tables
+
+
+def iter_ddl_objects(
+    chunks: Iterable[str], *, backslash_escapes: bool = False
+) -> Iterator[DDLObject]:
+    """Yield a ``(kind, table_name, payload)`` object for each ``CREATE TABLE``,
+    ``CREATE INDEX`` and ``ALTER TABLE ... ADD`` constraint statement as soon
+    as it has been read from ``chunks``."""
+    for statement in iter_statements(chunks, backslash_escapes=backslash_escapes):
+        parsed = parse_ddl_statement(statement, backslash_escapes=backslash_escapes)
+        if parsed is not None:
+            yield parsed
+
+
+def iter_create_tables(
+    chunks: Iterable[str], *, backslash_escapes: bool = False
+) -> Iterator[tuple[str, ParsedTable]]:
+    """Yield ``(table_name, metadata)`` for each ``CREATE TABLE`` statement as
+    soon as it has been read from ``chunks``.
+
+    Indexes and constraints declared by later statements aren't included; use
+    ``iter_ddl_objects`` and ``collect_tables`` for those.
+    """
+    for statement in iter_statements(chunks, backslash_escapes=backslash_escapes):
+        parsed = parse_create_table(statement, backslash_escapes=backslash_escapes)
+        if parsed is not None:
+            yield parsed
+
+
+def _read_chunks(path: Union[str, os.PathLike], chunk_size: int) -> Iterator[str]:
+    with open(path, "r") as f:
+        yield from iter(lambda: f.read(chunk_size), "")
+
+
+def iter_create_tables_from_file(
+    path: Union[str, os.PathLike],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backslash_escapes: bool = False,
+) -> Iterator[tuple[str, ParsedTable]]:
+    """Stream the ``CREATE TABLE`` statements of a DDL file, reading it in
+    ``chunk_size`` character chunks."""
+    yield from iter_create_tables(
+        _read_chunks(path, chunk_size), backslash_escapes=backslash_escapes
+    )
+
+
+def parse_create_tables(
+    sql_text: str, *, backslash_escapes: bool = False
+) -> dict[str, ParsedTable]:
+    return collect_tables(
+        iter_ddl_objects([sql_text], backslash_escapes=backslash_escapes)
+    )
+
+
+def parse_ddl_file(path: str, backslash_escapes: bool = False) -> list[DDLObject]:
+    return list(
+        iter_ddl_objects(
+            _read_chunks(path, DEFAULT_CHUNK_SIZE), backslash_escapes=backslash_escapes
+        )
+    )
+
+
+def parse_ddl_files(
+    paths: Iterable[str], *, backslash_escapes: bool = False, workers: int | None = 1
+) -> list[tuple[str, list[DDLObject]]]:
+    """Parse each DDL file, returning ``(path, objects)`` pairs in input order.
+
+    With ``workers`` other than 1 the files are parsed on a process pool
+    (``None`` uses one process per CPU); only the plain parsed metadata crosses
+    the process boundary.
+    """
+    paths = list(paths)
+    flags = [backslash_escapes] * len(paths)
+    if workers == 1 or len(paths) < 2:
+        return list(zip(paths, map(parse_ddl_file, paths, flags)))
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parsed = executor.map(parse_ddl_file, paths, flags, chunksize=chunksize)
+        return list(zip(paths, parsed))
@@ -0,0 +1,239 @@
+from typing import Iterable, Iterator, NamedTuple
+
+from pysqlscribe.regex_patterns import (
+    COPY_FROM_STDIN_REGEX,
+    STATEMENT_BOUNDARY_REGEX,
+    STRUCTURE_REGEX,
+    STRUCTURE_REGEX_BACKSLASH_ESCAPES,
+    TOKEN_REGEX,
+    TOKEN_REGEX_BACKSLASH_ESCAPES,
+)
+
+# how far back to re-scan after a chunk boundary, so that a `--`, `/*` or
+# `$tag$` split across two chunks is still recognised
+_RESCAN_WINDOW = 64
+
+IDENTIFIER = "identifier"
+QUOTED_IDENTIFIER = "quoted_identifier"
+STRING = "string"
+NUMBER = "number"
+PARAMETER = "parameter"
+PUNCTUATION = "punctuation"
+OPERATOR = "operator"
+
+_QUOTE_ENDS = {"'": "'", '"': '"', "`": "`"}
+_CLOSERS = {**_QUOTE_ENDS, "--": "\n", "/*": "*/"}
+_IDENTIFIER_QUOTES = {'"': '"', "`": "`", "[": "]"}
+
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+    start: int
+
+
+def _find_quote_end(
+    buffer: str, pos: int, quote: str, backslash_escapes: bool
+) -> tuple[int | None, int]:
+    """Scan a quoted literal whose body starts at ``pos``.
+
+    Returns ``(end, resume)``: ``end`` is the index just past the closing quote,
+    or ``None`` when the literal may continue beyond the end of ``buffer``, in
+    which case scanning should resume from ``resume`` once more text arrives.
+    """
+    while True:
+        end = buffer.find(quote, pos)
+        if backslash_escapes:
+            slash = buffer.find("\\", pos)
+            if slash != -1 and (end == -1 or slash < end):
+                if slash + 1 >= len(buffer):
+                    return None, slash
+                pos = slash + 2
+                continue
+        if end == -1:
+            return None, len(buffer)
+        if end + 1 >= len(buffer):
+            # a trailing quote could still be the first half of a doubled quote
+            return None, end
+        if buffer[end + 1] == quote:
+            pos = end + 2
+            continue
+        return end + 1, end + 1
+
+
+def _find_copy_end(buffer: str, pos: int, eof: bool) -> tuple[int | None, int]:
+    """Find the ``\\.`` line terminating a ``COPY ... FROM stdin`` data block.
+
+    Same return convention as ``_find_quote_end``.
+    """
+    while True:
+        marker = buffer.find("\\.", pos)
+        if marker == -1:
+            return (len(buffer), len(buffer)) if eof else (None, len(buffer) - 1)
+        if marker > 0 and buffer[marker - 1] == "\n":
+            after = marker + 2
+            if (
+                after >= len(buffer)
+                or buffer[after] == "\r"
+                and after + 1 >= len(buffer)
+            ):
+                if eof:
+                    return len(buffer), len(buffer)
+                return None, marker
+            if buffer[after] == "\n":
+                return after + 1, after + 1
+            if buffer.startswith("\r\n", after):
+                return after + 2, after + 2
+        pos = marker + 2
+
+
+def iter_statements(
+    chunks: Iterable[str], *, backslash_escapes: bool = False
+) -> Iterator[str]:
+    """Split SQL text supplied in chunks into statements, yielding each one as
+    soon as its terminating ``;`` has been read.
+
+    See ``iter_statements_with_offsets`` for the rules used to find statement
+    boundaries.
+    """
+    for _, statement in iter_statements_with_offsets(
+        chunks, backslash_escapes=backslash_escapes
+    ):
+        yield statement
+
+
+def iter_statements_with_offsets(
+    chunks: Iterable[str], *, backslash_escapes: bool = False
+) -> Iterator[tuple[int, str]]:
+    """Like ``iter_statements``, but yield ``(offset, statement)`` pairs where
+    ``offset`` is the position of the statement's first character in the
+    concatenated input.
+
+    Semicolons inside string literals, quoted identifiers, comments and
+    Postgres dollar-quoted bodies are ignored, and the data block following a
+    ``COPY ... FROM stdin`` statement (as emitted by ``pg_dump``) is skipped.
+    Only the statement currently being read is buffered, so memory is bounded
+    by the largest single statement rather than by the size of the input.
+    """
+    source = iter(chunks)
+    buffer = ""
+    # number of characters already dropped from the front of the buffer
+    consumed = 0
+    start = pos = 0
+    eof = False
+    # (opening token, closing text) of the literal/comment/COPY block being read
+    inside: tuple[str, str] | None = None
+
+    while True:
+        if inside is None:
+            match = STATEMENT_BOUNDARY_REGEX.search(buffer, pos)
+            if match is None:
+                pos = max(pos, len(buffer) - _RESCAN_WINDOW)
+            elif match.group() == ";":
+                statement = buffer[start : match.start()]
+                offset = consumed + start
+                start = pos = match.end()
+                if statement.strip():
+                    if COPY_FROM_STDIN_REGEX.match(statement):
+                        inside = ("COPY", "\\.")
+                    yield offset, statement
+                continue
+            else:
+                token = match.group()
+                inside = (token, _CLOSERS.get(token, token))
+                pos = match.end()
+                continue
+        else:
+            opener, closer = inside
+            if opener == "COPY":
+                end, resume = _find_copy_end(buffer, pos, eof)
+                if end is not None:
+                    # the data block is not part of any statement
+                    start = end
+            elif opener in _QUOTE_ENDS:
+                end, resume = _find_quote_end(buffer, pos, closer, backslash_escapes)
+            else:
+                found = buffer.find(closer, pos)
+                if found == -1:
+                    end, resume = None, max(pos, len(buffer) - len(closer) + 1)
+                else:
+                    end = resume = found + len(closer)
+            pos = resume
+            if end is not None:
+                inside = None
+                continue
+            if opener == "COPY":
+                # keep one character so the line-start check still works
+                start = max(start, pos - 1)
+        if eof:
+            break
+        chunk = next(source, None)
+        if chunk is None:
+            eof = True
+            continue
+        if start:
+            buffer = buffer[start:]
+            consumed += start
+            pos -= start
+            start = 0
+        buffer += chunk
+
+    if inside is None or inside[0] != "COPY":
+        remainder = buffer[start:]
+        if remainder.strip():
+            yield consumed + start, remainder
+
+
+def unquote_identifier(identifier: str) -> str:
+    closer = _IDENTIFIER_QUOTES.get(identifier[0])
+    if closer is None:
+        return identifier
+    return identifier[1:-1].replace(closer * 2, closer)
+
+
+def tokenize(statement: str, *, backslash_escapes: bool = False) -> Iterator[Token]:
+    """Yield the significant tokens of ``statement``, skipping whitespace and comments.
+
+    Quoted identifiers are yielded unquoted; string literals keep their quotes.
+    """
+    regex = TOKEN_REGEX_BACKSLASH_ESCAPES if backslash_escapes else TOKEN_REGEX
+    for match in regex.finditer(statement):
+        kind = match.lastgroup
+        if kind in ("whitespace", "comment"):
+            continue
+        value = match.group()
+        if kind == QUOTED_IDENTIFIER:
+            value = unquote_identifier(value)
+        yield Token(kind, value, match.start())
+
+
+def split_parenthesised(
+    text: str, start: int, *, backslash_escapes: bool = False
+) -> tuple[list[str], int] | None:
+    """Split the parenthesised list opening at ``text[start]`` at its top-level
+    commas.
+
+    Returns the text of each element and the index just past the closing
+    parenthesis, or ``None`` when the parentheses are unbalanced.
+    """
+    regex = STRUCTURE_REGEX_BACKSLASH_ESCAPES if backslash_escapes else STRUCTURE_REGEX
+    elements = []
+    element_start = start + 1
+    depth = 0
+    for match in regex.finditer(text, start):
+        value = match.group()
+        if value == "(":
+            depth += 1
+        elif value == ")":
+            depth -= 1
+            if depth == 0:
+                elements.append(text[element_start : match.start()])
+                return elements, match.end()
+        elif value == "," and depth == 1:
+            elements.append(text[element_start : match.start()])
+            element_start = match.end()
+    return None
+
+
+def is_keyword(token: Token, *keywords: str) -> bool:
+    return token.kind == IDENTIFIER and token.value.upper() in keywords
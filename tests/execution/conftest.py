@@ -0,0 +1,26 @@
+import sqlite3
+
+import pytest
+
+
+class TracedConnection(sqlite3.Connection):
+    """SQLite connection that records every statement it sends to the engine."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements: list[str] = []
+        self.set_trace_callback(self.statements.append)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", factory=TracedConnection)
+    conn.execute("CREATE TABLE users (id INTEGER, name TEXT, team TEXT)")
+    conn.executemany(
+        "INSERT INTO users VALUES (?, ?, ?)",
+        [(1, "Alice", "red"), (2, "Bob", "blue"), (3, "Carol", "red")],
+    )
+    conn.commit()
+    conn.statements.clear()
+    yield conn
+    conn.close()
@@ -0,0 +1,226 @@
+import sqlite3
+
+import pytest
+
+from pysqlscribe.execution.batch import (
+    CLIENT_MULTI_STATEMENTS,
+    MultiStatementStrategy,
+    PipelineStrategy,
+    ScriptStrategy,
+    SequentialStrategy,
+    Statement,
+    choose_strategy,
+    execute_batch,
+)
+from pysqlscribe.table import Table
+
+
+def users():
+    return Table("users", "id", "name", "team", dialect="sqlite")
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+        self.rowcount = -1
+        self._sets = []
+
+    def execute(self, sql, params=None):
+        self.connection.executed.append((sql, params))
+        self._sets = list(self.connection.result_sets)
+        self._load()
+
+    def _load(self):
+        columns, rows = self._sets.pop(0)
+        self.description = [(c,) for c in columns] if columns else None
+        self._rows = rows
+        self.rowcount = len(rows) if columns else 1
+
+    def fetchall(self):
+        return self._rows
+
+    def nextset(self):
+        self._load()
+        return True
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, result_sets=(), client_flag=0):
+        self.result_sets = list(result_sets)
+        self.client_flag = client_flag
+        self.executed = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_statement_detects_result_sets():
+    assert Statement("SELECT 1").returns_rows
+    assert Statement("  (SELECT 1) UNION (SELECT 2)").returns_rows
+    assert Statement("DELETE FROM t WHERE id = 1 RETURNING id").returns_rows
+    assert not Statement("UPDATE t SET x = 1").returns_rows
+
+
+def test_sqlite_script_strategy_groups_dml(conn):
+    reader = users()
+    result = execute_batch(
+        conn,
+        [
+            "INSERT INTO users VALUES (4, 'Dan', 'blue')",
+            ("UPDATE users SET team = 'green' WHERE id = ?", [1]),
+            reader.select("name").where(reader.team == "blue"),
+            "DELETE FROM users WHERE id = 3",
+            "INSERT INTO users VALUES (5, 'Eve', 'red')",
+        ],
+    )
+    assert result.strategy == "script"
+    assert len(result) == 5
+    assert sorted(result[2].rows) == [("Bob",), ("Dan",)]
+    # the parameterized UPDATE can't go into a script, so it runs on its own
+    assert result.round_trips == 4
+    assert result.round_trips_saved == 1
+    names = conn.execute("SELECT name FROM users ORDER BY id").fetchall()
+    assert names == [("Alice",), ("Bob",), ("Dan",), ("Eve",)]
+
+
+def test_consecutive_dml_shares_one_sqlite_script(conn):
+    result = execute_batch(
+        conn,
+        ["UPDATE users SET team = 'x'", "DELETE FROM users WHERE id = 1"],
+        strategy="script",
+    )
+    assert result.round_trips == 1
+
+
+def test_failing_script_is_rolled_back(conn):
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        execute_batch(
+            conn,
+            ["UPDATE users SET name = 'Zed'", "DELETE FROM missing_table"],
+            strategy="script",
+        )
+    assert not conn.in_transaction
+    assert conn.execute("SELECT name FROM users WHERE id = 1").fetchone() == ("Alice",)
+
+
+def test_sequential_strategy_runs_in_one_transaction(conn):
+    reader = users()
+    result = execute_batch(
+        conn,
+        [
+            ("UPDATE users SET name = ? WHERE id = ?", ["Alicia", 1]),
+            reader.select("name").where(reader.id == 1),
+        ],
+        strategy="sequential",
+    )
+    assert result[0].rowcount == 1
+    assert result[1].columns == ["name"]
+    assert result[1].rows == [("Alicia",)]
+    assert result.round_trips_saved == 0
+
+
+def test_sequential_strategy_rolls_back_on_failure(conn):
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        execute_batch(
+            conn,
+            ["UPDATE users SET name = 'Zed'", "SELECT * FROM missing_table"],
+            strategy=SequentialStrategy(),
+        )
+    assert conn.execute("SELECT name FROM users WHERE id = 1").fetchone() == ("Alice",)
+
+
+def test_multi_statement_joins_sql_and_params():
+    reader = Table("users", "id", "name", dialect="mysql")
+    connection = FakeConnection(
+        result_sets=[(None, []), (["name"], [("Alice",)])],
+        client_flag=CLIENT_MULTI_STATEMENTS,
+    )
+    result = execute_batch(
+        connection,
+        [
+            ("UPDATE users SET name = %s WHERE id = %s", ["Al", 1]),
+            reader.select("name").where(reader.id == 1),
+        ],
+    )
+    assert result.strategy == "multi_statement"
+    assert connection.executed == [
+        (
+            (
+                "UPDATE users SET name = %s WHERE id = %s; "
+                "SELECT `name` FROM `users` WHERE users.id = %s"
+            ),
+            ["Al", 1, 1],
+        )
+    ]
+    assert result[0].rowcount == 1
+    assert result[1].rows == [("Alice",)]
+    assert result.round_trips == 1
+    assert connection.commits == 1
+
+
+def test_multi_statement_rejects_named_params():
+    reader = Table("users", "id", "name", dialect="mysql").placeholder_style("pyformat")
+    connection = FakeConnection(client_flag=CLIENT_MULTI_STATEMENTS)
+    with pytest.raises(ValueError, match="positional params"):
+        execute_batch(
+            connection,
+            [
+                (
+                    "UPDATE users SET name = %(p1)s WHERE id = %(p2)s",
+                    {"p1": "Al", "p2": 1},
+                ),
+                reader.select("name").where(reader.id == 1),
+            ],
+        )
+    assert connection.executed == []
+
+
+def test_pipeline_strategy_uses_driver_pipeline():
+    class PipelineConnection(FakeConnection):
+        pipelines = 0
+
+        def pipeline(self):
+            connection = self
+
+            class _Pipeline:
+                def __enter__(self):
+                    connection.pipelines += 1
+
+                def __exit__(self, *exc_info):
+                    return False
+
+            return _Pipeline()
+
+    connection = PipelineConnection(result_sets=[(None, [])])
+    result = execute_batch(connection, ["UPDATE a SET x = 1", "UPDATE b SET y = 2"])
+    assert result.strategy == "pipeline"
+    assert connection.pipelines == 1
+    assert len(connection.executed) == 2
+    assert result.round_trips_saved == 1
+
+
+def test_choose_strategy_falls_back_to_sequential(conn):
+    assert isinstance(choose_strategy(conn), ScriptStrategy)
+    assert isinstance(choose_strategy(FakeConnection()), SequentialStrategy)
+    assert isinstance(
+        choose_strategy(FakeConnection(client_flag=CLIENT_MULTI_STATEMENTS)),
+        MultiStatementStrategy,
+    )
+    assert PipelineStrategy.name == "pipeline"
+
+
+def test_unknown_strategy_rejected(conn):
+    with pytest.raises(ValueError):
+        execute_batch(conn, ["SELECT 1"], strategy="telepathy")
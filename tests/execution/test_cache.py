@@ -0,0 +1,137 @@
+import sqlite3
+
+import pytest
+
+from pysqlscribe.execution.cache import (
+    ANY_TABLE,
+    ResultCache,
+    SQLiteResultCache,
+    referenced_tables,
+)
+from pysqlscribe.cte import with_
+from pysqlscribe.query import Query
+from pysqlscribe.table import Table
+
+
+@pytest.fixture
+def users():
+    return Table("users", "id", "name", "team", dialect="sqlite")
+
+
+def test_referenced_tables_walks_joins_subqueries_and_unions():
+    users = Table("users", "id", "team_id", dialect="sqlite")
+    teams = Table("teams", "id", "org_id", dialect="sqlite", schema="hr")
+    orgs = Table("orgs", "id", dialect="sqlite")
+    archived = Query("sqlite").select("id").from_("archived_users AS a")
+    query = (
+        users.select("id")
+        .join(teams, condition=users.team_id == teams.id)
+        .where(teams.org_id.in_(orgs.select("id")))
+        .union(archived)
+    )
+    assert referenced_tables(query) == {"users", "teams", "orgs", "archived_users"}
+
+
+def test_raw_subquery_marks_any_table():
+    query = Query("sqlite").select("*").from_("(SELECT 1) AS t")
+    assert ANY_TABLE in referenced_tables(query)
+
+
+def test_raw_conditions_and_cte_bodies_mark_any_table():
+    users = Table("users", "id", dialect="sqlite")
+    query = users.select("id").where("id IN (SELECT user_id FROM bans)")
+    assert ANY_TABLE in referenced_tables(query)
+    teams = Table("teams", "id", dialect="sqlite")
+    query = (
+        Table("users", "id", dialect="sqlite")
+        .select("id")
+        .join(teams, condition="users.id = (SELECT MAX(id) FROM archived_teams)")
+    )
+    assert ANY_TABLE in referenced_tables(query)
+    query = (
+        with_("recent", "sqlite")
+        .as_("SELECT id FROM orders")
+        .select("id")
+        .from_("recent")
+    )
+    assert ANY_TABLE in referenced_tables(query)
+
+
+def test_repeated_query_is_served_from_cache(conn, users):
+    cache = ResultCache()
+    first = cache.execute(conn, users.select("name").where(users.id == 1))
+    second = cache.execute(conn, users.select("name").where(users.id == 1))
+    assert first == second == (["name"], [("Alice",)])
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(conn.statements) == 1
+
+
+def test_different_params_are_cached_separately(conn, users):
+    cache = ResultCache()
+    cache.execute(conn, users.select("name").where(users.id == 1))
+    _, rows = cache.execute(conn, users.select("name").where(users.id == 2))
+    assert rows == [("Bob",)]
+    assert len(cache) == 2
+
+
+def test_invalidate_drops_dependent_entries_only(conn, users):
+    teams = Table("teams", "id", dialect="sqlite")
+    conn.execute("CREATE TABLE teams (id INTEGER)")
+    cache = ResultCache()
+    cache.execute(conn, users.select("name"))
+    cache.execute(conn, teams.select("id"))
+    conn.execute("UPDATE users SET name = 'Alicia' WHERE id = 1")
+    cache.invalidate("main.USERS")
+    assert len(cache) == 1
+    _, rows = cache.execute(conn, users.select("name").where(users.id == 1))
+    assert rows == [("Alicia",)]
+
+
+def test_result_fetched_during_invalidation_is_not_stored(conn, users):
+    cache = ResultCache()
+
+    class InvalidatingConnection:
+        def cursor(self):
+            cache.invalidate("users")
+            return conn.cursor()
+
+    cache.execute(InvalidatingConnection(), users.select("name"))
+    assert len(cache) == 0
+
+
+def test_lru_eviction(conn, users):
+    cache = ResultCache(maxsize=2)
+    for key in (1, 2, 1, 3):
+        cache.execute(conn, users.select("name").where(users.id == key))
+    assert len(cache) == 2
+    cache.execute(conn, users.select("name").where(users.id == 1))
+    assert cache.hits == 2
+
+
+def test_ttl_expiry(conn, users):
+    now = [0.0]
+    cache = ResultCache(ttl=10, clock=lambda: now[0])
+    cache.execute(conn, users.select("name"))
+    now[0] = 5
+    cache.execute(conn, users.select("name"))
+    now[0] = 11
+    cache.execute(conn, users.select("name"))
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_sqlite_data_version_detects_other_connections(tmp_path, users):
+    path = tmp_path / "app.db"
+    reader = sqlite3.connect(path)
+    writer = sqlite3.connect(path)
+    writer.execute("CREATE TABLE users (id INTEGER, name TEXT, team TEXT)")
+    writer.execute("INSERT INTO users VALUES (1, 'Alice', 'red')")
+    writer.commit()
+    cache = SQLiteResultCache()
+    assert cache.execute(reader, users.select("name"))[1] == [("Alice",)]
+    writer.execute("UPDATE users SET name = 'Alicia'")
+    writer.commit()
+    assert cache.execute(reader, users.select("name"))[1] == [("Alicia",)]
+    assert cache.misses == 2
+    cache.forget(reader)
+    reader.close()
+    writer.close()
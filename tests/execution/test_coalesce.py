@@ -0,0 +1,96 @@
+import pytest
+
+from pysqlscribe.exceptions import IncompatibleQueriesError
+from pysqlscribe.execution.coalesce import coalesce
+from pysqlscribe.query import Query
+from pysqlscribe.table import Table
+
+
+def users():
+    return Table("users", "id", "name", "team", dialect="sqlite")
+
+
+def test_queries_render_as_one_union_all():
+    by_id, by_team = users(), users()
+    coalesced = coalesce(
+        by_id.select("name").where(by_id.id == 1),
+        by_team.select("name").where(by_team.team == "red"),
+    )
+    sql, params = coalesced.build(parameterize=True)
+    assert sql == (
+        'SELECT 0 AS query_index, "name" FROM "users" WHERE users.id = ? '
+        'UNION ALL SELECT 1 AS query_index, "name" FROM "users" WHERE users.team = ?'
+    )
+    assert params == [1, "red"]
+
+
+def test_execute_splits_rows_per_query(conn):
+    red, bob, nobody = users(), users(), users()
+    coalesced = coalesce(
+        red.select("name").where(red.team == "red"),
+        bob.select("name").where(bob.id == 2),
+        nobody.select("name").where(nobody.id == 99),
+    )
+    red_rows, bob_rows, nobody_rows = coalesced.execute(conn)
+    assert sorted(red_rows) == [("Alice",), ("Carol",)]
+    assert bob_rows == [("Bob",)]
+    assert nobody_rows == []
+    assert len(conn.statements) == 1
+    assert coalesced.round_trips_saved == 2
+
+
+def test_source_queries_are_cleared_unless_requested():
+    kept = Query("postgres").select("id").from_("a")
+    consumed = Query("postgres").select("id").from_("b")
+    coalesce(kept, Query("postgres").select("id").from_("b"), clear=False).build()
+    coalesce(consumed, Query("postgres").select("id").from_("c")).build()
+    assert kept.build() == 'SELECT "id" FROM "a"'
+    assert consumed.node is None
+
+
+def test_later_where_on_a_source_leaves_the_branch_alone():
+    source = users()
+    source.select("name").where(source.id == 1)
+    coalesced = coalesce(source, users().select("name"), clear=False)
+    before = coalesced.build()
+    source.where(source.team == "red")
+    assert coalesced.build() == before
+    assert "red" not in before
+
+
+def test_branches_do_not_reuse_the_source_fingerprints():
+    def sources():
+        return (
+            Query("postgres").select("id").from_("a"),
+            Query("postgres").select("id").from_("b"),
+        )
+
+    fingerprinted = sources()
+    for query in fingerprinted:
+        query.fingerprint()
+    combined = coalesce(*fingerprinted, clear=False)._combined
+    assert combined.fingerprint() == coalesce(*sources())._combined.fingerprint()
+    assert combined.fingerprint() != fingerprinted[0].fingerprint()
+
+
+def test_select_star_expands_table_columns():
+    sql = coalesce(users().select(), users().select()).build()
+    assert sql.startswith('SELECT 0 AS query_index, "id", "name", "team" FROM')
+
+
+def test_mismatched_projection_widths_rejected():
+    with pytest.raises(IncompatibleQueriesError):
+        coalesce(users().select("id"), users().select("id", "name"))
+
+
+def test_mixed_dialects_rejected():
+    with pytest.raises(IncompatibleQueriesError):
+        coalesce(
+            Query("mysql").select("id").from_("a"),
+            Query("sqlite").select("id").from_("b"),
+        )
+
+
+def test_limit_in_branch_rejected():
+    with pytest.raises(IncompatibleQueriesError):
+        coalesce(users().select("id").limit(5))
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from pysqlscribe.execution.loader import KeyLoader
+from pysqlscribe.table import Table
+
+
+@pytest.fixture
+def users():
+    return Table("users", "id", "name", "team", dialect="sqlite")
+
+
+def test_batch_scope_issues_single_in_query(conn, users):
+    loader = KeyLoader(users, "id", conn)
+    with loader.batch():
+        alice = loader.defer(1)
+        carol = loader.defer(3)
+        missing = loader.defer(42)
+    assert alice.result() == {"id": 1, "name": "Alice", "team": "red"}
+    assert carol.result()["name"] == "Carol"
+    assert missing.result() is None
+    assert len(conn.statements) == 1
+    assert conn.statements[0].endswith("IN (1, 3, 42)")
+
+
+def test_duplicate_keys_are_fetched_once(conn, users):
+    loader = KeyLoader(users, users.id, conn)
+    assert [row["name"] for row in loader.load_many([2, 2, 1])] == [
+        "Bob",
+        "Bob",
+        "Alice",
+    ]
+    assert conn.statements[0].endswith("IN (2, 1)")
+
+
+def test_cached_keys_skip_the_database(conn, users):
+    loader = KeyLoader(users, "id", conn)
+    loader.load(1)
+    loader.load(1)
+    loader.load(42)
+    loader.load(42)
+    assert len(conn.statements) == 2
+    loader.clear(1)
+    loader.load(1)
+    assert len(conn.statements) == 3
+
+
+def test_prime_seeds_cache(conn, users):
+    loader = KeyLoader(users, "id", conn)
+    loader.prime(7, {"id": 7, "name": "Primed"})
+    assert loader.load(7)["name"] == "Primed"
+    assert conn.statements == []
+
+
+def test_non_unique_key_fans_out_lists(conn, users):
+    loader = KeyLoader(users, "team", conn, columns=["name"], unique=False)
+    red, green = loader.load_many(["red", "green"])
+    assert sorted(row["name"] for row in red) == ["Alice", "Carol"]
+    assert green == []
+    assert 'SELECT "name", "team"' in conn.statements[0]
+
+
+def test_max_batch_size_chunks_in_lists(conn, users):
+    loader = KeyLoader(users, "id", conn, max_batch_size=2)
+    rows = loader.load_many([1, 2, 3])
+    assert [row["id"] for row in rows] == [1, 2, 3]
+    assert len(conn.statements) == 2
+
+
+def test_errors_propagate_to_every_lookup(conn, users):
+    loader = KeyLoader(users, "id", conn)
+    with loader.batch():
+        good = loader.defer(1)
+        bad = loader.defer("mixed")
+    with pytest.raises(NotImplementedError):
+        good.result()
+    with pytest.raises(NotImplementedError):
+        bad.result()
+
+
+def test_aload_coalesces_lookups_within_one_tick(conn, users):
+    loader = KeyLoader(users, "id", conn)
+
+    async def resolve():
+        return await asyncio.gather(loader.aload(1), loader.aload(2), loader.aload(9))
+
+    alice, bob, missing = asyncio.run(resolve())
+    assert (alice["name"], bob["name"], missing) == ("Alice", "Bob", None)
+    assert len(conn.statements) == 1
+
+
+def test_invalid_batch_size():
+    users = Table("users", "id", dialect="sqlite")
+    with pytest.raises(ValueError):
+        KeyLoader(users, "id", None, max_batch_size=0)
+
+
+def test_fetch_leaves_a_query_in_progress_on_the_table(conn, users):
+    loader = KeyLoader(users, "id", conn)
+    users.select("name").where(users.team == "red")
+    assert loader.load(2)["name"] == "Bob"
+    assert users.build() == """SELECT "name" FROM "users" WHERE users.team = 'red'"""
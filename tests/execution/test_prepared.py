@@ -0,0 +1,166 @@
+import gc
+import threading
+
+import pytest
+
+from pysqlscribe.execution.prepared import PreparedStatementManager
+from pysqlscribe.table import Table
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = None
+
+    def execute(self, sql, params=None):
+        self.connection.executed.append((sql, params))
+        if sql.startswith("EXECUTE"):
+            self.description = [("id",)]
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def orders_query(tenant, amount, dialect="postgres"):
+    orders = Table("orders", "id", "tenant_id", "amount", dialect=dialect)
+    return orders.select("id").where(
+        orders.tenant_id == tenant, orders.amount > amount, orders.id != tenant
+    )
+
+
+def test_postgres_prepares_once_and_executes_by_name():
+    connection = FakeConnection()
+    manager = PreparedStatementManager()
+    assert manager.execute(connection, orders_query(7, 100)) == (["id"], [(1,)])
+    manager.execute(connection, orders_query(8, 250))
+    (name,) = manager.prepared(connection)
+    assert connection.executed == [
+        (
+            (
+                f'PREPARE {name} AS SELECT "id" FROM "orders" WHERE '
+                "orders.tenant_id = $1 AND orders.amount > $2 AND orders.id <> $1"
+            ),
+            None,
+        ),
+        (f"EXECUTE {name}(%s, %s)", [7, 100]),
+        (f"EXECUTE {name}(%s, %s)", [8, 250]),
+    ]
+    assert (manager.hits, manager.misses) == (1, 1)
+
+
+def test_mysql_sets_user_variables_and_quotes_the_statement():
+    connection = FakeConnection()
+    manager = PreparedStatementManager()
+    orders = Table("orders", "id", "sku", dialect="mysql")
+    manager.execute(
+        connection, orders.select("id").where(orders.sku == "it's", orders.id != 3)
+    )
+    manager.execute(connection, orders_query(7, 100, dialect="mysql"))
+    first, second = manager.prepared(connection)
+    assert connection.executed[:3] == [
+        (
+            (
+                f"PREPARE {first} FROM 'SELECT `id` FROM `orders` WHERE "
+                "orders.sku = ? AND orders.id <> ?'"
+            ),
+            None,
+        ),
+        (f"SET @{first}_1 = %s, @{first}_2 = %s", ["it's", 3]),
+        (f"EXECUTE {first} USING @{first}_1, @{first}_2", None),
+    ]
+    assert connection.executed[-2:] == [
+        (f"SET @{second}_1 = %s, @{second}_2 = %s", [7, 100]),
+        (f"EXECUTE {second} USING @{second}_1, @{second}_2, @{second}_1", None),
+    ]
+
+
+def test_least_recently_used_statement_is_deallocated_per_connection():
+    connection, other = FakeConnection(), FakeConnection()
+    manager = PreparedStatementManager(max_statements=2)
+
+    def query(operator):
+        orders = Table("orders", "id", "amount", dialect="postgres")
+        return orders.select("id").where(operator(orders.amount, 1))
+
+    manager.execute(connection, query(lambda a, b: a > b))
+    manager.execute(connection, query(lambda a, b: a < b))
+    greater, less = manager.prepared(connection)
+    manager.execute(connection, query(lambda a, b: a > b))
+    manager.execute(connection, query(lambda a, b: a == b))
+    assert (f"DEALLOCATE {less}", None) in connection.executed
+    first, equal = manager.prepared(connection)
+    assert first == greater
+
+    assert manager.prepared(other) == []
+    manager.execute(other, query(lambda a, b: a < b))
+    assert manager.prepared(other) == [less]
+
+    manager.deallocate(connection)
+    assert connection.executed[-2:] == [
+        (f"DEALLOCATE {greater}", None),
+        (f"DEALLOCATE {equal}", None),
+    ]
+    assert manager.prepared(connection) == []
+    manager.forget(other)
+    assert manager.prepared(other) == []
+
+
+def test_connections_are_tracked_weakly_and_failed_prepares_forgotten():
+    class FailingCursor(FakeCursor):
+        def execute(self, sql, params=None):
+            if sql.startswith("PREPARE"):
+                raise RuntimeError("server went away")
+            super().execute(sql, params)
+
+    class FailingConnection(FakeConnection):
+        def cursor(self):
+            return FailingCursor(self)
+
+    manager = PreparedStatementManager()
+    failing = FailingConnection()
+    with pytest.raises(RuntimeError):
+        manager.execute(failing, orders_query(7, 100))
+    assert manager.prepared(failing) == []
+
+    connection = FakeConnection()
+    manager.execute(connection, orders_query(7, 100))
+    assert len(manager._statements) == 2
+    del connection, failing
+    gc.collect()
+    assert len(manager._statements) == 0
+
+
+def test_counters_are_consistent_across_threads():
+    manager = PreparedStatementManager()
+    connections = [FakeConnection() for _ in range(8)]
+
+    def worker(connection):
+        for value in range(50):
+            manager.execute(connection, orders_query(value, value))
+
+    threads = [threading.Thread(target=worker, args=(c,)) for c in connections]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert (manager.hits, manager.misses) == (8 * 49, 8)
+    assert all(len(manager.prepared(c)) == 1 for c in connections)
+
+
+def test_unsupported_dialect_is_rejected():
+    users = Table("users", "id", dialect="sqlite")
+    with pytest.raises(ValueError, match="not supported for SQLiteDialect"):
+        PreparedStatementManager().execute(FakeConnection(), users.select("id"))
+    with pytest.raises(ValueError, match="max_statements"):
+        PreparedStatementManager(max_statements=0)
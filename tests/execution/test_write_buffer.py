@@ -0,0 +1,228 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from pysqlscribe.dialects.base import DialectRegistry
+from pysqlscribe.exceptions import InvalidColumnsError
+from pysqlscribe.execution.write_buffer import WriteBuffer
+from pysqlscribe.params import ParamCollector
+from pysqlscribe.table import Table
+
+
+@pytest.fixture
+def metrics_conn():
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.execute("CREATE TABLE metrics (host TEXT PRIMARY KEY, hits INTEGER, tag TEXT)")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def metrics():
+    return Table("metrics", "host", "hits", "tag", dialect="sqlite")
+
+
+def test_rows_flush_in_chunked_multi_row_inserts(metrics_conn, metrics):
+    buffer = WriteBuffer(metrics, metrics_conn, max_delay=None, chunk_size=2)
+    for i in range(5):
+        buffer.add({"host": f"h{i}", "hits": i, "tag": "x"})
+    assert buffer.flush() == 5
+    assert buffer.statements_executed == 3
+    assert metrics_conn.execute("SELECT COUNT(*) FROM metrics").fetchone() == (5,)
+    buffer.close()
+
+
+def test_size_threshold_triggers_flush(metrics_conn, metrics):
+    buffer = WriteBuffer(metrics, metrics_conn, max_rows=3, max_delay=None)
+    for i in range(4):
+        buffer.add({"host": f"h{i}", "hits": i})
+    assert buffer.rows_written == 3
+    assert len(buffer) == 1
+    buffer.close()
+    assert buffer.rows_written == 4
+
+
+def test_time_threshold_triggers_background_flush(metrics_conn, metrics):
+    buffer = WriteBuffer(metrics, metrics_conn, max_delay=0.05)
+    buffer.add({"host": "h", "hits": 1})
+    deadline = time.monotonic() + 2
+    while buffer.rows_written == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert buffer.rows_written == 1
+    buffer.close()
+
+
+def test_increments_merge_into_one_upsert(metrics_conn, metrics):
+    with WriteBuffer(
+        metrics, metrics_conn, max_delay=None, key=["host"], increments=["hits"]
+    ) as buffer:
+        buffer.add({"host": "a", "hits": 1, "tag": "old"})
+        buffer.add({"host": "a", "hits": 2, "tag": "new"})
+        buffer.add({"host": "b", "hits": 5, "tag": "x"})
+        assert len(buffer) == 2
+        buffer.flush()
+        buffer.add({"host": "a", "hits": 10, "tag": "newer"})
+    rows = metrics_conn.execute("SELECT * FROM metrics ORDER BY host").fetchall()
+    assert rows == [("a", 13, "newer"), ("b", 5, "x")]
+    assert buffer.statements_executed == 2
+
+
+def test_concurrent_adds_are_all_written(metrics_conn, metrics):
+    buffer = WriteBuffer(metrics, metrics_conn, max_rows=50, max_delay=None)
+
+    def worker(n):
+        for i in range(100):
+            buffer.add({"host": f"{n}-{i}", "hits": 1})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    buffer.close()
+    assert metrics_conn.execute("SELECT COUNT(*) FROM metrics").fetchone() == (800,)
+
+
+def test_failed_flush_keeps_rows_for_the_next_one(metrics):
+    conn = sqlite3.connect(":memory:")
+    buffer = WriteBuffer(
+        metrics, conn, max_delay=None, key=["host"], increments=["hits"]
+    )
+    buffer.add({"host": "a", "hits": 1})
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        buffer.flush()
+    assert len(buffer) == 1
+    buffer.add({"host": "a", "hits": 2})
+    conn.execute("CREATE TABLE metrics (host TEXT PRIMARY KEY, hits INTEGER, tag TEXT)")
+    assert buffer.flush() == 1
+    assert conn.execute("SELECT host, hits FROM metrics").fetchall() == [("a", 3)]
+    buffer.close()
+    conn.close()
+
+
+def test_rows_beyond_max_pending_are_dropped_oldest_first(metrics):
+    conn = sqlite3.connect(":memory:")
+    buffer = WriteBuffer(metrics, conn, max_rows=2, max_delay=None, max_pending=3)
+    buffer.add({"host": "a"})
+    with pytest.raises(sqlite3.OperationalError):
+        buffer.add({"host": "b"})
+    with pytest.raises(sqlite3.OperationalError):
+        buffer.add({"host": "c"})
+    with pytest.raises(sqlite3.OperationalError):
+        buffer.add({"host": "d"})
+    assert (len(buffer), buffer.rows_dropped) == (3, 1)
+    conn.execute("CREATE TABLE metrics (host TEXT PRIMARY KEY, hits INTEGER, tag TEXT)")
+    buffer.close()
+    assert conn.execute("SELECT host FROM metrics").fetchall() == [
+        ("b",),
+        ("c",),
+        ("d",),
+    ]
+    conn.close()
+
+
+def test_background_flush_error_is_raised_by_the_next_call(metrics):
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    buffer = WriteBuffer(metrics, conn, max_delay=0.05)
+    buffer.add({"host": "a"})
+    deadline = time.monotonic() + 2
+    while buffer._error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    conn.execute("CREATE TABLE metrics (host TEXT PRIMARY KEY, hits INTEGER, tag TEXT)")
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        buffer.add({"host": "b"})
+    buffer.close()
+    assert conn.execute("SELECT COUNT(*) FROM metrics").fetchone() == (1,)
+    conn.close()
+
+
+def test_close_retries_rows_of_a_failed_background_flush(metrics):
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    buffer = WriteBuffer(metrics, conn, max_delay=0.05)
+    buffer.add({"host": "a"})
+    deadline = time.monotonic() + 2
+    while buffer._error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    conn.execute("CREATE TABLE metrics (host TEXT PRIMARY KEY, hits INTEGER, tag TEXT)")
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        buffer.close()
+    assert conn.execute("SELECT host FROM metrics").fetchall() == [("a",)]
+    buffer.close()
+    conn.close()
+
+
+def test_close_chains_a_failed_retry_to_the_background_error(metrics):
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    buffer = WriteBuffer(metrics, conn, max_delay=0.05)
+    buffer.add({"host": "a"})
+    deadline = time.monotonic() + 2
+    while buffer._error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    with pytest.raises(sqlite3.OperationalError) as caught:
+        buffer.close()
+    assert isinstance(caught.value.__cause__, sqlite3.OperationalError)
+    assert len(buffer) == 1
+    conn.close()
+
+
+def test_unknown_columns_rejected(metrics_conn, metrics):
+    buffer = WriteBuffer(metrics, metrics_conn, max_delay=None)
+    with pytest.raises(InvalidColumnsError):
+        buffer.add({"nope": 1})
+    buffer.close()
+
+
+def test_closed_buffer_rejects_rows(metrics_conn, metrics):
+    buffer = WriteBuffer(metrics, metrics_conn, max_delay=None)
+    buffer.close()
+    with pytest.raises(RuntimeError):
+        buffer.add({"host": "a"})
+
+
+@pytest.mark.parametrize(
+    "dialect,expected",
+    [
+        (
+            "postgres",
+            (
+                'INSERT INTO "metrics" ("host", "hits") VALUES (%s, %s), (%s, %s) '
+                'ON CONFLICT ("host") DO UPDATE SET "hits" = "metrics"."hits" + EXCLUDED."hits"'
+            ),
+        ),
+        (
+            "mysql",
+            (
+                "INSERT INTO `metrics` (`host`, `hits`) VALUES (%s, %s), (%s, %s) "
+                "ON DUPLICATE KEY UPDATE `hits` = `hits` + VALUES(`hits`)"
+            ),
+        ),
+        (
+            "oracle",
+            (
+                'MERGE INTO "metrics" t USING (SELECT :1 "host", :2 "hits" FROM DUAL '
+                'UNION ALL SELECT :3 "host", :4 "hits" FROM DUAL) s ON (t."host" = s."host") '
+                'WHEN MATCHED THEN UPDATE SET t."hits" = t."hits" + s."hits" '
+                'WHEN NOT MATCHED THEN INSERT ("host", "hits") VALUES (s."host", s."hits")'
+            ),
+        ),
+    ],
+)
+def test_upsert_rendering_per_dialect(dialect, expected):
+    dialect = DialectRegistry.get_dialect(dialect)
+    collector = ParamCollector(dialect)
+    sql = dialect.render_upsert(
+        "metrics", ["host", "hits"], [("a", 1), ("b", 2)], ["host"], ["hits"], collector
+    )
+    assert sql == expected
+    assert collector.params == ["a", 1, "b", 2]
+
+
+def test_oracle_insert_uses_insert_all():
+    dialect = DialectRegistry.get_dialect("oracle")
+    sql = dialect.render_insert("metrics", ["host"], [("a",), ("b",)])
+    assert sql == (
+        'INSERT ALL INTO "metrics" ("host") VALUES (\'a\') '
+        'INTO "metrics" ("host") VALUES (\'b\') SELECT 1 FROM DUAL'
+    )
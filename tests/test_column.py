@@ -1,3 +1,5 @@
+import array
+
 from pysqlscribe.column import (
     Case,
     Column,
@@ -5,9 +7,14 @@ from pysqlscribe.column import (
     Expression,
     InvalidColumnsError,
     ExpressionColumn,
+    FunctionCall,
+    ArithmeticOperation,
     NotExpression,
+    and_,
     case_,
+    or_,
 )
+from pysqlscribe.scalar_functions import power, trunc
 import pytest
 
 
@@ -137,14 +144,14 @@ def test_expression_and():
     col = Column("column1", "table1")
     expr = (col == 1) & (col > 5)
     assert isinstance(expr, CompoundExpression)
-    assert str(expr) == "(table1.column1 = 1) AND (table1.column1 > 5)"
+    assert str(expr) == "table1.column1 = 1 AND table1.column1 > 5"
 
 
 def test_expression_or():
     col = Column("column1", "table1")
     expr = (col == 1) | (col == 2)
     assert isinstance(expr, CompoundExpression)
-    assert str(expr) == "(table1.column1 = 1) OR (table1.column1 = 2)"
+    assert str(expr) == "table1.column1 = 1 OR table1.column1 = 2"
 
 
 def test_expression_not():
@@ -160,14 +167,14 @@ def test_expression_mixed_precedence():
     expr = (col == 1) & ((other > 5) | other.is_null())
     assert (
         str(expr)
-        == "(table1.column1 = 1) AND ((table1.column2 > 5) OR (table1.column2 IS NULL))"
+        == "table1.column1 = 1 AND (table1.column2 > 5 OR table1.column2 IS NULL)"
     )
 
 
 def test_expression_not_compound():
     col = Column("column1", "table1")
     expr = ~((col == 1) | (col == 2))
-    assert str(expr) == "NOT ((table1.column1 = 1) OR (table1.column1 = 2))"
+    assert str(expr) == "NOT (table1.column1 = 1 OR table1.column1 = 2)"
 
 
 def test_case_basic_with_else():
@@ -259,3 +266,131 @@ def test_standalone_column_between_ansi_escape():
 def test_standalone_column_like_ansi_escape():
     col = Column("name", "users")
     assert str(col.like("%O'B%")) == "users.name LIKE '%O''B%'"
+
+
+def test_columns_and_expressions_are_slotted():
+    column = Column("amount", "orders")
+    expression = (column > 1) | ~(column < 0)
+    for obj in (column, expression, expression.operands[0], column.desc(), case_()):
+        assert not hasattr(obj, "__dict__")
+    column.table_name = "o"
+    assert column.fully_qualified_name == "o.amount"
+
+
+def test_in_with_arrays_and_iterators():
+    col = Column("column1", "table1")
+    assert str(col.in_(array.array("i", [1, 2]))) == "table1.column1 IN (1, 2)"
+    assert str(col.in_(memoryview(array.array("d", [0.5])))) == (
+        "table1.column1 IN (0.5)"
+    )
+    assert str(col.in_(n for n in (1, 2.5))) == "table1.column1 IN (1, 2.5)"
+    assert isinstance(col.in_(range(3)).right.values, array.array)
+    with pytest.raises(NotImplementedError):
+        col.in_(array.array("i"))
+
+
+def test_function_calls_and_arithmetic_are_nodes(monkeypatch):
+    from pysqlscribe import column as column_module
+    from pysqlscribe.aggregate_functions import avg
+    from pysqlscribe.scalar_functions import round_
+
+    col = Column("price", "items")
+    monkeypatch.setattr(
+        column_module,
+        "validate_column_name",
+        lambda name: pytest.fail(f"re-validated {name!r}"),
+    )
+    rounded = round_(avg(col), 2)
+    assert isinstance(rounded, FunctionCall)
+    assert rounded.function == "ROUND"
+    assert isinstance(rounded.arguments[0], FunctionCall)
+    assert rounded.name == "ROUND(AVG(price), 2)"
+    assert rounded.table_name == "items"
+
+    total = (col + 1) * (col - 2)
+    assert isinstance(total, ArithmeticOperation)
+    assert total.name == "(items.price + 1) * (items.price - 2)"
+    assert (col * 2 + 1).name == "items.price * 2 + 1"
+    assert (col - (col - 1)).name == "items.price - (items.price - 1)"
+
+
+@pytest.mark.parametrize(
+    "build",
+    [
+        lambda col: col + "1; DROP TABLE emp --",
+        lambda col: col * "2) OR (1 = 1",
+        lambda col: round(col, "2); DROP TABLE emp; --"),
+        lambda col: trunc(col, "1) --"),
+        lambda col: power(col, col) + "x'",
+    ],
+)
+def test_arithmetic_and_function_operands_reject_injection(build):
+    col = Column("salary", "emp")
+    with pytest.raises(InvalidColumnsError):
+        build(col)
+
+
+def test_arithmetic_and_function_operands_accept_numbers_and_identifiers():
+    col = Column("salary", "emp")
+    assert (col + 1.5).name == "emp.salary + 1.5"
+    assert (col - "bonus").name == "emp.salary - bonus"
+    assert round(col, 2).name == "ROUND(salary, 2)"
+    assert trunc(col, 1).name == "TRUNC(salary, 1)"
+
+
+def test_and_or_are_n_ary_and_chains_flatten():
+    col = Column("column1", "table1")
+    chain = (col == 1) | (col == 2) | (col == 3)
+    assert len(chain.terms()) == 3
+    assert str(chain) == str(or_(col == 1, col == 2, col == 3))
+    assert str(and_(col > 0, chain, ~(col == 9))) == (
+        "table1.column1 > 0 AND "
+        "(table1.column1 = 1 OR table1.column1 = 2 OR table1.column1 = 3) AND "
+        "NOT (table1.column1 = 9)"
+    )
+    # AND binds tighter than OR, so it needs no parentheses inside one
+    assert str((col == 1) | (col > 5) & (col < 9)) == (
+        "table1.column1 = 1 OR table1.column1 > 5 AND table1.column1 < 9"
+    )
+    with pytest.raises(ValueError):
+        and_()
+
+
+def test_deep_predicates_render_without_recursion():
+    col = Column("column1", "table1")
+    expression = col == 0
+    for value in range(1, 20_000):
+        expression = expression | (col == value) if value % 2 else ~expression
+    sql = str(expression)
+    assert sql.count("NOT (") == 9_999
+    assert sql.endswith("table1.column1 = 19999")
+
+
+def test_compound_expression_keeps_left_operator_right():
+    col = Column("column1", "table1")
+    first, second, third = col == 1, col == 2, col == 3
+    expression = CompoundExpression(first, "OR", second)
+    assert (expression.left, expression.operator, expression.right) == (
+        first,
+        "OR",
+        second,
+    )
+    assert str(expression) == "table1.column1 = 1 OR table1.column1 = 2"
+    assert repr(expression) == f"CompoundExpression({first!r}, 'OR', {second!r})"
+    n_ary = or_(first, second, third)
+    assert n_ary.left is first
+    assert isinstance(n_ary.right, CompoundExpression)
+    assert n_ary.right.operands == (second, third)
+    assert repr(n_ary) == (
+        f"CompoundExpression.of('OR', {first!r}, {second!r}, {third!r})"
+    )
+
+
+def test_deep_predicates_repr_without_recursion():
+    col = Column("column1", "table1")
+    expression = col == 0
+    for value in range(1, 20_000):
+        expression = expression | (col == value) if value % 2 else ~expression
+    text = repr(expression)
+    assert text.count("NotExpression(") == 9_999
+    assert text.endswith("Expression('table1.column1', '=', Literal(19999)))")
@@ -0,0 +1,99 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from pysqlscribe import with_
+from pysqlscribe.fingerprint import in_list_bucket
+from pysqlscribe.table import Table
+
+
+def orders_query(value, skus=("a", "b", "c"), dialect="postgres"):
+    table = Table("orders", "id", "amount", "sku", dialect=dialect)
+    return (
+        table.select(table.id, table.amount)
+        .where((table.amount > value) | (table.sku == f"s{value}"))
+        .where(table.sku.in_(list(skus)))
+        .order_by(table.id.desc())
+        .limit(value)
+    )
+
+
+def test_fingerprint_ignores_literal_values():
+    assert orders_query(1).fingerprint() == orders_query(2).fingerprint()
+    assert len(orders_query(1).fingerprint()) == 32
+
+
+def test_fingerprint_includes_shape_dialect_and_in_list_bucket():
+    fingerprint = orders_query(1).fingerprint()
+    assert orders_query(1, dialect="sqlite").fingerprint() != fingerprint
+    # 3 and 4 values share a bucket, 5 doesn't
+    assert orders_query(1, skus="abcd").fingerprint() == fingerprint
+    assert orders_query(1, skus="abcde").fingerprint() != fingerprint
+    table = Table("orders", "id", "amount", "sku", dialect="postgres")
+    other = (
+        table.select(table.id, table.amount)
+        .where((table.amount < 1) | (table.sku == "s1"))
+        .where(table.sku.in_(["a", "b", "c"]))
+        .order_by(table.id.desc())
+        .limit(1)
+    )
+    assert other.fingerprint() != fingerprint
+    assert [in_list_bucket(size) for size in (1, 2, 3, 4, 5, 1000)] == [
+        1,
+        2,
+        4,
+        4,
+        8,
+        1024,
+    ]
+
+
+def test_fingerprint_follows_changes_to_the_query():
+    table = Table("orders", "id", "amount", dialect="postgres")
+    query = table.select("id").where(table.amount > 1)
+    before = query.fingerprint()
+    assert query.fingerprint() is before
+    query.where(table.id == 2)
+    assert query.fingerprint() != before
+    query.limit(5)
+    with_limit = query.fingerprint()
+    assert with_limit != before
+    assert query.fingerprint() == with_limit
+    query.placeholder_style("dollar")
+    assert query.fingerprint() != with_limit
+    query.placeholder_style(None)
+    assert query.fingerprint() == with_limit
+
+
+def test_fingerprint_of_subqueries_and_ctes():
+    def query(name):
+        departments = Table("departments", "id", "name", dialect="postgres")
+        employees = Table("employees", "department_id", dialect="postgres")
+        subquery = departments.select("id").where(departments.name == name)
+        return employees.select().where(employees.department_id.in_(subquery))
+
+    assert query("a").fingerprint() == query("b").fingerprint()
+    cte = with_("recent", dialect="postgres").as_(query("a"))
+    cte.select("*").from_("recent")
+    other = with_("older", dialect="postgres").as_(query("a"))
+    other.select("*").from_("recent")
+    assert cte.fingerprint() != other.fingerprint()
+
+
+def test_fingerprint_is_stable_across_processes():
+    script = (
+        "from tests.test_fingerprint import orders_query;"
+        "print(orders_query(1).fingerprint())"
+    )
+    fingerprints = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parents[1],
+            env={"PYTHONHASHSEED": seed},
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert fingerprints == {orders_query(1).fingerprint()}
@@ -0,0 +1,131 @@
+from decimal import Decimal
+
+import pytest
+
+from pysqlscribe import with_
+from pysqlscribe.dialects.base import DialectRegistry
+from pysqlscribe.fragments import normalize_fragment
+from pysqlscribe.params import ParamCollector
+from pysqlscribe.table import Table
+
+
+@pytest.mark.parametrize(
+    "fragment, normalized",
+    [
+        ("salary>100  and\n dept='x' -- note", "salary > 100 AND dept = 'x'"),
+        ("x in (1,2, 3)", "x IN (1, 2, 3)"),
+        ("lower( name )=  'a'", "lower(name) = 'a'"),
+        ("cast(x as numeric(10,2))>-1", "CAST(x AS numeric(10, 2)) > -1"),
+        ('t."Mixed Col" is not null', 't."Mixed Col" IS NOT NULL'),
+        (
+            "exists (select 1 from t where t.id=u.id)",
+            "EXISTS (SELECT 1 FROM t WHERE t.id = u.id)",
+        ),
+    ],
+)
+def test_normalize_fragment(fragment, normalized):
+    assert normalize_fragment(fragment) == normalized
+
+
+def lifted(fragment, dialect="postgres"):
+    collector = ParamCollector(DialectRegistry.get_dialect(dialect))
+    sql = normalize_fragment(fragment, collector=collector)
+    return sql, collector.params
+
+
+def test_literals_are_lifted():
+    assert lifted("salary > 100 and dept = 'o''b' and rate < 1.5") == (
+        "salary > %s AND dept = %s AND rate < %s",
+        [100, "o'b", Decimal("1.5")],
+    )
+    assert lifted("x between -1 and 2", dialect="sqlite") == (
+        "x BETWEEN -? AND ?",
+        [1, 2],
+    )
+
+
+@pytest.mark.parametrize(
+    "fragment",
+    [
+        "created > DATE '2024-01-01'",
+        "ts > now() - INTERVAL '1 day'",
+        "name LIKE 'a!%' ESCAPE '!' AND x = %s",
+        "CAST(x AS NUMERIC(10, 2)) = x::varchar(20)",
+        "name = E'a\\nb' OR name = $$b$$",
+    ],
+)
+def test_literals_that_must_stay_inline(fragment):
+    assert lifted(fragment)[1] == []
+
+
+def test_positions_row_limits_and_select_list_stay_inline():
+    assert lifted(
+        "select dept, 1, 'x' from t where salary > 10 and exists "
+        "(select 1 from u where u.id = t.id and u.k = 'k') "
+        "group by 1 order by 2 desc limit 5 offset 10"
+    ) == (
+        (
+            "SELECT dept, 1, 'x' FROM t WHERE salary > %s AND EXISTS "
+            "(SELECT 1 FROM u WHERE u.id = t.id AND u.k = %s) "
+            "GROUP BY 1 ORDER BY 2 DESC LIMIT 5 OFFSET 10"
+        ),
+        [10, "k"],
+    )
+    assert lifted("x > 1 order by (2)") == ("x > %s ORDER BY (2)", [1])
+
+
+def test_backslash_escaped_strings_stay_inline():
+    collector = ParamCollector(DialectRegistry.get_dialect("mysql"))
+    sql = normalize_fragment(
+        r"a = 'it\'s' and b = 'c'", collector=collector, backslash_escapes=True
+    )
+    assert (sql, collector.params) == (r"a = 'it\'s' AND b = %s", ["c"])
+
+
+def test_raw_fragments_are_verbatim_by_default():
+    table = Table("employees", "salary", dialect="postgres")
+    assert table.select("salary").where("salary>100").build() == (
+        'SELECT "salary" FROM "employees" WHERE salary>100'
+    )
+
+
+def test_query_normalize_raw_fragments():
+    def query(threshold):
+        employees = Table("employees", "salary", "dept_id", dialect="postgres")
+        return (
+            employees.select("salary")
+            .join(
+                "depts",
+                condition=f"depts.id = employees.dept_id and depts.budget>{threshold}",
+            )
+            .where(f"salary  >  {threshold}", employees.dept_id == 3)
+            .normalize_raw_fragments(lift_literals=True)
+        )
+
+    assert query(100).build(parameterize=True) == (
+        (
+            'SELECT "salary" FROM "employees" INNER JOIN "depts" '
+            "ON depts.id = employees.dept_id AND depts.budget > %s "
+            "WHERE salary > %s AND employees.dept_id = %s"
+        ),
+        [100, 100, 3],
+    )
+    assert query(100).build() == (
+        'SELECT "salary" FROM "employees" INNER JOIN "depts" '
+        "ON depts.id = employees.dept_id AND depts.budget > 100 "
+        "WHERE salary > 100 AND employees.dept_id = 3"
+    )
+    assert query(100).fingerprint() == query(500).fingerprint()
+
+
+def test_cte_bodies_are_normalized():
+    query = (
+        with_("recent", dialect="postgres")
+        .as_("select id from orders where total>10")
+        .normalize_raw_fragments(lift_literals=True)
+    )
+    query.select("*").from_("recent")
+    assert query.build(parameterize=True) == (
+        'WITH recent AS (SELECT id FROM orders WHERE total > %s) SELECT * FROM "recent"',
+        [10],
+    )
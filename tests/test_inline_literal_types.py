@@ -158,3 +158,35 @@ def test_ansi_fallback_renders_all_new_types():
         == "tbl.col = '2026-04-28 14:30:00'"
     )
     assert str(col == Decimal("3.14")) == "tbl.col = 3.14"
+
+
+# ---------------------------------------------------------------------------
+# batch escaping — must match escape_value exactly, whatever the input mix.
+# ---------------------------------------------------------------------------
+
+BATCHES = [
+    ["plain", "it's", "back\\slash", "", "nul\0byte"],
+    [1, 2, -3],
+    [0.5, 1e20],
+    [True, False, True],
+    [datetime.date(2024, 1, 2), datetime.date(2024, 3, 4)],
+    [1, "mixed", None, Decimal("1.50"), False],
+]
+
+
+@pytest.mark.parametrize("dialect_name", ALL_DIALECTS)
+@pytest.mark.parametrize("values", BATCHES)
+def test_batch_escaping_matches_escape_value(dialect_name, values):
+    dialect = DialectRegistry.get_dialect(dialect_name)
+    expected = [dialect.escape_value(value) for value in values]
+    assert dialect.escape_values(values) == expected
+    assert dialect.join_escaped_values(values) == ", ".join(expected)
+
+
+@pytest.mark.parametrize("dialect_name", ALL_DIALECTS)
+def test_bulk_insert_escapes_column_by_column(dialect_name):
+    dialect = DialectRegistry.get_dialect(dialect_name)
+    rows = [(1, "a'b", True), (2, "c\\d", None)]
+    sql = dialect.render_insert("t", ["id", "name", "flag"], rows)
+    for row in rows:
+        assert ", ".join(map(dialect.escape_value, row)) in sql
@@ -365,3 +365,159 @@ def test_union_propagates_params_from_both_sides():
     sql, params = left.union(right).build(parameterize=True)
     assert sql.count("%s") == 2
     assert params == [1000, 2000]
+
+
+def test_large_in_list_binds_every_value_in_order():
+    table = Table("events", "id", dialect="sqlite")
+    sql, params = (
+        table.select("id").where(table.id.in_(range(1000))).build(parameterize=True)
+    )
+    assert sql.endswith("IN (" + ", ".join(["?"] * 1000) + ")")
+    assert params == list(range(1000))
+
+
+def test_auto_parameterize_binds_only_what_the_policy_picks():
+    document = '{"tags": [' + ", ".join(f'"t{i}"' for i in range(200)) + "]}"
+    table = Table("events", "id", "kind", "status", "payload", dialect="postgres")
+    sql, params = (
+        table.select("id")
+        .where(
+            table.status == "active",
+            table.kind.in_(["a", "b"]),
+            table.payload == document,
+            table.id > 123456,
+            table.id.in_(list(range(20))),
+        )
+        .auto_parameterize()
+        .build()
+    )
+    assert sql == (
+        'SELECT "id" FROM "events" WHERE events.status = \'active\' AND '
+        "events.kind IN ('a', 'b') AND events.payload = %s AND events.id > %s AND "
+        f"events.id IN ({', '.join(['%s'] * 20)})"
+    )
+    assert params == [document, 123456, *range(20)]
+
+
+@pytest.mark.parametrize("dialect", ["postgres", "mysql"])
+def test_auto_parameterize_binds_percent_strings_for_format_placeholders(dialect):
+    table = Table("events", "name", "payload", dialect=dialect)
+    document = "x" * 100
+    sql, params = (
+        table.select("name")
+        .where(table.name.like("ab%"), table.payload == document, table.name != "c")
+        .auto_parameterize()
+        .build()
+    )
+    assert params == ["ab%", document]
+    # what a `format` paramstyle driver does with the SQL and its params
+    interpolated = sql % tuple(f"'{param}'" for param in params)
+    assert f"LIKE 'ab%' AND events.payload = '{document}'" in interpolated
+    assert interpolated.endswith("events.name <> 'c'")
+
+    named = Table("events", "name", dialect=dialect).placeholder_style("pyformat")
+    sql, params = (
+        named.select("name").where(named.name.like("%b")).auto_parameterize().build()
+    )
+    assert sql % {key: "'%b'" for key in params} == sql.replace("%(p1)s", "'%b'")
+
+
+def test_auto_parameterize_with_a_custom_policy_and_explicit_modes():
+    from pysqlscribe.params import ParameterizationPolicy
+
+    def query():
+        table = Table("users", "name", "age", dialect="sqlite")
+        return (
+            table.select("name")
+            .where(table.name == "bob", table.age > 30)
+            .auto_parameterize(ParameterizationPolicy(max_inline_string=0))
+        )
+
+    assert query().build() == (
+        'SELECT "name" FROM "users" WHERE users.name = ? AND users.age > 30',
+        ["bob"],
+    )
+    assert query().build(parameterize=True)[1] == ["bob", 30]
+    assert query().build(parameterize=False) == (
+        'SELECT "name" FROM "users" WHERE users.name = \'bob\' AND users.age > 30'
+    )
+    assert str(query()) == query().build(parameterize=False)
+
+
+@pytest.mark.parametrize(
+    "style,placeholders,params",
+    [
+        ("dollar", ["$1", "$1", "$2", "$1"], [7, "x"]),
+        ("qmark_numeric", ["?1", "?1", "?2", "?1"], {"1": 7, "2": "x"}),
+        ("named", [":p1", ":p1", ":p2", ":p1"], {"p1": 7, "p2": "x"}),
+        ("pyformat", ["%(p1)s", "%(p1)s", "%(p2)s", "%(p1)s"], {"p1": 7, "p2": "x"}),
+        ("numeric", [":1", ":2", ":3", ":4"], [7, 7, "x", 7]),
+        ("qmark", ["?", "?", "?", "?"], [7, 7, "x", 7]),
+    ],
+)
+def test_placeholder_styles_reuse_identical_values_where_allowed(
+    style, placeholders, params
+):
+    a = Table("orders", "id", "tenant_id", "kind", dialect="postgres")
+    b = Table("refunds", "id", "tenant_id", dialect="postgres")
+    sql, bound = (
+        a.select("id")
+        .where(a.tenant_id == 7, a.id > 7, a.kind == "x")
+        .union(b.select("id").where(b.tenant_id == 7))
+        .placeholder_style(style)
+        .build(parameterize=True)
+    )
+    assert sql == (
+        'SELECT "id" FROM "orders" WHERE orders.tenant_id = {} AND orders.id > {} '
+        'AND orders.kind = {} UNION SELECT "id" FROM "refunds" '
+        "WHERE refunds.tenant_id = {}"
+    ).format(*placeholders)
+    assert bound == params
+
+
+def test_deduplication_keeps_values_that_only_compare_equal_apart():
+    import decimal
+
+    table = Table("t", "a", "b", "c", "d", dialect="postgres")
+    _, params = (
+        table.select("a")
+        .where(
+            table.a == 1,
+            table.b == True,  # noqa: E712
+            table.c == decimal.Decimal("1.0"),
+            table.d == decimal.Decimal("1.00"),
+            table.a.in_([1, 2, 2]),
+        )
+        .placeholder_style("dollar")
+        .build(parameterize=True)
+    )
+    assert params == [1, True, decimal.Decimal("1.0"), decimal.Decimal("1.00"), 2]
+
+
+def test_placeholder_style_rejects_unknown_names_and_resets_with_none():
+    table = Table("t", "a", dialect="sqlite")
+    with pytest.raises(ValueError, match="Unknown placeholder style"):
+        table.placeholder_style("percent")
+    query = table.select("a").where(table.a == 1).placeholder_style("named")
+    assert query.placeholder_style(None).build(parameterize=True) == (
+        'SELECT "a" FROM "t" WHERE t.a = ?',
+        [1],
+    )
+
+
+@pytest.mark.parametrize("style", ["qmark_numeric", "named"])
+def test_reused_placeholders_execute_on_sqlite(style):
+    import sqlite3
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("CREATE TABLE t (a INTEGER, b INTEGER)")
+    connection.executemany("INSERT INTO t VALUES (?, ?)", [(1, 1), (1, 2), (2, 2)])
+    table = Table("t", "a", "b", dialect="sqlite")
+    sql, params = (
+        table.select("a", "b")
+        .where(table.a == 1, table.b.in_([1, 2]), table.b >= 1)
+        .placeholder_style(style)
+        .build(parameterize=True)
+    )
+    assert len(params) == 2
+    assert sorted(connection.execute(sql, params).fetchall()) == [(1, 1), (1, 2)]
@@ -0,0 +1,100 @@
+import pytest
+
+from pysqlscribe.column import Column, Expression, NotExpression, and_, or_
+from pysqlscribe.params import Literal
+from pysqlscribe.simplify import FALSE, TRUE, simplify
+from pysqlscribe.table import Table
+
+
+@pytest.fixture
+def col():
+    return Column("x", "t")
+
+
+def test_equality_disjunctions_merge_into_in(col):
+    expression = (col == 1) | (col == 2) | (col == 3) | col.in_([3, 4])
+    assert str(simplify(expression)) == "t.x IN (1, 2, 3, 4)"
+    # strings and numbers aren't mixed, and other columns are left alone
+    mixed = or_(col == "a", col == 1, col == "b", Column("y", "t") == 1)
+    assert str(simplify(mixed)) == "t.x IN ('a', 'b') OR t.x = 1 OR t.y = 1"
+
+
+def test_decimal_equalities_are_not_merged(col):
+    from decimal import Decimal
+
+    expression = (col == Decimal("1.5")) | (col == Decimal("2.5")) | (col == 1)
+    assert str(simplify(expression)) == "t.x = 1.5 OR t.x = 2.5 OR t.x = 1"
+
+
+def test_inequality_conjunctions_merge_into_not_in(col):
+    assert str(simplify((col != 1) & (col != 2))) == "t.x NOT IN (1, 2)"
+
+
+def test_range_bounds(col):
+    assert str(simplify((col > 5) & (col > 7) & (col <= 9) & (col < 9))) == (
+        "t.x > 7 AND t.x < 9"
+    )
+    assert str(simplify((col >= 5) & (col > 5))) == "t.x > 5"
+    assert str(simplify((col > 5) | (col >= 5) | (col < 1))) == "t.x >= 5 OR t.x < 1"
+
+
+def test_duplicates_and_double_negation(col):
+    predicate = (col == 1) | (col.is_null())
+    expression = and_(predicate, ~~predicate, ~~~(col > 2), col.like("a%"))
+    assert str(simplify(expression)) == (
+        "(t.x = 1 OR t.x IS NULL) AND NOT (t.x > 2) AND t.x LIKE 'a%'"
+    )
+
+
+def test_constant_folding(col):
+    always = Expression(Literal(1), "=", Literal(1))
+    never = Expression(Literal(2), ">", Literal(3.5))
+    assert simplify((col == 1) | always) is TRUE
+    assert simplify((col == 1) & never) is FALSE
+    assert str(simplify((col == 1) & ~never)) == "t.x = 1"
+    # different kinds of literal aren't compared
+    assert str(simplify(Expression(Literal(1), "=", Literal("1")))) == "1 = '1'"
+    # string comparisons depend on the collation, so they're never folded
+    collated = Expression(Literal("a"), "=", Literal("A"))
+    assert str(simplify((col == 1) & collated)) == "t.x = 1 AND 'a' = 'A'"
+
+
+def test_simplify_leaves_the_input_untouched(col):
+    expression = ~~((col == 1) | (col == 2))
+    before = str(expression)
+    simplify(expression)
+    assert isinstance(expression, NotExpression)
+    assert str(expression) == before
+
+
+def test_deep_trees(col):
+    other = Column("y", "t")
+    expression = col == 0
+    for value in range(1, 5_000):
+        if value % 2:
+            expression = ~~(expression & (col > value))
+        else:
+            expression = ~~(expression | (other == value))
+    sql = str(simplify(expression))
+    assert "NOT" not in sql
+    assert sql.endswith("OR t.y = 4998) AND t.x > 4999")
+
+
+def test_query_simplify():
+    table = Table("t", "x", "y", dialect="postgres")
+    query = (
+        table.select("x")
+        .where((table.x == 1) | (table.x == 2), table.y > 5, "raw = 1")
+        .where(table.y > 7, "raw = 1")
+        .where((table.x == 1) | (table.x == 2))
+        .simplify()
+    )
+    assert query.build(parameterize=True) == (
+        'SELECT "x" FROM "t" WHERE t.x IN (%s, %s) AND t.y > %s AND raw = 1',
+        [1, 2, 7],
+    )
+    always = Expression(Literal(1), "=", Literal(1))
+    assert (
+        table.select("x").where(always).simplify().build()
+        == 'SELECT "x" FROM "t" WHERE 1 = 1'
+    )
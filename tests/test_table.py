@@ -3,6 +3,7 @@ import pytest
 from pysqlscribe.aggregate_functions import avg, count
 from pysqlscribe.ast.joins import JoinType
 from pysqlscribe.column import case_
+from pysqlscribe.exceptions import InvalidColumnsError
 
 from pysqlscribe.table import Table
 
@@ -85,7 +86,7 @@ def test_table_where_or_composition():
     )
     assert (
         query == "SELECT `test_column` FROM `test_table` "
-        "WHERE (test_table.test_column = 1) OR (test_table.test_column = 2)"
+        "WHERE test_table.test_column = 1 OR test_table.test_column = 2"
     )
 
 
@@ -311,3 +312,66 @@ def test_table_column_carries_dialect():
     # The Column attribute should carry the MySQL dialect so comparisons escape
     # backslashes in addition to quotes.
     assert str(table.name == "a\\b") == "users.name = 'a\\\\b'"
+
+
+def test_table_metadata():
+    table = Table(
+        "orders",
+        "id",
+        "customer_id",
+        dialect="postgres",
+        column_types={"id": "bigint"},
+        primary_key=("id",),
+        foreign_keys=[(("customer_id",), "customers", ("id",))],
+        indexes=[("orders_customer", ("customer_id",))],
+    )
+    assert table.id.data_type == "bigint"
+    assert table.customer_id.data_type is None
+    assert table.metadata.primary_key == ("id",)
+    assert table.metadata.unique_keys == []
+    assert table.metadata.foreign_keys[0].referenced_table == "customers"
+    assert table.metadata.indexes[0].unique is False
+    assert table.as_("o").id.data_type == "bigint"
+
+
+def test_metadata_does_not_shadow_columns():
+    table = Table(
+        "keys", "primary_key", "indexes", dialect="postgres", primary_key=("indexes",)
+    )
+    assert table.primary_key.fully_qualified_name == "keys.primary_key"
+    assert table.indexes.fully_qualified_name == "keys.indexes"
+    assert table.metadata.primary_key == ("indexes",)
+
+
+def test_columns_are_created_lazily_per_alias():
+    table = Table("facts", *(f"c{index}" for index in range(100)), dialect="postgres")
+    assert table._column_cache == {}
+    first = table.c1
+    assert table.c1 is first
+    assert len(table._column_cache) == 1
+
+    table.as_("f")
+    assert table.c1.fully_qualified_name == "f.c1"
+    assert table.c1 is not first
+    assert len(table._column_cache) == 2
+    assert not hasattr(table, "c100")
+
+
+def test_invalid_column_names_are_rejected_on_construction():
+    with pytest.raises(InvalidColumnsError):
+        Table("facts", "ok", "not ok;", dialect="postgres")
+
+
+def test_table_where_parenthesises_or_between_conditions():
+    table = Table("test_table", "test_column", dialect="mysql")
+    query = (
+        table.select("test_column")
+        .where((table.test_column == 1) | (table.test_column == 2))
+        .where(table.test_column != 3)
+        .build()
+    )
+    assert query == (
+        "SELECT `test_column` FROM `test_table` "
+        "WHERE (test_table.test_column = 1 OR test_table.test_column = 2) "
+        "AND test_table.test_column <> 3"
+    )
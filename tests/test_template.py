@@ -0,0 +1,100 @@
+import pytest
+
+from pysqlscribe.exceptions import TemplateParameterError
+from pysqlscribe.params import Param
+from pysqlscribe.table import Table
+
+
+def search(dialect="postgres"):
+    orders = Table("orders", "id", "tenant_id", "status", "amount", dialect=dialect)
+    return (
+        orders.select("id")
+        .where(orders.tenant_id == Param("tenant"))
+        .where(
+            orders.status == Param("status"),
+            (orders.amount >= Param("low")) | (orders.amount <= Param("high")),
+            optional=True,
+        )
+        .order_by("id")
+        .limit(50)
+    )
+
+
+def test_bound_values_pick_the_optional_filters():
+    template = search().template()
+    assert template.parameters == {"tenant", "status", "low", "high"}
+    assert template.bind(tenant=1) == (
+        'SELECT "id" FROM "orders" WHERE orders.tenant_id = %s ORDER BY "id" LIMIT 50',
+        [1],
+    )
+    assert template.bind(tenant=1, status="open", low=5) == (
+        (
+            'SELECT "id" FROM "orders" WHERE orders.tenant_id = %s AND '
+            'orders.status = %s ORDER BY "id" LIMIT 50'
+        ),
+        [1, "open"],
+    )
+    assert template.bind(tenant=2, status=None, low=5, high=9) == (
+        (
+            'SELECT "id" FROM "orders" WHERE orders.tenant_id = %s AND '
+            '(orders.amount >= %s OR orders.amount <= %s) ORDER BY "id" LIMIT 50'
+        ),
+        [2, 5, 9],
+    )
+
+
+def test_each_combination_is_rendered_once():
+    template = search().template()
+    # the variant with every filter present is rendered up front
+    assert len(template) == 1
+    first = template.bind(tenant=1, status="open")
+    assert len(template) == 2
+    second = template.bind(tenant=2, status="closed")
+    assert len(template) == 2
+    assert first[0] is second[0]
+    assert (first[1], second[1]) == ([1, "open"], [2, "closed"])
+
+
+def test_template_is_a_snapshot_and_drops_empty_clauses():
+    users = Table("users", "id", "team", dialect="sqlite")
+    query = users.select("id").where(users.team == Param("team"), optional=True)
+    template = query.template()
+    query.where(users.id > 3)
+    assert template.bind() == ('SELECT "id" FROM "users"', [])
+    assert template.bind(team="red") == (
+        'SELECT "id" FROM "users" WHERE users.team = ?',
+        ["red"],
+    )
+    # outside a template, optional conditions render like any other
+    users = Table("users", "id", "team", dialect="sqlite")
+    assert users.select("id").where(users.team == "red", optional=True).build() == (
+        'SELECT "id" FROM "users" WHERE users.team = \'red\''
+    )
+
+
+def test_params_are_shared_and_named_where_the_style_allows():
+    users = Table("users", "id", "owner", "editor", dialect="sqlite")
+    template = (
+        users.select("id")
+        .where(
+            (users.owner == Param("user")) | (users.editor == Param("user")),
+            optional=True,
+        )
+        .placeholder_style("named")
+        .template()
+    )
+    assert template.bind(user=4) == (
+        'SELECT "id" FROM "users" WHERE users.owner = :p1 OR users.editor = :p1',
+        {"p1": 4},
+    )
+
+
+def test_binding_errors():
+    template = search().template()
+    with pytest.raises(TemplateParameterError, match="Unknown template parameters"):
+        template.bind(tenant=1, colour="red")
+    with pytest.raises(TemplateParameterError, match="'tenant'"):
+        template.bind(status="open")
+    users = Table("users", "id", dialect="sqlite")
+    with pytest.raises(TemplateParameterError, match="has no Param"):
+        users.select("id").where(users.id > 3, optional=True).template()
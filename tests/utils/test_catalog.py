@@ -0,0 +1,101 @@
+import gc
+
+import pytest
+
+from pysqlscribe.exceptions import DuplicateTableError
+from pysqlscribe.schema import Schema
+from pysqlscribe.table import Table
+from pysqlscribe.utils.catalog import Catalog
+
+HR_SQL = """
+-- the people — «personnel»
+CREATE TABLE hr.employees (
+    employee_id INT,
+    name VARCHAR(50) DEFAULT 'a);b',
+    salary INT
+);
+
+INSERT INTO hr.employees VALUES (1, 'CREATE TABLE nope (x INT);', 10);
+
+CREATE TABLE hr.departments (id INT, "label" TEXT DEFAULT 'libellé');
+"""
+
+SALES_SQL = """
+CREATE TABLE orders (id INT, total NUMERIC(10, 2));
+CREATE TABLE hr.employees (employee_id INT);
+"""
+
+
+@pytest.fixture
+def ddl_dir(tmp_path):
+    (tmp_path / "a_hr.sql").write_text(HR_SQL, encoding="utf-8")
+    (tmp_path / "b_sales.sql").write_text(SALES_SQL, encoding="utf-8")
+    (tmp_path / "empty.sql").write_text("")
+    return tmp_path
+
+
+def test_index_lists_tables_without_materialising(ddl_dir):
+    with Catalog(ddl_dir, dialect="postgres", on_conflict="first") as catalog:
+        assert sorted(catalog) == ["departments", "employees", "orders"]
+        assert catalog.schema_names == ["hr"]
+        assert "orders" in catalog and "nope" not in catalog
+        assert len(catalog._tables_cache) == 0
+
+
+def test_tables_materialise_on_access(ddl_dir):
+    with Catalog(ddl_dir, dialect="postgres", on_conflict="first") as catalog:
+        employees = catalog.employees
+        assert isinstance(employees, Table)
+        assert employees.columns == ("employee_id", "name", "salary")
+        assert employees.table_name == "hr.employees"
+        assert catalog["hr.employees"] is employees
+        assert catalog["departments"].columns == ("id", "label")
+        assert catalog.table_names.count("employees") == 1
+
+
+def test_materialised_tables_are_cached_weakly(ddl_dir):
+    with Catalog(ddl_dir, dialect="postgres") as catalog:
+        orders = catalog.orders
+        assert catalog["orders"] is orders
+        del orders
+        gc.collect()
+        assert len(catalog._tables_cache) == 0
+        assert catalog.orders.columns == ("id", "total")
+
+
+def test_schema_access(ddl_dir):
+    with Catalog(ddl_dir, dialect="postgres") as catalog:
+        hr = catalog.hr
+        assert isinstance(hr, Schema)
+        assert {table.table_name for table in hr.tables} == {
+            "hr.employees",
+            "hr.departments",
+        }
+        assert catalog.schema("hr") is hr
+
+
+def test_conflicts_follow_loader_policy(ddl_dir):
+    with Catalog(ddl_dir, dialect="postgres") as catalog:
+        assert catalog.employees.columns == ("employee_id",)
+    with pytest.raises(DuplicateTableError):
+        Catalog(ddl_dir, dialect="postgres", on_conflict="error")
+
+
+def test_unknown_names(ddl_dir):
+    with Catalog(ddl_dir, dialect="postgres") as catalog:
+        with pytest.raises(AttributeError):
+            _ = catalog.missing
+        with pytest.raises(KeyError):
+            _ = catalog["sales.orders"]
+
+
+def test_indexes_and_constraints_apply_on_materialisation(ddl_dir):
+    (ddl_dir / "c_keys.sql").write_text(
+        "ALTER TABLE ONLY hr.departments ADD CONSTRAINT departments_pkey PRIMARY KEY (id);\n"
+        "CREATE INDEX orders_total ON orders (total);\n"
+    )
+    with Catalog(ddl_dir, dialect="postgres") as catalog:
+        assert sorted(catalog) == ["departments", "employees", "orders"]
+        assert catalog.departments.metadata.primary_key == ("id",)
+        assert catalog.orders.metadata.indexes[0].columns == ("total",)
+        assert catalog.orders.total.data_type == "NUMERIC(10, 2)"
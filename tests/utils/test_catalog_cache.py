@@ -0,0 +1,72 @@
+import os
+
+from pysqlscribe.utils.catalog_cache import CatalogCache
+from pysqlscribe.utils.ddl_loader import find_sql_files, load_tables_from_ddls
+from pysqlscribe.utils.ddl_parser import collect_tables
+
+
+def write_schema(directory, count):
+    for i in range(count):
+        (directory / f"table_{i}.sql").write_text(
+            f"CREATE TABLE table_{i} (id INT, value_{i} TEXT);"
+        )
+
+
+def test_warm_load_parses_nothing(tmp_path):
+    write_schema(tmp_path, 3)
+    cache = CatalogCache(tmp_path / "cache" / "catalog.bin")
+    sql_files = find_sql_files(tmp_path)
+    cold = cache.load(sql_files)
+    assert len(cache.reparsed) == 3
+    assert cache.load(sql_files) == cold
+    assert cache.reparsed == []
+
+
+def test_only_changed_files_are_reparsed(tmp_path):
+    write_schema(tmp_path, 3)
+    cache = CatalogCache(tmp_path / "catalog.bin")
+    sql_files = find_sql_files(tmp_path)
+    cache.load(sql_files)
+    changed = tmp_path / "table_1.sql"
+    changed.write_text("CREATE TABLE table_1 (id INT, renamed TEXT, extra INT);")
+    parsed = dict(cache.load(sql_files))
+    assert cache.reparsed == [str(changed)]
+    tables = collect_tables(parsed[str(changed)])
+    assert tables["table_1"]["columns"] == ["id", "renamed", "extra"]
+
+
+def test_touched_but_unchanged_file_is_not_reparsed(tmp_path):
+    write_schema(tmp_path, 1)
+    cache = CatalogCache(tmp_path / "catalog.bin")
+    sql_files = find_sql_files(tmp_path)
+    cache.load(sql_files)
+    stat = os.stat(sql_files[0])
+    os.utime(sql_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cache.load(sql_files)
+    assert cache.reparsed == []
+
+
+def test_corrupt_or_mismatched_cache_is_rebuilt(tmp_path):
+    write_schema(tmp_path, 2)
+    cache_path = tmp_path / "catalog.bin"
+    cache_path.write_bytes(b"not a catalog")
+    cache = CatalogCache(cache_path)
+    sql_files = find_sql_files(tmp_path)
+    cache.load(sql_files)
+    assert len(cache.reparsed) == 2
+    # parsing with different settings can't reuse the cached entries
+    cache.load(sql_files, backslash_escapes=True)
+    assert len(cache.reparsed) == 2
+
+
+def test_loader_uses_cache(tmp_path):
+    schema = tmp_path / "schema"
+    schema.mkdir()
+    write_schema(schema, 2)
+    cache_path = tmp_path / "catalog.bin"
+    first = load_tables_from_ddls(schema, dialect="sqlite", cache_path=cache_path)
+    (schema / "table_0.sql").unlink()
+    second = load_tables_from_ddls(schema, dialect="sqlite", cache_path=cache_path)
+    assert set(first) == {"table_0", "table_1"}
+    assert set(second) == {"table_1"}
+    assert second["table_1"].columns == ("id", "value_1")
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from pysqlscribe.exceptions import DuplicateTableError
+from pysqlscribe.utils.catalog_watcher import CatalogChanges, CatalogWatcher
+
+
+@pytest.fixture
+def ddl_dir(tmp_path):
+    (tmp_path / "a.sql").write_text(
+        "CREATE TABLE users (id INT, email TEXT);\nCREATE TABLE posts (id INT);"
+    )
+    (tmp_path / "b.sql").write_text("CREATE TABLE comments (id INT, body TEXT);")
+    return tmp_path
+
+
+def rewrite(path, text):
+    stat = os.stat(path)
+    path.write_text(text)
+    # make sure the change is visible even on filesystems with coarse mtimes
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_initial_load(ddl_dir):
+    watcher = CatalogWatcher(ddl_dir, dialect="postgres")
+    assert sorted(watcher) == ["comments", "posts", "users"]
+    assert watcher["users"].columns == ("id", "email")
+    assert watcher.poll() == CatalogChanges()
+    assert not watcher.poll()
+    assert watcher.reparsed == []
+
+
+def test_poll_reports_changes_and_keeps_unchanged_tables(ddl_dir):
+    watcher = CatalogWatcher(ddl_dir, dialect="postgres")
+    snapshot = watcher.tables
+    posts, comments = watcher["posts"], watcher["comments"]
+
+    rewrite(
+        ddl_dir / "a.sql",
+        "CREATE TABLE users (id INT, email TEXT, name TEXT);\n"
+        "CREATE TABLE posts (id INT);\nCREATE TABLE tags (id INT);",
+    )
+    changes = watcher.poll()
+    assert changes == CatalogChanges(added=("tags",), changed=("users",))
+    assert watcher.reparsed == [str(ddl_dir / "a.sql")]
+    assert watcher["users"].columns == ("id", "email", "name")
+    assert watcher["posts"] is posts
+    assert watcher["comments"] is comments
+    # earlier snapshots are left untouched
+    assert snapshot["users"].columns == ("id", "email")
+    assert "tags" not in snapshot
+
+    (ddl_dir / "b.sql").unlink()
+    assert watcher.poll() == CatalogChanges(removed=("comments",))
+
+
+def test_touched_but_unchanged_files_are_not_reparsed(ddl_dir):
+    watcher = CatalogWatcher(ddl_dir, dialect="postgres")
+    rewrite(ddl_dir / "b.sql", (ddl_dir / "b.sql").read_text())
+    assert not watcher.poll()
+    assert watcher.reparsed == []
+
+
+def test_index_changes_mark_the_table_changed(ddl_dir):
+    watcher = CatalogWatcher(ddl_dir, dialect="postgres")
+    (ddl_dir / "c.sql").write_text("CREATE INDEX users_email ON users (email);")
+    assert watcher.poll() == CatalogChanges(changed=("users",))
+    assert watcher["users"].metadata.indexes[0].name == "users_email"
+
+
+def test_failed_poll_keeps_the_previous_catalog(ddl_dir):
+    watcher = CatalogWatcher(ddl_dir, dialect="postgres", on_conflict="error")
+    tables = watcher.tables
+    (ddl_dir / "c.sql").write_text("CREATE TABLE users (id INT);")
+    with pytest.raises(DuplicateTableError):
+        watcher.poll()
+    assert watcher.tables is tables
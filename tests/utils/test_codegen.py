@@ -0,0 +1,125 @@
+import importlib.util
+
+import pytest
+
+from pysqlscribe.schema import Schema
+from pysqlscribe.table import ColumnDescriptor, Table
+from pysqlscribe.utils.codegen import generate_module_from_ddls, main
+
+DDL = """
+CREATE TABLE hr.employees (
+    employee_id INT PRIMARY KEY,
+    "from" DATE,
+    select_count INT
+);
+CREATE TABLE order_items (id INT, "select" TEXT);
+CREATE INDEX order_items_select ON order_items ("select");
+"""
+
+
+@pytest.fixture
+def ddl_dir(tmp_path):
+    directory = tmp_path / "ddl"
+    directory.mkdir()
+    (directory / "schema.sql").write_text(DDL)
+    return directory
+
+
+def import_module(path):
+    spec = importlib.util.spec_from_file_location("generated_tables", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_generated_module_declares_tables(ddl_dir, tmp_path):
+    output = tmp_path / "tables.py"
+    assert main([str(ddl_dir), "--dialect", "postgres", "--output", str(output)]) == 0
+    module = import_module(output)
+
+    assert issubclass(module.Employees, Table)
+    assert isinstance(module.Employees.employee_id, ColumnDescriptor)
+    # keywords and names clashing with Table's API get trailing underscores
+    assert module.Employees.from__.name == "from"
+    assert module.OrderItems.select_.name == "select"
+
+    employees = module.employees
+    assert employees.columns == ("employee_id", "from", "select_count")
+    assert employees.from__.data_type == "DATE"
+    assert employees.metadata.primary_key == ("employee_id",)
+    assert module.order_items.metadata.indexes[0].columns == ("select",)
+    assert isinstance(module.hr, Schema)
+    assert module.hr.tables == [employees]
+    query = employees.select(employees.employee_id).where(employees.employee_id > 1)
+    assert query.build() == (
+        'SELECT "employee_id" FROM "hr.employees" WHERE hr.employees.employee_id > 1'
+    )
+
+
+def test_declared_columns_are_used_without_explicit_columns():
+    class Users(Table):
+        id = ColumnDescriptor()
+        class_ = ColumnDescriptor("class")
+
+    users = Users("users", dialect="sqlite")
+    assert users.columns == ("id", "class")
+    assert Users.class_.__get__(users, Users).fully_qualified_name == "users.class"
+
+
+def test_check_mode_detects_drift(ddl_dir, tmp_path, capsys):
+    output = tmp_path / "tables.py"
+    args = [str(ddl_dir), "--dialect", "postgres", "--output", str(output)]
+    assert main([*args, "--check"]) == 1
+    main(args)
+    assert main([*args, "--check"]) == 0
+    (ddl_dir / "extra.sql").write_text("CREATE TABLE audit (id INT);")
+    assert main([*args, "--check"]) == 1
+    assert "out of date" in capsys.readouterr().err
+
+
+def test_check_mode_ignores_how_the_path_is_spelled(ddl_dir, tmp_path, monkeypatch):
+    output = tmp_path / "tables.py"
+    main([str(ddl_dir), "--dialect", "postgres", "--output", str(output)])
+    monkeypatch.chdir(tmp_path)
+    for path in ("ddl", "./ddl", "ddl/", str(ddl_dir)):
+        assert (
+            main([path, "--dialect", "postgres", "--output", str(output), "--check"])
+            == 0
+        )
+
+
+def test_columns_named_like_table_attributes_are_renamed(tmp_path):
+    ddl = tmp_path / "accounts.sql"
+    ddl.write_text(
+        "CREATE TABLE accounts (id INT PRIMARY KEY, schema TEXT, metadata JSON, indexes INT);"
+    )
+    output = tmp_path / "tables.py"
+    main([str(ddl), "--dialect", "postgres", "--output", str(output)])
+    module = import_module(output)
+    assert module.Accounts.schema_.name == "schema"
+    assert module.Accounts.metadata_.name == "metadata"
+    assert module.Accounts.indexes.name == "indexes"
+    accounts = module.accounts
+    assert accounts.metadata.primary_key == ("id",)
+    assert accounts.schema_.fully_qualified_name == "accounts.schema"
+    assert accounts.indexes.fully_qualified_name == "accounts.indexes"
+
+
+def test_table_names_without_a_class_name_still_import(tmp_path):
+    ddl = tmp_path / "odd.sql"
+    ddl.write_text(
+        "CREATE TABLE _1x (id INT); CREATE TABLE __ (id INT); CREATE TABLE none (id INT);"
+    )
+    output = tmp_path / "tables.py"
+    main([str(ddl), "--dialect", "postgres", "--output", str(output)])
+    module = import_module(output)
+    assert module.T1x.__name__ == "T1x"
+    assert module._1x.table_name == "_1x"
+    assert isinstance(module.__, module.T)
+    assert isinstance(module.none, module.None_)
+
+
+def test_generation_is_deterministic(ddl_dir):
+    first = generate_module_from_ddls(ddl_dir, "mysql")
+    assert first == generate_module_from_ddls(ddl_dir, "mysql")
+    assert 'DIALECT = "mysql"' in first
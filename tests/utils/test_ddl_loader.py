@@ -2,7 +2,7 @@ import os
 import tempfile
 import pytest
 
-from pysqlscribe.exceptions import InvalidPathError
+from pysqlscribe.exceptions import DuplicateTableError, InvalidPathError
 from pysqlscribe.utils.ddl_loader import load_tables_from_ddls
 
 
@@ -210,3 +210,100 @@ def test_load_create_table_if_not_exists(temp_sql_if_not_exists):
     assert set(sessions.columns) == {"session_id", "user_id", "token"}
     for col in sessions.columns:
         assert hasattr(sessions, col)
+
+
+@pytest.fixture
+def nested_sql_dir(tmp_path):
+    (tmp_path / "b_sub" / "deeper").mkdir(parents=True)
+    (tmp_path / "a.sql").write_text(SIMPLE_SQL)
+    (tmp_path / "b_sub" / "comments.sql").write_text(EXTRA_SQL)
+    (tmp_path / "b_sub" / "deeper" / "users_v2.sql").write_text(
+        "CREATE TABLE users (id INT, email VARCHAR(255), deleted_at DATETIME);"
+    )
+    (tmp_path / "b_sub" / "notes.txt").write_text(EXTRA_SQL)
+    return tmp_path
+
+
+def test_recursive_discovery_is_opt_in(nested_sql_dir):
+    assert set(load_tables_from_ddls(nested_sql_dir, dialect="sqlite")) == {
+        "users",
+        "posts",
+    }
+    tables = load_tables_from_ddls(nested_sql_dir, dialect="sqlite", recursive=True)
+    assert set(tables) == {"users", "posts", "comments"}
+
+
+@pytest.mark.parametrize(
+    "on_conflict,expected",
+    [
+        ("last", ("id", "email", "deleted_at")),
+        ("first", ("id", "email", "created_at")),
+    ],
+)
+def test_conflicting_definitions_resolve_in_path_order(
+    nested_sql_dir, on_conflict, expected
+):
+    tables = load_tables_from_ddls(
+        nested_sql_dir, dialect="sqlite", recursive=True, on_conflict=on_conflict
+    )
+    assert tables["users"].columns == expected
+
+
+def test_conflicting_definitions_can_raise(nested_sql_dir):
+    with pytest.raises(DuplicateTableError, match="users"):
+        load_tables_from_ddls(
+            nested_sql_dir, dialect="sqlite", recursive=True, on_conflict="error"
+        )
+
+
+def test_process_pool_matches_sequential_load(nested_sql_dir):
+    sequential = load_tables_from_ddls(nested_sql_dir, dialect="sqlite", recursive=True)
+    parallel = load_tables_from_ddls(
+        nested_sql_dir, dialect="sqlite", recursive=True, workers=2
+    )
+    assert {name: table.columns for name, table in parallel.items()} == {
+        name: table.columns for name, table in sequential.items()
+    }
+
+
+def test_tables_carry_keys_and_indexes(temp_sql_with_constraints):
+    orders = load_tables_from_ddls(temp_sql_with_constraints, dialect="sqlite")[
+        "orders"
+    ]
+    assert orders.metadata.primary_key == ("id",)
+    assert orders.order_date.data_type == "DATE"
+    assert [
+        (fk.columns, fk.referenced_table) for fk in orders.metadata.foreign_keys
+    ] == [
+        (("user_id",), "users"),
+        (("product_id",), "products"),
+    ]
+
+
+def test_indexes_apply_across_files(nested_sql_dir):
+    (nested_sql_dir / "c_indexes.sql").write_text(
+        "CREATE UNIQUE INDEX users_email ON users (email);"
+    )
+    users = load_tables_from_ddls(nested_sql_dir, dialect="sqlite")["users"]
+    assert users.metadata.indexes[0].name == "users_email"
+    assert users.metadata.indexes[0].columns == ("email",)
+    assert users.metadata.indexes[0].unique
+
+
+def test_invalid_identifiers_are_skipped_with_a_warning(tmp_path):
+    (tmp_path / "schema.sql").write_text(
+        'CREATE TABLE accounts (id INT, "my col" TEXT, balance NUMERIC);\n'
+        'CREATE TABLE "Log Entries" (id INT);\n'
+        "CREATE TABLE users (id INT);\n"
+    )
+    with pytest.warns(UserWarning) as caught:
+        tables = load_tables_from_ddls(tmp_path, dialect="postgres")
+    assert sorted(tables) == ["accounts", "users"]
+    assert tables["accounts"].columns == ("id", "balance")
+    assert tables["accounts"].metadata.column_types == {
+        "id": "INT",
+        "balance": "NUMERIC",
+    }
+    messages = [str(warning.message) for warning in caught]
+    assert any("'my col'" in message for message in messages)
+    assert any("'Log Entries'" in message for message in messages)
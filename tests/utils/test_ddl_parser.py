@@ -0,0 +1,281 @@
+import pytest
+
+from pysqlscribe.utils.ddl_parser import (
+    INDEX,
+    empty_table_metadata,
+    iter_create_tables,
+    iter_create_tables_from_file,
+    iter_ddl_objects,
+    parse_create_tables,
+)
+from pysqlscribe.utils.sql_tokenizer import iter_statements
+
+PG_DUMP_SQL = r"""
+--
+-- PostgreSQL database dump
+--
+
+SET statement_timeout = 0;
+
+CREATE FUNCTION public.touch() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+CREATE TABLE public.accounts (
+    id integer NOT NULL,
+    "display name" text DEFAULT 'n/a);' NOT NULL, -- sneaky ); in a comment
+    balance numeric(12,2) DEFAULT 0.0,
+    tags text[] DEFAULT '{}'::text[],
+    /* block comment ); with a semicolon; */
+    CONSTRAINT balance_positive CHECK ((balance >= (0)::numeric))
+);
+
+COPY public.accounts (id, "display name", balance) FROM stdin;
+1	CREATE TABLE fake (x int);	10.00
+2	it's; fine	20.00
+\.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS "Audit"."Log Entries" (
+    entry_id bigint,
+    payload jsonb,
+);
+
+CREATE TABLE public.accounts_copy AS SELECT * FROM public.accounts;
+"""
+
+
+def metadata(schema=None, **fields):
+    return {**empty_table_metadata(schema), **fields}
+
+
+def test_pg_dump_output():
+    assert parse_create_tables(PG_DUMP_SQL) == {
+        "accounts": metadata(
+            "public",
+            columns=["id", "display name", "balance", "tags"],
+            column_types={
+                "id": "integer",
+                "display name": "text",
+                "balance": "numeric(12,2)",
+                "tags": "text[]",
+            },
+        ),
+        "Log Entries": metadata(
+            "Audit",
+            columns=["entry_id", "payload"],
+            column_types={"entry_id": "bigint", "payload": "jsonb"},
+        ),
+    }
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 4096])
+def test_chunk_boundaries_do_not_change_the_result(chunk_size):
+    chunks = [
+        PG_DUMP_SQL[i : i + chunk_size] for i in range(0, len(PG_DUMP_SQL), chunk_size)
+    ]
+    assert dict(iter_create_tables(chunks)) == parse_create_tables(PG_DUMP_SQL)
+
+
+def test_tables_are_yielded_as_they_complete():
+    def chunks():
+        yield "CREATE TABLE a (x int);"
+        yield "CREATE TABLE b ("
+        raise AssertionError("read past the first complete table")
+
+    assert next(iter_create_tables(chunks())) == (
+        "a",
+        metadata(columns=["x"], column_types={"x": "int"}),
+    )
+
+
+def test_copy_data_is_not_parsed_as_statements():
+    statements = list(iter_statements([PG_DUMP_SQL]))
+    assert not any("fake" in statement for statement in statements)
+    assert statements[-1].strip().startswith("CREATE TABLE public.accounts_copy")
+
+
+def test_mysql_backslash_escapes():
+    sql = r"""
+    CREATE TABLE `notes` (
+        `id` INT,
+        `body` VARCHAR(20) DEFAULT 'it\'s ); here',
+        KEY `idx_body` (`body`),
+        FULLTEXT KEY `ft_body` (`body`)
+    );
+    CREATE TABLE `other` (`x` INT);
+    """
+    assert parse_create_tables(sql, backslash_escapes=True) == {
+        "notes": metadata(
+            columns=["id", "body"],
+            column_types={"id": "INT", "body": "VARCHAR(20)"},
+            indexes=[("idx_body", ("body",), False), ("ft_body", ("body",), False)],
+        ),
+        "other": metadata(columns=["x"], column_types={"x": "INT"}),
+    }
+
+
+def test_nested_parentheses_and_trailing_statement_without_semicolon():
+    sql = """
+    CREATE TEMPORARY TABLE t (
+        a DECIMAL(10, 2) CHECK (a > (1 + 2)),
+        b VARCHAR(5),
+        PRIMARY KEY (a, b)
+    )"""
+    assert parse_create_tables(sql) == {
+        "t": metadata(
+            columns=["a", "b"],
+            column_types={"a": "DECIMAL(10, 2)", "b": "VARCHAR(5)"},
+            primary_key=("a", "b"),
+        )
+    }
+
+
+def test_streams_from_file(tmp_path):
+    path = tmp_path / "dump.sql"
+    path.write_text(PG_DUMP_SQL)
+    assert dict(iter_create_tables_from_file(path, chunk_size=5)) == (
+        parse_create_tables(PG_DUMP_SQL)
+    )
+
+
+def test_postgres_keys_indexes_and_foreign_keys():
+    sql = """
+    CREATE TABLE public.departments (
+        id serial PRIMARY KEY,
+        code character varying(8) NOT NULL UNIQUE
+    );
+    CREATE TABLE public.employees (
+        id integer NOT NULL,
+        department_id integer REFERENCES public.departments (id),
+        email text COLLATE "C",
+        manager_id integer,
+        CONSTRAINT employees_manager_fk FOREIGN KEY (manager_id)
+            REFERENCES public.employees (id) ON DELETE SET NULL
+    );
+    ALTER TABLE ONLY public.employees
+        ADD CONSTRAINT employees_pkey PRIMARY KEY (id);
+    ALTER TABLE ONLY public.employees
+        ADD CONSTRAINT employees_email_key UNIQUE (email);
+    CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS employees_lower_email
+        ON public.employees USING btree (lower(email));
+    CREATE INDEX employees_department_idx ON ONLY public.employees (department_id);
+    CREATE INDEX orphan_idx ON missing (x);
+    """
+    tables = parse_create_tables(sql)
+    assert tables["departments"] == metadata(
+        "public",
+        columns=["id", "code"],
+        column_types={"id": "serial", "code": "character varying(8)"},
+        primary_key=("id",),
+        unique=[("code",)],
+    )
+    assert tables["employees"] == metadata(
+        "public",
+        columns=["id", "department_id", "email", "manager_id"],
+        column_types={
+            "id": "integer",
+            "department_id": "integer",
+            "email": "text",
+            "manager_id": "integer",
+        },
+        primary_key=("id",),
+        unique=[("email",)],
+        foreign_keys=[
+            (("department_id",), "public.departments", ("id",)),
+            (("manager_id",), "public.employees", ("id",)),
+        ],
+        indexes=[
+            ("employees_lower_email", (), True),
+            ("employees_department_idx", ("department_id",), False),
+        ],
+    )
+    assert "missing" not in tables
+
+
+def test_mysql_keys():
+    sql = r"""
+    CREATE TABLE `orders` (
+        `id` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT,
+        `customer_id` INT NOT NULL,
+        `reference` VARCHAR(32) CHARACTER SET utf8mb4 NOT NULL,
+        PRIMARY KEY (`id`) USING BTREE,
+        UNIQUE KEY `uq_reference` (`reference`(16)),
+        KEY `idx_customer` (`customer_id`, `id` DESC),
+        CONSTRAINT `fk_customer` FOREIGN KEY (`customer_id`) REFERENCES `customers` (`id`)
+    ) ENGINE=InnoDB;
+    """
+    assert parse_create_tables(sql, backslash_escapes=True)["orders"] == metadata(
+        columns=["id", "customer_id", "reference"],
+        column_types={
+            "id": "BIGINT UNSIGNED",
+            "customer_id": "INT",
+            "reference": "VARCHAR(32)",
+        },
+        primary_key=("id",),
+        unique=[("reference",)],
+        foreign_keys=[(("customer_id",), "customers", ("id",))],
+        indexes=[
+            ("uq_reference", ("reference",), True),
+            ("idx_customer", ("customer_id", "id"), False),
+        ],
+    )
+
+
+def test_oracle_and_sqlite_types():
+    sql = """
+    CREATE TABLE hr.jobs (
+        job_id VARCHAR2(10 BYTE) CONSTRAINT job_id_pk PRIMARY KEY,
+        min_salary NUMBER(6) DEFAULT 0,
+        created TIMESTAMP(6) WITH TIME ZONE
+    );
+    CREATE TABLE notes (id INTEGER PRIMARY KEY AUTOINCREMENT, body, rank REAL);
+    CREATE UNIQUE INDEX notes_rank ON notes (rank);
+    """
+    tables = parse_create_tables(sql)
+    assert tables["jobs"]["column_types"] == {
+        "job_id": "VARCHAR2(10 BYTE)",
+        "min_salary": "NUMBER(6)",
+        "created": "TIMESTAMP(6) WITH TIME ZONE",
+    }
+    assert tables["jobs"]["primary_key"] == ("job_id",)
+    assert tables["notes"]["column_types"] == {"id": "INTEGER", "rank": "REAL"}
+    assert tables["notes"]["primary_key"] == ("id",)
+    assert tables["notes"]["indexes"] == [("notes_rank", ("rank",), True)]
+
+
+def test_column_types_end_at_whole_constraint_keywords():
+    sql = """
+    CREATE TABLE t (
+        intnot INTNOT NULL,
+        code CHARACTER VARYING(8) NOT NULL DEFAULT 'primary',
+        name VARCHAR(20) CHARACTER SET utf8 UNIQUE,
+        owner BIGINT REFERENCES owners (id) ON DELETE CASCADE,
+        "quoted" INT PRIMARY KEY
+    );
+    """
+    assert parse_create_tables(sql)["t"] == metadata(
+        columns=["intnot", "code", "name", "owner", "quoted"],
+        column_types={
+            "intnot": "INTNOT",
+            "code": "CHARACTER VARYING(8)",
+            "name": "VARCHAR(20)",
+            "owner": "BIGINT",
+            "quoted": "INT",
+        },
+        primary_key=("quoted",),
+        unique=[("name",)],
+        foreign_keys=[(("owner",), "owners", ("id",))],
+    )
+
+
+def test_ddl_objects_are_yielded_in_order():
+    sql = "CREATE TABLE t (x int); CREATE INDEX t_x ON t (x); DROP TABLE u;"
+    assert [(kind, name) for kind, name, _ in iter_ddl_objects([sql])] == [
+        ("table", "t"),
+        (INDEX, "t"),
+    ]